@@ -0,0 +1,292 @@
+"""
+Batch matcher — the intersection matchers over a corpus, without the GUI.
+
+Reads input strings from a file or stdin, one per line or as JSONL (a JSON
+string, or an object with "text" and an optional "id", per line), and
+writes one JSON object per input as soon as its batch is done:
+
+    {"line": 1, "spans": {"a_star_b_star:an_bn": [0, 4], ...}, "seconds": 2.1e-06}
+
+holding the span of the longest match of each chosen intersection (null
+for none) and the mean matching time per string of its batch. Pairs that
+reduce to the same language share one search, every run-shaped language
+is answered by a single run walk (longest_run_spans), and an empty
+language is answered without a search. A batch matches each distinct
+string once and formats each distinct row of spans once. A line that
+cannot be read, including one that is not valid UTF-8, becomes
+{"line": n, "error": "..."}.
+
+Lines are handed out in batches. By default they are matched in-process:
+a record costs microseconds, so a pool only pays off on large corpora and
+several cores. With --workers above 1 the batches go to a process pool, at
+most two per worker in flight, and their records come back in input
+order, or as soon as they are ready with --unordered. Only the matchers
+are imported: no Qt, no pyvis.
+
+Usage
+-----
+comp382-batch corpus.txt > spans.jsonl
+comp382-batch corpus.jsonl --format jsonl --intersection a_star_b_star:an_bn --workers 4 --unordered
+"""
+
+import argparse
+import io
+import json
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import batched
+from time import perf_counter
+
+from comp382_assignment_2.matchers.intersection_matchers import intersection_languages, match_language_span
+from comp382_assignment_2.matchers.run_length import RUN_SHAPED, longest_run_spans
+from comp382_assignment_2.pda.pda_loader import load_compiled_pda
+
+BATCH_SIZE = 2048
+
+FORMATS = ("lines", "jsonl")
+
+# Distinct span rows whose formatted "spans" body is kept between batches.
+_BODY_CACHE_SIZE = 4096
+
+# Bytes that were not valid UTF-8, as surrogateescape decodes them.
+_UNDECODABLE = re.compile("[\udc80-\udcff]")
+
+# Set in each pool worker by _start_worker().
+_WORKER_MATCHER = None
+
+
+class BatchMatcher:
+    """The JSONL records for a fixed list of (regular key, CFL key) pairs and input format."""
+
+    def __init__(self, pairs: list[tuple[str, str]] | None = None, input_format: str = "lines"):
+        languages = intersection_languages()
+        pairs = list(languages) if pairs is None else [tuple(pair) for pair in pairs]
+        unknown = [pair for pair in pairs if pair not in languages]
+        if unknown:
+            raise ValueError(f"Unknown intersections {unknown}. Available: {list(languages)}")
+        if input_format not in FORMATS:
+            raise ValueError(f"Unknown input format '{input_format}'. Available: {list(FORMATS)}")
+        self.pairs = pairs
+        self.input_format = input_format
+
+        self._order = [languages[pair] for pair in pairs]
+        chosen = dict.fromkeys(self._order)
+        self._run_shaped = any(language in RUN_SHAPED for language in chosen)
+        others = [language for language in chosen if language not in RUN_SHAPED]
+        self._empty = [language for language in others if load_compiled_pda(language).language.empty]
+        self._general = [language for language in others if language not in self._empty]
+
+        # A row holds the span of every language: the run-shaped ones, then
+        # the empty ones, then the general ones. The record body picks the
+        # chosen pairs' columns out of it.
+        columns = [*(RUN_SHAPED if self._run_shaped else ()), *self._empty, *self._general]
+        self._body = ", ".join(
+            f'"{regular}:{cfl}": {{{columns.index(language)}}}' for (regular, cfl), language in zip(pairs, self._order)
+        )
+        self._bodies = {}
+        self._fragments = _Fragments()
+        # With only run-shaped languages chosen, the row is longest_run_spans() itself.
+        self._row = self._mixed_row if self._empty or self._general else longest_run_spans
+
+    def spans(self, text: str) -> dict[str, tuple[int, int] | None]:
+        """language → span of its longest match in text, for every chosen language."""
+        spans = dict(zip(RUN_SHAPED, longest_run_spans(text))) if self._run_shaped else {}
+        spans.update(dict.fromkeys(self._empty))
+        for language in self._general:
+            spans[language] = match_language_span(load_compiled_pda(language), text)
+        return spans
+
+    def record(self, line: int, raw: str) -> str:
+        """The JSONL record (newline included) for one line of input."""
+        return self._records([(line, raw)])
+
+    def match_batch(self, batch) -> str:
+        """The records of a batch of (line number, raw line) pairs, in order."""
+        if self.input_format == "jsonl":
+            # Blank JSONL lines are skipped.
+            batch = [(line, raw) for line, raw in batch if raw.strip()]
+        return self._records(batch)
+
+    def _records(self, batch) -> str:
+        """
+        Records for the whole batch at once: each distinct text is matched
+        once, each distinct row of spans and each distinct span is formatted
+        once, and "seconds" is the batch's matching time divided over its
+        strings.
+        """
+        if self.input_format == "lines" and not _UNDECODABLE.search("".join([raw for _, raw in batch])):
+            items = None
+            texts = [raw.rstrip("\n") for _, raw in batch]
+        else:
+            items = [self._parse(line, raw) for line, raw in batch]
+            texts = [item[2] for item in items if not isinstance(item, str)]
+
+        started = perf_counter()
+        bodies = self._bodies_of(texts)
+        seconds = "%.3g" % ((perf_counter() - started) / max(len(texts), 1))
+
+        record = '{"line": %d, "spans": {%s}, "seconds": ' + seconds + '}\n'
+        if items is None:
+            return "".join([record % (line, bodies[text]) for (line, _), text in zip(batch, texts)])
+
+        record_with_id = '{"line": %d, "id": %s, "spans": {%s}, "seconds": ' + seconds + '}\n'
+        records = []
+        for item in items:
+            if isinstance(item, str):
+                records.append(item)
+            elif item[1] is None:
+                records.append(record % (item[0], bodies[item[2]]))
+            else:
+                records.append(record_with_id % (item[0], item[1], bodies[item[2]]))
+        return "".join(records)
+
+    def _bodies_of(self, texts: list[str]) -> dict[str, str]:
+        """text → the inside of its "spans" object, for every distinct text."""
+        bodies, fragments = self._bodies, self._fragments
+        if len(bodies) > _BODY_CACHE_SIZE:
+            bodies.clear()
+            fragments.clear()
+        row_of = self._row
+        matched = dict.fromkeys(texts)
+        for text in matched:
+            row = row_of(text)
+            body = bodies.get(row)
+            if body is None:
+                body = bodies[row] = self._body.format(*[fragments[span] for span in row])
+            matched[text] = body
+        return matched
+
+    def _mixed_row(self, text: str) -> tuple:
+        row = longest_run_spans(text) if self._run_shaped else ()
+        if self._empty:
+            row += (None,) * len(self._empty)
+        if self._general:
+            row += tuple(match_language_span(load_compiled_pda(language), text) for language in self._general)
+        return row
+
+    def _parse(self, line: int, raw: str) -> tuple[int, str | None, str] | str:
+        """(line, id as JSON or None, text) for one line, or its finished error record."""
+        item_id = None
+        try:
+            if _UNDECODABLE.search(raw):
+                # Re-decode strictly for the codec's own message.
+                raw.encode("utf-8", "surrogateescape").decode("utf-8")
+            if self.input_format == "lines":
+                return line, None, raw.rstrip("\n")
+            item = json.loads(raw)
+            if isinstance(item, dict):
+                text = item["text"]
+                item_id = json.dumps(item["id"]) if "id" in item else None
+            else:
+                text = item
+            if not isinstance(text, str):
+                raise TypeError(f"text must be a string, not {type(text).__name__}")
+        except (ValueError, KeyError, TypeError) as error:
+            return json.dumps({"line": line, "error": f"{type(error).__name__}: {error}"}) + "\n"
+        return line, item_id, text
+
+
+class _Fragments(dict):
+    """span → its JSON text, formatted on first use."""
+
+    def __missing__(self, span: tuple[int, int] | None) -> str:
+        fragment = self[span] = f"[{span[0]}, {span[1]}]" if span else "null"
+        return fragment
+
+
+def run_batches(lines, out, matcher: BatchMatcher, workers: int = 1, ordered: bool = True,
+                batch_size: int = BATCH_SIZE) -> int:
+    """Write the record of every line to `out`; returns the number of lines read."""
+    count = 0
+    batches = batched(enumerate(lines, 1), batch_size)
+    if workers <= 1:
+        for batch in batches:
+            out.write(matcher.match_batch(batch))
+            count = batch[-1][0]
+        return count
+
+    with ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(matcher.pairs, matcher.input_format)) as pool:
+        pending = []
+        for batch in batches:
+            if len(pending) >= 2 * workers:
+                pending = _write_ready(pending, out, ordered)
+            pending.append(pool.submit(_match_batch, batch))
+            count = batch[-1][0]
+        while pending:
+            pending = _write_ready(pending, out, ordered)
+    return count
+
+
+def _write_ready(pending: list, out, ordered: bool) -> list:
+    """Write the oldest batch (ordered) or every finished one; the rest stay pending."""
+    if ordered:
+        out.write(pending[0].result())
+        return pending[1:]
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        out.write(future.result())
+    return [future for future in pending if future not in done]
+
+
+def _start_worker(pairs: list[tuple[str, str]], input_format: str) -> None:
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = BatchMatcher(pairs, input_format)
+
+
+def _match_batch(batch) -> str:
+    return _WORKER_MATCHER.match_batch(batch)
+
+
+def _pair(value: str) -> tuple[str, str]:
+    regular, _, cfl = value.partition(":")
+    if not cfl:
+        raise argparse.ArgumentTypeError(f"expected REGULAR:CFL, e.g. a_star_b_star:an_bn, got '{value}'")
+    return regular, cfl
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="comp382-batch",
+        description="Longest intersection matches for every input string, as JSONL.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, default="lines", help="one string per line, or JSONL (default: lines)")
+    parser.add_argument(
+        "--intersection", dest="pairs", type=_pair, action="append", metavar="REGULAR:CFL",
+        help="an intersection to match (repeatable; default: all nine)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1, in-process)")
+    parser.add_argument("--unordered", action="store_true", help="write each batch as soon as it is done")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="lines per batch (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+    try:
+        matcher = BatchMatcher(args.pairs, args.format)
+    except ValueError as error:
+        parser.error(str(error))
+
+    # Undecodable bytes reach _parse() as surrogates and become error records.
+    if args.input == "-":
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="surrogateescape")
+    else:
+        source = open(args.input, "r", encoding="utf-8", errors="surrogateescape")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = perf_counter()
+    try:
+        count = run_batches(source, out, matcher, args.workers, not args.unordered, args.batch_size)
+    finally:
+        if args.input != "-":
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    seconds = perf_counter() - started
+    rate = count / seconds if seconds else 0.0
+    print(f"{count} strings in {seconds:.2f} s ({rate:,.0f} strings/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,839 @@
+"""
+benchmarks.py - Timing comparisons for the matcher and PDA engines.
+Run with `uv run bench` (or `python -m comp382_assignment_2.benchmarks`).
+
+"""
+
+import argparse
+import io
+import mmap
+import os
+import random
+import tempfile
+import tracemalloc
+from collections import deque
+from time import perf_counter
+
+from comp382_assignment_2.batch import BatchMatcher, run_batches
+from comp382_assignment_2.matchers import (
+    intersect_r1_c1,
+    intersect_r1_c2,
+    intersect_r1_c3,
+    intersect_r2_c1,
+    intersect_r2_c2,
+    intersect_r2_c3,
+    intersect_r3_c1,
+    intersect_r3_c2,
+    intersect_r3_c3,
+)
+from comp382_assignment_2.matchers.intersection_matchers import (
+    intersection_languages,
+    intersection_span,
+    match_all_intersection_spans,
+    match_all_intersections,
+    match_language,
+    match_language_span,
+)
+from comp382_assignment_2.matchers.incremental import IncrementalMatcher
+from comp382_assignment_2.matchers.result_cache import MATCH_CACHE
+from comp382_assignment_2.matchers.parallel import longest_match_parallel
+from comp382_assignment_2.matchers.streaming import CHUNK_SIZE, scan_file
+from comp382_assignment_2.matchers.planner import (
+    COST_MODEL_ENV,
+    applicable_engines,
+    cost_model_path,
+    explain,
+    fit_cost,
+    min_exponent,
+    plan_match,
+    save_cost_model,
+)
+from comp382_assignment_2.matchers.enumeration import iter_matches
+from comp382_assignment_2.matchers.substring_utils import find_all_matching_substrings, longest_matching_span
+from comp382_assignment_2.matchers.super_pda import super_accept, super_accept_many
+from comp382_assignment_2.matchers.regular_languages import regex_a_b_star_a_matcher
+from comp382_assignment_2.pda.analysis import DeterministicRunner
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA, compile_pda
+from comp382_assignment_2.pda.pda_loader import (
+    clear_pda_cache,
+    list_pdas,
+    load_cfl_pda,
+    load_compiled_pda,
+    load_compiled_product,
+    load_pda,
+    product_key,
+)
+from comp382_assignment_2.pda.product import (
+    CACHE_DIR_ENV,
+    product_config,
+    product_fingerprint,
+    read_cached_product,
+)
+from comp382_assignment_2.pda.pushdown_automata_model import PushdownAutomataModel
+from comp382_assignment_2.regex.regex_loader import list_regex_keys, load_regex
+from comp382_assignment_2.super_pda.registry import list_super_pda_keys
+
+
+def print_header(title):
+    print("\n" + "=" * 70)
+    print(f" {title}")
+    print("=" * 70)
+
+
+def timed(func, *args, repeat: int = 3):
+    """Best-of-`repeat` wall time in seconds, plus the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func(*args)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+
+def legacy_check_pda_accept(pda, input_str: str) -> tuple[bool, int]:
+    """
+    The original dict-keyed BFS from matchers/child_languages.py, kept as the
+    baseline. Returns (accepted, configurations explored).
+    """
+    initial = (pda.initial_state, 0, (pda.initial_stack_symbol,))
+    queue = deque([initial])
+    visited = set()
+    explored = 0
+
+    while queue:
+        state, idx, stack_tuple = queue.popleft()
+        explored += 1
+        stack = list(stack_tuple)
+
+        if idx == len(input_str) and state in pda.final_states:
+            return True, explored
+
+        symbol = input_str[idx] if idx < len(input_str) else None
+        stack_top = stack[-1] if stack else None
+
+        possible_transitions = []
+
+        if (state, symbol, stack_top) in pda.transitions:
+            possible_transitions.extend(pda.transitions[(state, symbol, stack_top)])
+        if (state, None, stack_top) in pda.transitions:
+            possible_transitions.extend(pda.transitions[(state, None, stack_top)])
+        if (state, symbol, None) in pda.transitions:
+            possible_transitions.extend(pda.transitions[(state, symbol, None)])
+        if (state, None, None) in pda.transitions:
+            possible_transitions.extend(pda.transitions[(state, None, None)])
+
+        for next_state, push_list in possible_transitions:
+            new_stack = stack.copy()
+
+            if stack_top is not None:
+                new_stack.pop()
+
+            for sym in reversed(push_list):
+                if sym:
+                    new_stack.append(sym)
+
+            new_idx = idx + 1 if symbol is not None and (state, symbol, stack_top) in pda.transitions else idx
+
+            config = (next_state, new_idx, tuple(new_stack))
+            if config not in visited and new_idx <= len(input_str):
+                visited.add(config)
+                queue.append(config)
+
+    return False, explored
+
+
+def bench_compiled_pda():
+    """Per-configuration cost: legacy dict-keyed BFS vs CompiledPDA.accepts"""
+    print_header("COMPILED PDA RUNTIME (per-configuration cost)")
+
+    cases = [
+        ("a_bn_a", "a" + "b" * 5000 + "a"),
+        ("a_bn_a", "a" + "b" * 5000),
+        ("bn", "b" * 5000),
+        ("aa", "aa"),
+        ("an_bn", "a" * 300 + "b" * 300),
+    ]
+
+    for name, text in cases:
+        model = load_pda(name)
+        compiled = compile_pda(model)
+
+        legacy_time, (legacy_result, explored) = timed(legacy_check_pda_accept, model, text)
+        compiled_time, compiled_result = timed(compiled.accepts, text)
+        assert legacy_result == compiled_result, (name, text)
+
+        legacy_ns = legacy_time / explored * 1e9
+        compiled_ns = compiled_time / explored * 1e9
+        print(
+            f"  {name:8} len={len(text):6} configs={explored:6}  "
+            f"legacy {legacy_ns:8.0f} ns/config  compiled {compiled_ns:8.0f} ns/config  "
+            f"x{legacy_ns / compiled_ns:5.1f}"
+        )
+
+
+def bench_specialised_runners():
+    """Acceptance on long inputs: general search vs the runner analysis picks"""
+    print_header("SPECIALISED RUNNERS (general search vs the selected runner)")
+
+    cases = [
+        ("an_bn", "a" * 50000 + "b" * 50000),
+        ("a_bn_a", "a" + "b" * 100000 + "a"),
+        ("bn", "b" * 100000),
+        ("aa", "aa"),
+        ("empty", "ab" * 50000),
+    ]
+    for name, text in cases:
+        model = load_pda(name)
+        general = CompiledPDA(model, specialise=False)
+        specialised = compile_pda(model)
+
+        general_time, general_result = timed(general.accepts, text)
+        runner_time, runner_result = timed(specialised.accepts, text)
+        assert general_result == runner_result, name
+        print(
+            f"  {name:8} len={len(text):6}  general {general_time * 1e3:8.2f} ms  "
+            f"{specialised.engine:12} {runner_time * 1e3:7.2f} ms  x{general_time / runner_time:7.1f}"
+        )
+
+
+def bench_deterministic_runner():
+    """Deterministic PDAs: legacy BFS vs general search vs the straight-line loop"""
+    print_header("DETERMINISTIC PDAs (BFS vs straight-line stepping)")
+
+    cases = [
+        ("an_bn", "a" * 2000 + "b" * 2000),
+        ("an_bn", "b" + "a" * 4000),
+        ("a_bn_a", "a" + "b" * 4000 + "a"),
+        ("bn", "b" * 4000),
+    ]
+    for name, text in cases:
+        model = load_pda(name)
+        general = CompiledPDA(model, specialise=False)
+        assert general.deterministic, name
+        runner = DeterministicRunner(general)
+        symbols = general.encode(text)
+
+        legacy_time, (legacy_result, _) = timed(legacy_check_pda_accept, model, text)
+        general_time, general_result = timed(general.accepts, text)
+        runner_time, runner_result = timed(runner.accepts, symbols)
+        assert legacy_result == general_result == runner_result, name
+        print(
+            f"  {name:8} len={len(text):5}  legacy BFS {legacy_time * 1e3:8.2f} ms  "
+            f"general {general_time * 1e3:6.2f} ms  deterministic {runner_time * 1e3:6.2f} ms  "
+            f"x{legacy_time / runner_time:6.1f}"
+        )
+
+
+def even_palindrome_pda() -> PushdownAutomataModel:
+    """w w^R over {a, b}: pushes, guesses the middle with an ε-move, pops."""
+    return PushdownAutomataModel(
+        states={"q0", "q1", "q2"},
+        alphabet={"a", "b"},
+        stack_alphabet={"A", "B", "Z"},
+        transitions={
+            ("q0", "a", None): [("q0", ["A"])],
+            ("q0", "b", None): [("q0", ["B"])],
+            ("q0", None, None): [("q1", [])],
+            ("q1", "a", "A"): [("q1", [])],
+            ("q1", "b", "B"): [("q1", [])],
+            ("q1", None, "Z"): [("q2", ["Z"])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"q2"},
+    )
+
+
+def bench_pruning():
+    """General search on near-miss inputs, with and without input-bound pruning"""
+    print_header("INPUT-BOUND PRUNING (explored configurations)")
+
+    cases = [
+        ("an_bn", CompiledPDA(load_pda("an_bn"), specialise=False), "a" * 5000 + "b" * 4999),
+        ("w w^R", compile_pda(even_palindrome_pda()), "a" * 1500 + "b" + "a" * 1499),
+    ]
+    for name, pda, text in cases:
+        plain_time, plain = timed(pda.search_stats, text, False, repeat=1)
+        pruned_time, pruned = timed(pda.search_stats, text, True, repeat=1)
+        assert plain.accepted == pruned.accepted, name
+        print(
+            f"  {name:8} len={len(text):5}  explored {plain.explored:8} → {pruned.explored:8} "
+            f"(pruned {pruned.pruned})  {plain_time * 1e3:7.1f} ms → {pruned_time * 1e3:7.1f} ms"
+        )
+
+
+def bench_language_shortcuts():
+    """Empty / finite intersections: per-start PDA search vs the language analysis"""
+    print_header("EMPTY / FINITE LANGUAGES (per-start search vs analysis)")
+
+    for key in ("empty", "aa"):
+        pda = load_compiled_pda(key)
+        for length in (1000, 100000):
+            text = random_text(length)
+            search_time, expected = timed(match_language, pda, text, "per_start", repeat=1)
+            auto_time, result = timed(match_language, pda, text, "auto")
+            assert result == expected, key
+            print(
+                f"  {key:6} len={length:6}  per_start {search_time * 1e3:8.2f} ms  "
+                f"auto {auto_time * 1e3:7.3f} ms  x{search_time / auto_time:9.1f}"
+            )
+
+
+def bench_all_intersections():
+    """All nine intersections: nine separate matcher calls vs one shared pass"""
+    print_header("ALL INTERSECTIONS (nine calls vs match_all_intersections)")
+
+    matchers = [
+        intersect_r1_c1, intersect_r1_c2, intersect_r1_c3,
+        intersect_r2_c1, intersect_r2_c2, intersect_r2_c3,
+        intersect_r3_c1, intersect_r3_c2, intersect_r3_c3,
+    ]
+    rng = random.Random(382)
+    for kind in ("dense", "sparse"):
+        for length in (10000, 100000):
+            if kind == "dense":
+                text = random_text(length)
+            else:
+                text = "".join(rng.choice("ab") * rng.randint(100, 1000) for _ in range(length // 550))
+            one_time, _ = timed(intersect_r1_c1, text)
+            nine_time, separate = timed(lambda: [matcher(text) for matcher in matchers])
+            all_time, combined = timed(match_all_intersections, text)
+            assert sorted(separate) == sorted(combined.values())
+            print(
+                f"  {kind:6} len={len(text):6}  one call {one_time * 1e3:7.2f} ms  "
+                f"nine calls {nine_time * 1e3:7.2f} ms  combined {all_time * 1e3:7.2f} ms"
+            )
+
+
+def legacy_super_accept(input_str: str, matcher) -> str:
+    """The original super_accept: a longest-substring search compared with the input."""
+    return "matched" if input_str and matcher(input_str) == input_str else "unmatched"
+
+
+def bench_super_accept():
+    """Whole-string membership: longest-substring search vs direct SuperPDA run"""
+    print_header("SUPER ACCEPT (longest substring vs SuperPDA membership)")
+
+    cases = [
+        ("r1", "c1", intersect_r1_c1, "a" * 5000 + "b" * 5000, "b" + "a" * 5000 + "b" * 5000),
+        ("r2", "c2", intersect_r2_c2, "a" + "b" * 10000 + "a", "b" + "a" + "b" * 10000 + "a"),
+        ("r1", "c2", intersect_r1_c2, "aa", "b" + "a" * 10000),
+    ]
+    for regular, cfl, matcher, member, reject_early in cases:
+        for label, text in (("member", member), ("reject@0", reject_early)):
+            legacy_time, legacy = timed(legacy_super_accept, text, matcher)
+            direct_time, result = timed(super_accept, text, regular, cfl)
+            assert legacy == result
+            print(
+                f"  {regular},{cfl} {label:8} len={len(text):6}  search {legacy_time * 1e3:7.3f} ms  "
+                f"super_accept {direct_time * 1e3:7.3f} ms"
+            )
+
+    batch = [random_text(length, "ab", seed=seed) for seed, length in enumerate(range(1, 2001))]
+    legacy_time, legacy = timed(lambda: [legacy_super_accept(s, intersect_r1_c1) for s in batch])
+    loop_time, looped = timed(lambda: [super_accept(s) for s in batch])
+    many_time, many = timed(super_accept_many, batch)
+    assert legacy == looped == many
+    print(
+        f"  batch of {len(batch)} random strings  search {legacy_time * 1e3:7.2f} ms  "
+        f"super_accept loop {loop_time * 1e3:7.2f} ms  super_accept_many {many_time * 1e3:7.2f} ms"
+    )
+
+
+def legacy_regex_a_b_star_a_matcher(input_str: str) -> str:
+    """The original triple loop from matchers/regular_languages.py."""
+    n, best = len(input_str), ""
+    for i in range(n):
+        if input_str[i] != "a":
+            continue
+        for j in range(i + 1, n):
+            if input_str[j] != "a":
+                continue
+            if all(input_str[k] == "b" for k in range(i + 1, j)) and j + 1 - i > len(best):
+                best = input_str[i:j + 1]
+    return best
+
+
+def bench_regular_matchers():
+    """Regular-language search: hand-written matchers vs minimised DFA scan"""
+    print_header("REGULAR MATCHERS (hand-written vs minimised DFA)")
+
+    text = random_text(2000, "abb")
+    legacy_time, legacy = timed(legacy_regex_a_b_star_a_matcher, text, repeat=1)
+    dfa_time, result = timed(regex_a_b_star_a_matcher, text)
+    assert legacy == result
+    print(
+        f"  ab*a     len={len(text):6}  triple loop {legacy_time * 1e3:8.1f} ms  "
+        f"dfa {dfa_time * 1e3:6.2f} ms  x{legacy_time / dfa_time:7.1f}"
+    )
+
+    for key in list_regex_keys():
+        dfa = load_regex(key)
+        for length in (10000, 100000):
+            text = random_text(length, "ab")
+            scan_time, _ = timed(dfa.longest_match_span, text)
+            print(
+                f"  {dfa.pattern:8} len={length:6}  {dfa.n_states} states  "
+                f"{scan_time * 1e3:7.2f} ms  ({scan_time / length * 1e9:5.0f} ns/char)"
+            )
+
+
+def bench_product_construction():
+    """SuperPDA products: cold construction vs on-disk cache vs in-process memo"""
+    print_header("DFA × PDA PRODUCTS (build vs disk cache vs memo)")
+
+    previous = os.environ.get(CACHE_DIR_ENV)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ[CACHE_DIR_ENV] = cache_dir
+        try:
+            for regex_key in list_regex_keys():
+                for cfl_key in ("an_bn", "a_bn_a", "bn"):
+                    key = product_key(regex_key, cfl_key)
+                    dfa, cfl = load_regex(regex_key), load_cfl_pda(cfl_key)
+                    build_time, config = timed(product_config, dfa, cfl)
+                    clear_pda_cache()
+                    load_compiled_product(regex_key, cfl_key)  # writes the cache file
+                    disk_time, cached = timed(read_cached_product, key, product_fingerprint(dfa, cfl))
+                    memo_time, _ = timed(load_compiled_product, regex_key, cfl_key)
+                    assert cached["states"] == config["states"]
+                    print(
+                        f"  {key:24} {len(config['states'])} states  build {build_time * 1e6:6.1f} µs  "
+                        f"disk {disk_time * 1e6:6.1f} µs  memo {memo_time * 1e6:5.2f} µs"
+                    )
+        finally:
+            clear_pda_cache()
+            if previous is None:
+                os.environ.pop(CACHE_DIR_ENV, None)
+            else:
+                os.environ[CACHE_DIR_ENV] = previous
+
+
+def peak_memory(func, *args) -> tuple[int, object]:
+    """Peak bytes allocated while func runs, plus its result."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_span_api():
+    """Brute-force candidate search: sliced strings vs zero-copy spans"""
+    print_header("SPAN API (sliced candidates vs memoryview spans)")
+
+    pda = load_compiled_pda("an_bn")
+    for length in (200, 400, 800):
+        # A late a^n b^n block makes the longest-first search test most candidates.
+        text = random_text(length - 20, "ab") + "a" * 10 + "b" * 10
+        sliced_time, sliced = timed(lambda: longest_matching_span(text, lambda t, i, j: pda.accepts(t[i:j])), repeat=1)
+        span_time, spans = timed(lambda: longest_matching_span(pda.encode_view(text), pda.accepts_span), repeat=1)
+        assert sliced == spans
+        copied = sum((length - k + 1) * k for k in range(spans[1] - spans[0], length + 1))
+        print(
+            f"  len={length:4}  sliced {sliced_time * 1e3:8.1f} ms ({copied / 2**20:6.1f} MiB copied)  "
+            f"spans {span_time * 1e3:8.1f} ms (0 copied)"
+        )
+
+
+def bench_parikh_prefilter():
+    """Brute-force candidate search with and without the Parikh-vector prefilter"""
+    print_header("PARIKH PREFILTER (every candidate run vs count-filtered candidates)")
+
+    for key in ("an_bn", "a_bn_a", "bn"):
+        pda = load_compiled_pda(key)
+        for length in (200, 400):
+            text = random_text(length - 20, "ab") + "a" * 10 + "b" * 10
+            symbols = pda.encode_view(text)
+            plain_time, plain = timed(lambda: longest_matching_span(symbols, pda.accepts_span), repeat=1)
+            candidates = pda.parikh.prefilter(symbols)
+            filtered_time, filtered = timed(
+                lambda: longest_matching_span(symbols, candidates.guard(pda.accepts_span)), repeat=1
+            )
+            assert plain == filtered
+            print(
+                f"  {key:6} len={length:4}  all candidates {plain_time * 1e3:8.1f} ms  "
+                f"prefiltered {filtered_time * 1e3:8.1f} ms  "
+                f"({candidates.rejection_ratio:6.1%} of {candidates.checked} rejected)"
+            )
+
+
+def bench_match_enumeration():
+    """All matches: eager candidate list vs lazy, output-sensitive iter_matches"""
+    print_header("MATCH ENUMERATION (find_all_matching_substrings vs iter_matches)")
+
+    pda = load_compiled_pda("bn")
+    text = random_text(400)
+    eager_time, eager = timed(find_all_matching_substrings, text, pda.accepts, repeat=1)
+    lazy_time, lazy = timed(lambda: list(iter_matches(text, "bn", "all")))
+    assert sorted((start, end) for _, start, end in eager) == lazy
+    print(f"  bn all            len={len(text):8}  eager {eager_time * 1e3:8.1f} ms  lazy {lazy_time * 1e3:8.2f} ms")
+
+    text = random_text(1_000_000)
+    for key in ("an_bn", "a_bn_a", "bn"):
+        for mode in ("maximal", "leftmost_longest", "top_k"):
+            first_time, _ = timed(lambda: next(iter_matches(text, key, mode)), repeat=1)
+            memory, count = peak_memory(lambda: sum(1 for _ in iter_matches(text, key, mode)))
+            total_time, _ = timed(lambda: sum(1 for _ in iter_matches(text, key, mode)), repeat=1)
+            print(
+                f"  {key:6} {mode:16} len={len(text):8}  first {first_time * 1e3:7.3f} ms  "
+                f"all {count:7} in {total_time * 1e3:7.1f} ms  peak {memory / 1024:6.1f} KiB"
+            )
+
+
+def bench_stack_memory():
+    """Peak search memory on deep stacks: tuple stacks vs hash-consed stacks"""
+    print_header("STACK MEMORY (tuple stacks vs hash-consed cons cells)")
+
+    model = load_pda("an_bn")
+    compiled = compile_pda(model)
+    for n in (500, 1000, 2000):
+        text = "a" * n + "b" * n
+        legacy_peak, (legacy_result, _) = peak_memory(legacy_check_pda_accept, model, text)
+        compiled_peak, compiled_result = peak_memory(compiled.accepts, text)
+        assert legacy_result == compiled_result
+        print(
+            f"  an_bn    depth={n:5}  tuple stacks {legacy_peak / 2**20:8.2f} MiB  "
+            f"cons cells {compiled_peak / 2**20:6.2f} MiB  x{legacy_peak / compiled_peak:6.1f}"
+        )
+
+
+def random_text(length: int, alphabet: str = "ab", seed: int = 382) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def bench_per_start_matcher():
+    """Generic longest-substring search: brute force vs one run per start"""
+    print_header("GENERIC MATCHER (brute force vs per-start simulation)")
+
+    text = random_text(300)
+    for name in list_super_pda_keys():
+        pda = load_compiled_pda(name)
+        brute_time, brute = timed(match_language, pda, text, "brute_force", repeat=1)
+        start_time, per_start = timed(match_language, pda, text, "per_start", repeat=1)
+        assert brute == per_start, name
+        print(
+            f"  {name:8} len={len(text)}  brute force {brute_time * 1e3:9.1f} ms  "
+            f"per-start {start_time * 1e3:7.1f} ms  x{brute_time / start_time:7.1f}"
+        )
+
+
+def bench_gss_matcher():
+    """Generic longest-substring search: per-start vs brute force vs one GSS pass"""
+    print_header("GENERIC MATCHER (graph-structured stack, all starts in one pass)")
+
+    # Random text kills most per-start runs early; long runs keep them alive.
+    cases = [
+        ("random", random_text(300), True),
+        ("runs", "a" * 150 + "b" * 150 + "a" * 150, True),
+        ("runs", "a" * 1000 + "b" * 1000 + "a" * 1000, False),
+    ]
+    for label, text, with_brute_force in cases:
+        for name in list_super_pda_keys():
+            pda = load_compiled_pda(name)
+            gss_time, gss = timed(match_language, pda, text, "gss", repeat=1)
+            start_time, per_start = timed(match_language, pda, text, "per_start", repeat=1)
+            assert gss == per_start, name
+            line = (
+                f"  {name:8} {label:6} len={len(text):5}  per-start {start_time * 1e3:8.1f} ms  "
+                f"gss {gss_time * 1e3:6.1f} ms"
+            )
+            if with_brute_force:
+                brute_time, brute = timed(match_language, pda, text, "brute_force", repeat=1)
+                assert brute == gss, name
+                line += f"  brute force {brute_time * 1e3:8.1f} ms"
+            print(line)
+
+
+def bench_chart_parser():
+    """Longest match of a nondeterministic CFL: per-start and GSS searches vs one CYK chart"""
+    print_header("CHART PARSER (per-start / GSS vs bitset CYK)")
+
+    pda = compile_pda(even_palindrome_pda())
+    pda.grammar  # converted once per PDA
+    for length in (100, 200, 400):
+        for label, text in (("random", random_text(length)), ("runs", "ab" * (length // 4) + "a" * (length // 2))):
+            start_time, per_start = timed(match_language_span, pda, text, "per_start", repeat=1)
+            gss_time, gss = timed(match_language_span, pda, text, "gss", repeat=1)
+            chart_time, chart = timed(match_language_span, pda, text, "chart", repeat=1)
+            assert per_start == gss == chart
+            print(
+                f"  w w^R  {label:6} len={length:4}  per-start {start_time * 1e3:8.1f} ms  "
+                f"gss {gss_time * 1e3:8.1f} ms  chart {chart_time * 1e3:8.1f} ms"
+            )
+
+
+# Input lengths each engine is timed at when calibrating the planner.
+_CALIBRATION_LENGTHS = {
+    "empty": (1_000, 10_000, 100_000),
+    "words": (1_000, 10_000, 100_000),
+    "run_length": (1_000, 10_000, 100_000),
+    "per_start": (250, 500, 1_000, 2_000),
+    "gss": (250, 500, 1_000, 2_000),
+    "chart": (100, 200, 400, 800),
+    "brute_force": (100, 200, 400),
+}
+
+
+def calibration_texts(length: int) -> list[str]:
+    """
+    Random a/b text plus worst cases, all of `length`: long runs
+    (a^k b^k a^k, a^k b^2k) and "baba…", whose many short spans keep the
+    brute-force search from stopping early.
+    """
+    third = length // 3
+    runs = "a" * third + "b" * third + "a" * (length - 2 * third)
+    pairs = "a" * third + "b" * (length - third)
+    alternating = ("ba" * length)[:length]
+    return [random_text(length), runs, pairs, alternating]
+
+
+def bench_planner(calibrate: bool = False, path: str | None = None):
+    """Check the planner's choices; with calibrate, refit its cost model first and save it"""
+    print_header("ENGINE PLANNER (calibrated cost model)")
+
+    if calibrate:
+        calibrate_planner(path)
+    else:
+        print(f"  cost model {cost_model_path()} (refit with --calibrate)")
+
+    for key in ("an_bn", "aa", "empty"):
+        pda = load_compiled_pda(key)
+        text = random_text(5_000)
+        plan = explain(pda, text)
+        print(f"\n  {key} at len={len(text)}:")
+        print("\n".join(f"    {line}" for line in str(plan).splitlines()))
+
+    general = CompiledPDA(load_pda("an_bn"), specialise=False)
+    cases = [("random", random_text(50)), ("random", random_text(500)), ("a^k b^k a^k", "a" * 200 + "b" * 200 + "a" * 200)]
+    for label, text in cases:
+        measured = {
+            engine: timed(match_language_span, general, text, engine, repeat=1)[0]
+            for engine in applicable_engines(general)
+            if engine not in ("chart", "brute_force") or len(text) <= 500
+        }
+        chosen = plan_match(general, len(text)).engine
+        print(
+            f"  an_bn (general) {label:11} len={len(text):4}  planner picks {chosen:11} "
+            f"({measured[chosen] * 1e3:8.2f} ms), fastest {min(measured, key=measured.get):11} "
+            f"({min(measured.values()) * 1e3:8.2f} ms)"
+        )
+
+
+def calibrate_planner(path: str | None = None):
+    """
+    Time every applicable engine for every registry PDA, with its own
+    runner and with the general search, fit the cost model to the slowest
+    of calibration_texts() at each length, and save it to `path`
+    (default: cost_model_path()).
+    """
+    # (engine, runner kind) → length → seconds
+    samples: dict[tuple[str, str], dict[int, list[float]]] = {}
+    for key in list_pdas():
+        for pda in (load_compiled_pda(key), CompiledPDA(load_pda(key), specialise=False)):
+            pda.language, pda.parikh, pda.grammar  # one-off analyses, not part of a call's cost
+            for engine in applicable_engines(pda):
+                runner = pda.engine if engine in ("per_start", "gss", "chart", "brute_force") else "*"
+                for length in _CALIBRATION_LENGTHS[engine]:
+                    for text in calibration_texts(length):
+                        seconds, _ = timed(match_language_span, pda, text, engine)
+                        samples.setdefault((engine, runner), {}).setdefault(length, []).append(seconds)
+
+    costs: dict[str, dict[str, list[float]]] = {}
+    for (engine, runner), by_length in sorted(samples.items()):
+        lengths = sorted(by_length)
+        costs.setdefault(engine, {})[runner] = fit_cost(
+            lengths, [max(by_length[n]) for n in lengths], min_exponent(engine)
+        )
+        coefficient, exponent = costs[engine][runner]
+        print(f"  {engine:11} {runner:13} {coefficient:10.3e} · n^{exponent:<5}")
+    save_cost_model(costs, path)
+    print(f"  saved to {path or cost_model_path()}")
+
+
+def bench_result_cache():
+    """GUI-style repeated lookups: toggling between two intersections, with and without the LRU cache"""
+    print_header("RESULT CACHE (dropdown toggling, uncached vs MATCH_CACHE)")
+
+    text = random_text(20_000)
+    pairs = [("a_star_b_star", "an_bn"), ("a_b_star_a", "a_bn_a")] * 50
+    previous = MATCH_CACHE.maxsize
+    try:
+        MATCH_CACHE.resize(0)
+        uncached_time, uncached = timed(lambda: [intersection_span(r, c, text) for r, c in pairs], repeat=1)
+        MATCH_CACHE.resize(256)
+        MATCH_CACHE.clear()
+        cached_time, cached = timed(lambda: [intersection_span(r, c, text) for r, c in pairs], repeat=1)
+        assert cached == uncached
+        stats = MATCH_CACHE.stats()
+        print(
+            f"  {len(pairs)} lookups, len={len(text)}  uncached {uncached_time * 1e3:8.1f} ms  "
+            f"cached {cached_time * 1e3:6.2f} ms  ({stats.hits} hits, {stats.misses} misses)"
+        )
+    finally:
+        MATCH_CACHE.clear()
+        MATCH_CACHE.resize(previous)
+
+
+def bench_incremental_matcher():
+    """Keystroke edits: a full search per textChanged vs the incremental matcher"""
+    print_header("INCREMENTAL MATCHER (full search per keystroke vs one edit)")
+
+    rng = random.Random(382)
+    for regular, cfl in (("a_star_b_star", "an_bn"), ("a_b_star_a", "a_bn_a")):
+        language = intersection_languages()[(regular, cfl)]
+        for length in (10_000, 100_000):
+            text = random_text(length)
+            edits = []
+            for _ in range(50):
+                pos = rng.randint(0, len(text))
+                text = text[:pos] + rng.choice("ab") + text[pos:]
+                edits.append(text)
+
+            full_time, full = timed(lambda: [intersection_span(regular, cfl, t) for t in edits], repeat=1)
+            matcher = IncrementalMatcher(language, random_text(length))
+
+            def type_edits():
+                spans = []
+                for t in edits:
+                    matcher.update(t)
+                    spans.append(matcher.longest_span())
+                return spans
+
+            incremental_time, incremental = timed(type_edits, repeat=1)
+            assert incremental == full
+            print(
+                f"  {language:6} len={length:7}  full search {full_time / len(edits) * 1e3:8.3f} ms/key  "
+                f"incremental {incremental_time / len(edits) * 1e3:8.3f} ms/key"
+            )
+
+
+def bench_streaming_scan():
+    """
+    Large files: read + match_all_intersection_spans vs the memory-mapped
+    chunked scan, against a plain chunked read of the same memory map
+    """
+    print_header("STREAMING SCAN (whole file in memory vs memory-mapped chunks)")
+
+    rng = random.Random(382)
+    dense = random_text(1 << 20).encode() * 32
+    sparse = b"".join(rng.choice((b"a", b"b", b"x")) * rng.randint(50, 500) for _ in range(120_000))[:32 << 20]
+    log = b"".join(
+        b"2026-10-17 INFO request id=%d path=/api/v1/items took %dms\n" % (rng.randint(0, 10**6), rng.randint(1, 999))
+        for _ in range(20_000)
+    ) * 28
+    with tempfile.TemporaryDirectory() as directory:
+        for name, data in (("dense", dense), ("sparse", sparse), ("log", log)):
+            path = os.path.join(directory, f"{name}.txt")
+            with open(path, "wb") as f:
+                f.write(data)
+
+            def in_memory():
+                with open(path, "r", encoding="latin-1") as f:
+                    return match_all_intersection_spans(f.read())
+
+            memory_time, expected = timed(in_memory, repeat=1)
+            memory_peak, _ = peak_memory(in_memory)
+            scan_time, spans = timed(scan_file, path)
+            scan_peak, _ = peak_memory(scan_file, path)
+            read_time, _ = timed(_read_mapped, path)
+            assert spans == expected
+            megabytes = len(data) / 1e6
+            print(
+                f"  {name:6} {megabytes:5.1f} MB  in memory {megabytes / memory_time:7.1f} MB/s "
+                f"peak {memory_peak / 1e6:6.1f} MB  |  scan {megabytes / scan_time:7.1f} MB/s "
+                f"peak {scan_peak / 1e6:6.1f} MB (chunks of {CHUNK_SIZE >> 20} MiB)  |  "
+                f"plain mmap read {megabytes / read_time:7.1f} MB/s"
+            )
+
+
+def _read_mapped(path: str) -> int:
+    """Copy a file out of a memory map chunk by chunk, as scan_file() does, and do nothing else."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return sum(len(mapped[offset:offset + CHUNK_SIZE]) for offset in range(0, len(mapped), CHUNK_SIZE))
+
+
+def bench_parallel_matcher():
+    """Sharded search: scaling from one worker process to every core"""
+    print_header(f"PARALLEL MATCHER (1 to {os.cpu_count()} workers)")
+
+    text = random_text(1 << 20) * 32
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2 ** i for i in range(1, cores.bit_length()) if 2 ** i < cores})
+    if cores == 1:
+        print("  one core: the sharded runs below measure overhead only, not scaling")
+    for key in (("a_star_b_star", "an_bn"), ("a_b_star_a", "a_bn_a")):
+        base_time, expected = timed(longest_match_parallel, text, key, 1, repeat=1)
+        for workers in counts:
+            seconds, span = timed(longest_match_parallel, text, key, workers, repeat=1)
+            assert span == expected
+            print(
+                f"  {intersection_languages()[key]:6} len={len(text):9}  workers={workers:3}  "
+                f"{seconds * 1e3:9.1f} ms  speedup {base_time / seconds:5.2f}x"
+            )
+
+
+def bench_batch_matcher():
+    """Batch CLI core: short strings per second through run_batches()"""
+    print_header("BATCH MATCHER (short strings/s, all nine intersections)")
+
+    rng = random.Random(382)
+    corpus = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 20))) + "\n" for _ in range(100_000)]
+    cores = os.cpu_count() or 1
+    for pairs, label in ((None, "all nine"), ([("a_star_b_star", "an_bn")], "one pair")):
+        matcher = BatchMatcher(pairs)
+        for workers in sorted({1, cores}):
+            seconds, _ = timed(lambda: run_batches(corpus, io.StringIO(), matcher, workers), repeat=1)
+            print(f"  {label:8}  workers={workers:3}  {len(corpus) / seconds:11,.0f} strings/s")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="bench", description="Time the matchers and engines.")
+    parser.add_argument(
+        "--calibrate", action="store_true",
+        help="refit the planner's cost model from this machine's timings and save it",
+    )
+    parser.add_argument(
+        "--cost-model", metavar="PATH",
+        help=f"where --calibrate saves the model (default: ${COST_MODEL_ENV}, else the packaged planner_costs.json)",
+    )
+    args = parser.parse_args(argv)
+
+    print("\n" + "*" * 70)
+    print("*  MATCHER BENCHMARKS")
+    print("*" * 70)
+
+    # Benchmarks time the matchers themselves, not repeated cache hits.
+    MATCH_CACHE.resize(0)
+
+    bench_compiled_pda()
+    bench_stack_memory()
+    bench_specialised_runners()
+    bench_deterministic_runner()
+    bench_pruning()
+    bench_language_shortcuts()
+    bench_all_intersections()
+    bench_super_accept()
+    bench_span_api()
+    bench_parikh_prefilter()
+    bench_match_enumeration()
+    bench_regular_matchers()
+    bench_product_construction()
+    bench_per_start_matcher()
+    bench_gss_matcher()
+    bench_chart_parser()
+    bench_planner(args.calibrate, args.cost_model)
+    bench_result_cache()
+    bench_incremental_matcher()
+    bench_streaming_scan()
+    bench_parallel_matcher()
+    bench_batch_matcher()
+
+    print("\n" + "=" * 70)
+    print(" BENCHMARKS COMPLETE")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,36 +3,15 @@ from typing import TYPE_CHECKING
 from comp382_assignment_2.common.status import Status
 from comp382_assignment_2.gui.app_config import AppConfig
 from comp382_assignment_2.gui.content_panel_model import ContentPanelModel
-from comp382_assignment_2.matchers.intersection_matchers import (
-    intersect_r1_c1,
-    intersect_r1_c2,
-    intersect_r1_c3,
-    intersect_r2_c1,
-    intersect_r2_c2,
-    intersect_r2_c3,
-    intersect_r3_c1,
-    intersect_r3_c2,
-    intersect_r3_c3,
-)
+from comp382_assignment_2.matchers.incremental import LANGUAGES as INCREMENTAL_LANGUAGES, IncrementalMatcher
+from comp382_assignment_2.matchers.intersection_matchers import intersection_languages, intersection_span
+from comp382_assignment_2.matchers.run_length import span_text
 from comp382_assignment_2.super_pda.registry import get_super_pda
 
 if TYPE_CHECKING:
     from comp382_assignment_2.gui.content_panel import ContentPanel
 
 
-_INTERSECTION_LONGEST_MAP = {
-    ("a_star_b_star", "an_bn"): intersect_r1_c1,
-    ("a_star_b_star", "a_bn_a"): intersect_r1_c2,
-    ("a_star_b_star", "bn"): intersect_r1_c3,
-    ("a_b_star_a", "an_bn"): intersect_r2_c1,
-    ("a_b_star_a", "a_bn_a"): intersect_r2_c2,
-    ("a_b_star_a", "bn"): intersect_r2_c3,
-    ("a_star", "an_bn"): intersect_r3_c1,
-    ("a_star", "a_bn_a"): intersect_r3_c2,
-    ("a_star", "bn"): intersect_r3_c3,
-}
-
-
 class ContentPanelController:
     """Logic layer that connects left selections/input with flow + right Super PDA view."""
 
@@ -62,6 +41,7 @@ class ContentPanelController:
         self.model.reg_key = self.language_builder.selected_reg_key()
         self.model.cfl_key = self.language_builder.selected_cfl_key()
         self.model.super_definition = None
+        self.model.incremental = None
 
         if not self.model.reg_key or not self.model.cfl_key:
             self.model.pda_config_key = None
@@ -72,8 +52,9 @@ class ContentPanelController:
             self.flow.render()
             return
 
+        # A pair without an intersection_map entry gets its DFA × PDA product.
         lookup = f"{self.model.reg_key}__{self.model.cfl_key}"
-        self.model.pda_config_key = self.app_config.intersection_map.get(lookup)
+        self.model.pda_config_key = self.app_config.intersection_map.get(lookup, lookup)
 
         labels = getattr(self.app_config, "intersection_labels", {})
         self.flow.language_label = labels.get(self.model.pda_config_key, "") if self.model.pda_config_key else ""
@@ -88,8 +69,9 @@ class ContentPanelController:
             self.right_panel.set_status(Status.REJECTED)
         else:
             self.model.super_definition = get_super_pda(self.model.pda_config_key)
+            self.model.incremental = self.create_incremental_matcher()
             self.right_panel.render_super_pda(self.model.super_definition)
-            filtered_text = self.get_filtered_input_text(self.language_builder.input_field.text())
+            filtered_text = self.find_longest_intersection_substring(self.language_builder.input_field.text())
             self.right_panel.set_filtered_input_text(filtered_text)
             self.prepare_super_model(filtered_text)
 
@@ -142,7 +124,7 @@ class ContentPanelController:
             self.right_panel.set_status(Status.RUNNING)
 
     def on_reset_clicked(self):
-        filtered_text = self.get_filtered_input_text(self.language_builder.input_field.text())
+        filtered_text = self.find_longest_intersection_substring(self.language_builder.input_field.text())
 
         if not self.model.super_definition:
             self.right_panel.set_status(Status.IDLE)
@@ -169,18 +151,44 @@ class ContentPanelController:
         self.right_panel.set_status(Status.RUNNING if text else Status.IDLE)
 
     def find_longest_intersection_substring(self, text: str) -> str:
+        """
+        The longest match of the selected intersection in text, for the
+        dropdown and reset paths. These ask again for a text that was
+        already matched, so the answer comes from MATCH_CACHE; on a miss the
+        planner picks the engine.
+        """
         if not self.model.reg_key or not self.model.cfl_key:
             return ""
-
-        matcher = _INTERSECTION_LONGEST_MAP.get((self.model.reg_key, self.model.cfl_key))
+        return span_text(text, intersection_span(self.model.reg_key, self.model.cfl_key, text))
+
+    def create_incremental_matcher(self) -> IncrementalMatcher | None:
+        """
+        The selection's matcher. Each pair keeps its own, so switching back
+        to an earlier selection only applies the edits made since.
+        """
+        pair = (self.model.reg_key, self.model.cfl_key)
+        matcher = self.model.incremental_matchers.get(pair)
         if matcher is None:
-            return ""
-
-        return matcher(text)
+            language = intersection_languages().get(pair)
+            if language not in INCREMENTAL_LANGUAGES:
+                return None
+            matcher = self.model.incremental_matchers[pair] = IncrementalMatcher(language)
+        return matcher
 
     def get_filtered_input_text(self, text: str) -> str:
-        if not text or not self.model.reg_key or not self.model.cfl_key:
+        """
+        The longest match of the selected intersection in text, for
+        keystrokes: the selection's IncrementalMatcher applies only the edit
+        since the previous text instead of searching again. Every language
+        in the intersection_map is run-shaped, so only a product pair has
+        none and is searched in full.
+        """
+        if not self.model.reg_key or not self.model.cfl_key:
             return ""
         if not self.model.pda_config_key or self.model.pda_config_key == "empty":
             return ""
-        return self.find_longest_intersection_substring(text)
+        if self.model.incremental is None:
+            return self.find_longest_intersection_substring(text)
+        # Cleared text is an edit too: the matcher must not keep the old text.
+        self.model.incremental.update(text)
+        return self.model.incremental.longest_text()
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from comp382_assignment_2.matchers.incremental import IncrementalMatcher
 from comp382_assignment_2.super_pda.base import BaseSuperPDA
 
 
@@ -9,3 +10,6 @@ class ContentPanelModel:
     cfl_key: str | None = None
     pda_config_key: str | None = None
     super_definition: BaseSuperPDA | None = None
+    incremental: IncrementalMatcher | None = None
+    # (reg_key, cfl_key) → its matcher, kept across dropdown changes
+    incremental_matchers: dict[tuple[str, str], IncrementalMatcher] = field(default_factory=dict)
@@ -28,7 +28,9 @@ from comp382_assignment_2.matchers.intersection_matchers import (
     intersect_r3_c3   # ∅
 )
 
-from comp382_assignment_2.matchers.super_pda import super_accept
+from comp382_assignment_2.matchers.super_pda import super_accept, super_accept_many
+
+from comp382_assignment_2.matchers.result_cache import MATCH_CACHE
 
 __all__ = [
     # 3 CFL functions (C1, C2, C3)
@@ -52,6 +54,10 @@ __all__ = [
     'intersect_r2_c3',
     'intersect_r3_c3',
 
-    # Special function
-    'super_accept'
+    # Special functions
+    'super_accept',
+    'super_accept_many',
+
+    # Shared LRU cache behind the intersection functions
+    'MATCH_CACHE'
 ]
\ No newline at end of file
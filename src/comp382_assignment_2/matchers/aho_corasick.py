@@ -0,0 +1,62 @@
+"""
+Aho–Corasick engine — leftmost-longest search for a finite set of words.
+
+A finite language (see pda/language.py) needs no PDA at all: its words go
+into one trie whose failure links turn it into a DFA over every suffix of
+the text read so far, so a single O(n) pass finds every occurrence.
+Each node also records the longest word ending there (following failure
+links), which is all a leftmost-longest search needs.
+
+Returns the (start, end) span of the LEFTMOST-LONGEST match, or None; the
+empty word never matches, like the other engines.
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """Complete goto/failure automaton: one dict of transitions per node."""
+
+    __slots__ = ("words", "_delta", "_longest")
+
+    def __init__(self, words):
+        self.words = tuple(sorted({word for word in words if word}))
+        alphabet = sorted({char for word in self.words for char in word})
+
+        trie: list[dict[str, int]] = [{}]
+        longest = [0]
+        for word in self.words:
+            node = 0
+            for char in word:
+                if char not in trie[node]:
+                    trie[node][char] = len(trie)
+                    trie.append({})
+                    longest.append(0)
+                node = trie[node][char]
+            longest[node] = len(word)
+
+        # Breadth-first, so a node's failure target is finished before it.
+        delta: list[dict[str, int]] = [dict.fromkeys(alphabet, 0) for _ in trie]
+        delta[0].update(trie[0])
+        fail = [0] * len(trie)
+        queue = deque(trie[0].values())
+        while queue:
+            node = queue.popleft()
+            longest[node] = max(longest[node], longest[fail[node]])
+            delta[node].update(delta[fail[node]])
+            for char, child in trie[node].items():
+                fail[child] = delta[fail[node]][char] if node else 0
+                delta[node][char] = child
+                queue.append(child)
+
+        self._delta = tuple(delta)
+        self._longest = tuple(longest)
+
+    def longest_match_span(self, text: str) -> tuple[int, int] | None:
+        delta, longest = self._delta, self._longest
+        node, best_end, best_length = 0, 0, 0
+        for idx, char in enumerate(text):
+            node = delta[node].get(char, 0)
+            if longest[node] > best_length:
+                best_end, best_length = idx + 1, longest[node]
+        return (best_end - best_length, best_end) if best_length else None
@@ -1,66 +1,33 @@
 """
 CFL matchers — the 3 base context-free languages used in this assignment.
 Each function returns the LONGEST matching substring.
+The search runs on the run-length engine (matchers/run_length.py) in O(n);
+the PDAs remain the reference definition of each language.
 
 C1: a^n b^n  (an_bn)
 C2: a b^n a  (a_bn_a)
 C3: b^n      (bn)
 """
 
-from comp382_assignment_2.pda.pda_loader import load_pda
-from comp382_assignment_2.matchers.substring_utils import find_longest_matching_substring
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA, compile_pda
+from comp382_assignment_2.matchers.run_length import (
+    longest_an_bn_span,
+    longest_a_bn_a_span,
+    longest_bn_span,
+    span_text
+)
 
 
-def check_pda_accept(pda, input_str: str) -> bool:
+def check_pda_accept(pda, input_str: str, algorithm: str = "auto") -> bool:
     """
     Helper function to check if a PDA accepts a string.
-    Uses BFS to handle nondeterminism.
+    Accepts a PushdownAutomataModel or a CompiledPDA; models are compiled
+    once (see pda/compiled_pda.py) and the BFS runs on the compiled tables.
+    algorithm="saturation" forces post* saturation (see CompiledPDA.accepts).
     """
-    from collections import deque
-
-    initial = (pda.initial_state, 0, (pda.initial_stack_symbol,))
-    queue = deque([initial])
-    visited = set()
-
-    while queue:
-        state, idx, stack_tuple = queue.popleft()
-        stack = list(stack_tuple)
-
-        if idx == len(input_str) and state in pda.final_states:
-            return True
-
-        symbol = input_str[idx] if idx < len(input_str) else None
-        stack_top = stack[-1] if stack else None
-
-        possible_transitions = []
-
-        if (state, symbol, stack_top) in pda.transitions:
-            possible_transitions.extend(pda.transitions[(state, symbol, stack_top)])
-        if (state, None, stack_top) in pda.transitions:
-            possible_transitions.extend(pda.transitions[(state, None, stack_top)])
-        if (state, symbol, None) in pda.transitions:
-            possible_transitions.extend(pda.transitions[(state, symbol, None)])
-        if (state, None, None) in pda.transitions:
-            possible_transitions.extend(pda.transitions[(state, None, None)])
-
-        for next_state, push_list in possible_transitions:
-            new_stack = stack.copy()
-
-            if stack_top is not None:
-                new_stack.pop()
-
-            for sym in reversed(push_list):
-                if sym:
-                    new_stack.append(sym)
-
-            new_idx = idx + 1 if symbol is not None and (state, symbol, stack_top) in pda.transitions else idx
-
-            config = (next_state, new_idx, tuple(new_stack))
-            if config not in visited and new_idx <= len(input_str):
-                visited.add(config)
-                queue.append(config)
-
-    return False
+    if not isinstance(pda, CompiledPDA):
+        pda = compile_pda(pda)
+    return pda.accepts(input_str, algorithm)
 
 
 def an_bn(input_str: str) -> str:
@@ -69,8 +36,7 @@ def an_bn(input_str: str) -> str:
     Returns LONGEST matching substring.
     Example: "ab", "aabb", "aaabbb"
     """
-    pda = load_pda("an_bn")
-    return find_longest_matching_substring(input_str, lambda s: check_pda_accept(pda, s))
+    return span_text(input_str, longest_an_bn_span(input_str))
 
 
 def a_bn_a(input_str: str) -> str:
@@ -79,8 +45,7 @@ def a_bn_a(input_str: str) -> str:
     Returns LONGEST matching substring.
     Example: "aa", "aba", "abba", "abbba"
     """
-    pda = load_pda("a_bn_a")
-    return find_longest_matching_substring(input_str, lambda s: check_pda_accept(pda, s))
+    return span_text(input_str, longest_a_bn_a_span(input_str))
 
 
 def bn(input_str: str) -> str:
@@ -89,5 +54,4 @@ def bn(input_str: str) -> str:
     Returns LONGEST matching substring.
     Example: "b", "bb", "bbb"
     """
-    pda = load_pda("bn")
-    return find_longest_matching_substring(input_str, lambda s: check_pda_accept(pda, s))
\ No newline at end of file
+    return span_text(input_str, longest_bn_span(input_str))
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Enumeration — lazy, output-sensitive streams of matches.
+
+iter_matches(input_str, language, mode) is a generator of (start, end)
+spans, so a multi-megabyte input never turns into a list of substrings:
+
+  mode="all"              — every non-empty match, by start then end
+  mode="maximal"          — matches not strictly inside another match, by start
+  mode="leftmost_longest" — non-overlapping: the longest match at the
+                            leftmost start, then resume after it
+  mode="top_k"            — the k longest maximal matches, longest first
+                            (ties leftmost)
+
+`language` is a SuperPDA registry key or a CompiledPDA. The base CFLs read
+their matches straight off the runs of the input (see run_length.py):
+
+  a^n b^n  — one a-run/b-run boundary m with n = min(run lengths) gives
+             the nested matches (m-k, m+k), k = 1..n; only k = n is maximal
+  a b^n a  — one match per 'a' that starts a fence; no match contains
+             another, so every match is maximal
+  b^n      — every sub-span of a b-run; the run itself is maximal
+
+so the work is proportional to the number of matches (or of runs) rather
+than to the O(n²) candidate substrings. Any other language runs the PDA
+once per start position and streams the longest end found from each start.
+"""
+
+import heapq
+import re
+
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+from comp382_assignment_2.pda.pda_loader import load_compiled_pda
+
+MODES = ("all", "maximal", "leftmost_longest", "top_k")
+
+_AN_BN_PAIR = re.compile(r"(?<!a)(a++)(b++)")
+_A_BN_A = re.compile(r"(?=(ab*+a))")
+_B_RUN = re.compile(r"b++")
+
+
+def iter_matches(input_str: str, language: "str | CompiledPDA", mode: str = "maximal", k: int = 10):
+    """Yield the (start, end) spans of `language` in `input_str` lazily (see module docstring)."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown enumeration mode '{mode}'. Available: {list(MODES)}")
+    if mode == "top_k":
+        maximal = iter_matches(input_str, language, "maximal")
+        yield from heapq.nlargest(k, maximal, key=lambda span: (span[1] - span[0], -span[0]))
+        return
+
+    if isinstance(language, str):
+        if language in _RUN_LENGTH:
+            yield from _RUN_LENGTH[language][mode](input_str)
+            return
+        language = load_compiled_pda(language)
+    if language.language.empty:
+        return
+    yield from _GENERIC[mode](input_str, language)
+
+
+# ── a^n b^n ───────────────────────────────────────────────────────────────────
+
+def _an_bn_all(input_str: str):
+    for pair in _AN_BN_PAIR.finditer(input_str):
+        boundary = pair.end(1)
+        n = min(boundary - pair.start(1), pair.end(2) - boundary)
+        for k in range(n, 0, -1):
+            yield boundary - k, boundary + k
+
+
+def _an_bn_maximal(input_str: str):
+    for pair in _AN_BN_PAIR.finditer(input_str):
+        boundary = pair.end(1)
+        n = min(boundary - pair.start(1), pair.end(2) - boundary)
+        yield boundary - n, boundary + n
+
+
+# ── a b^n a ───────────────────────────────────────────────────────────────────
+
+def _a_bn_a_all(input_str: str):
+    for fence in _A_BN_A.finditer(input_str):
+        yield fence.span(1)
+
+
+def _a_bn_a_leftmost_longest(input_str: str):
+    resume = 0
+    for start, end in _a_bn_a_all(input_str):
+        if start >= resume:
+            yield start, end
+            resume = end
+
+
+# ── b^n ───────────────────────────────────────────────────────────────────────
+
+def _bn_all(input_str: str):
+    for run in _B_RUN.finditer(input_str):
+        run_start, run_end = run.span()
+        for start in range(run_start, run_end):
+            for end in range(start + 1, run_end + 1):
+                yield start, end
+
+
+def _bn_maximal(input_str: str):
+    for run in _B_RUN.finditer(input_str):
+        yield run.span()
+
+
+_RUN_LENGTH = {
+    "an_bn": {"all": _an_bn_all, "maximal": _an_bn_maximal, "leftmost_longest": _an_bn_maximal},
+    "a_bn_a": {"all": _a_bn_a_all, "maximal": _a_bn_a_all, "leftmost_longest": _a_bn_a_leftmost_longest},
+    "bn": {"all": _bn_all, "maximal": _bn_maximal, "leftmost_longest": _bn_maximal},
+}
+
+
+# ── Any compiled PDA ──────────────────────────────────────────────────────────
+
+def _pda_all(input_str: str, pda: CompiledPDA):
+    symbols = pda.encode(input_str)
+    for start in range(len(symbols)):
+        for end in pda.accepting_ends(symbols, start):
+            if end > start:
+                yield start, end
+
+
+def _longest_ends(symbols: list[int], pda: CompiledPDA, start: int) -> int:
+    """Longest end of a non-empty match from `start`, or `start` if none."""
+    longest = start
+    for end in pda.accepting_ends(symbols, start):
+        longest = end
+    return longest
+
+
+def _pda_maximal(input_str: str, pda: CompiledPDA):
+    # (i, longest end from i) is maximal iff no earlier start reaches as far:
+    # any match containing it would start earlier and end at least as late.
+    symbols = pda.encode(input_str)
+    furthest = 0
+    for start in range(len(symbols)):
+        end = _longest_ends(symbols, pda, start)
+        if end > start and end > furthest:
+            yield start, end
+            furthest = end
+
+
+def _pda_leftmost_longest(input_str: str, pda: CompiledPDA):
+    symbols = pda.encode(input_str)
+    start = 0
+    while start < len(symbols):
+        end = _longest_ends(symbols, pda, start)
+        if end > start:
+            yield start, end
+            start = end
+        else:
+            start += 1
+
+
+_GENERIC = {"all": _pda_all, "maximal": _pda_maximal, "leftmost_longest": _pda_leftmost_longest}
\ No newline at end of file
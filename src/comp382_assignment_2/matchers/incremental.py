@@ -0,0 +1,354 @@
+"""
+Incremental matcher — keep the longest match up to date under edits.
+
+A typing user changes one character at a time, yet every textChanged
+signal used to rerun the whole search. IncrementalMatcher holds the text
+as a balanced tree (a treap ordered by position) of maximal letter runs
+and keeps the leftmost-longest match of one intersection language current
+through insert() / delete() / replace(), or update() with the whole new
+text, which applies just the edit between the old text and the new one.
+
+Every language the intersections reduce to is run-shaped (run_length.py),
+so each of its matches is "anchored" at one run and depends only on that
+run and its two neighbours:
+
+  an_bn   — an a-run followed by a b-run: 2·min(p, q) symbols
+  a_bn_a  — a b-run fenced by a's: the b-run plus one a on each side;
+            an a-run of two or more holds "aa"
+  bn      — a b-run: all of it
+  aa      — an a-run of two or more: "aa" at its start
+  empty   — nothing
+
+Each node stores its run's anchored match and, as its subtree summary,
+the number of characters and the longest anchored match below it, so the
+overall leftmost-longest match is found by one descent. An edit changes
+at most the run it falls in and its neighbours: the few runs around the
+edit are split out, edited, re-anchored and merged back in — O(log n)
+expected per edited character through insert() / delete(). update() is
+only told the new text, so it first finds the edit with C-level
+comparisons over the whole text — O(n), but memcmp-fast — and then pays
+O(k log n) for the k changed characters.
+
+Usage
+-----
+matcher = IncrementalMatcher("an_bn", "abab")
+matcher.insert(2, "a")    # "abaab"… positions as in str
+matcher.delete(0)
+matcher.update(new_text)  # from a textChanged signal
+matcher.longest_span(), matcher.longest_text()
+"""
+
+import random
+
+from comp382_assignment_2.matchers.run_length import RUN_ANCHORS
+
+LANGUAGES = ("an_bn", "a_bn_a", "bn", "aa", "empty")
+
+# Runs this far either side of the edited run are rebuilt; anchors depend
+# on direct neighbours only, and an edit touches the run and its neighbours.
+_WINDOW = 3
+
+
+# language → (anchor(previous, run, next) → (match length, offset from the run start),
+#             match length → matched text)
+_LANGUAGE_SHAPES = {
+    "an_bn": (RUN_ANCHORS["an_bn"], lambda n: "a" * (n // 2) + "b" * (n // 2)),
+    "a_bn_a": (RUN_ANCHORS["a_bn_a"], lambda n: "a" + "b" * (n - 2) + "a"),
+    "bn": (RUN_ANCHORS["bn"], lambda n: "b" * n),
+    "aa": (RUN_ANCHORS["aa"], lambda n: "aa"),
+    "empty": (RUN_ANCHORS["empty"], lambda n: ""),
+}
+
+
+class _Run:
+    """A treap node: one maximal run plus its subtree summary."""
+
+    __slots__ = ("char", "length", "match", "offset", "priority", "left", "right", "chars", "runs", "best")
+
+    def __init__(self, char: str, length: int, match: int, offset: int, priority: float):
+        self.char = char
+        self.length = length
+        self.match = match
+        self.offset = offset
+        self.priority = priority
+        self.left: _Run | None = None
+        self.right: _Run | None = None
+        self.chars = length
+        self.runs = 1
+        self.best = match
+
+
+def _refresh(node: _Run) -> _Run:
+    chars, runs, best = node.length, 1, node.match
+    for child in (node.left, node.right):
+        if child is not None:
+            chars += child.chars
+            runs += child.runs
+            if child.best > best:
+                best = child.best
+    node.chars, node.runs, node.best = chars, runs, best
+    return node
+
+
+def _split(node: _Run | None, k: int) -> tuple:
+    """(first k runs, the rest)."""
+    if node is None:
+        return None, None
+    left_runs = node.left.runs if node.left is not None else 0
+    if k <= left_runs:
+        first, node.left = _split(node.left, k)
+        return first, _refresh(node)
+    node.right, rest = _split(node.right, k - left_runs - 1)
+    return _refresh(node), rest
+
+
+def _merge(first: _Run | None, second: _Run | None) -> _Run | None:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if first.priority > second.priority:
+        first.right = _merge(first.right, second)
+        return _refresh(first)
+    second.left = _merge(first, second.left)
+    return _refresh(second)
+
+
+def _in_order(node: _Run | None, out: list) -> list:
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        out.append(node)
+        node = node.right
+    return out
+
+
+def _edge(node: _Run | None, side: str) -> _Run | None:
+    while node is not None and getattr(node, side) is not None:
+        node = getattr(node, side)
+    return node
+
+
+def _runs_of(text: str) -> list[list]:
+    runs: list[list] = []
+    for char in text:
+        if runs and runs[-1][0] == char:
+            runs[-1][1] += 1
+        else:
+            runs.append([char, 1])
+    return runs
+
+
+class IncrementalMatcher:
+    """The leftmost-longest match of one language in a text that is edited in place."""
+
+    def __init__(self, language: str, text: str = ""):
+        if language not in _LANGUAGE_SHAPES:
+            raise ValueError(f"Unknown incremental language '{language}'. Available: {list(LANGUAGES)}")
+        self.language = language
+        self._anchor, self._match_text = _LANGUAGE_SHAPES[language]
+        self._root: _Run | None = None
+        self._text: str | None = ""
+        self.replace(text)
+
+    def __len__(self) -> int:
+        return self._root.chars if self._root is not None else 0
+
+    @property
+    def text(self) -> str:
+        """The current text (rebuilt from the runs after direct edits)."""
+        if self._text is None:
+            self._text = "".join(node.char * node.length for node in _in_order(self._root, []))
+        return self._text
+
+    # ── Edits ────────────────────────────────────────────────────────────────
+
+    def replace(self, text: str) -> None:
+        """Start over from `text`: O(n)."""
+        self._root = self._build(_runs_of(text), None, None)
+        self._text = text
+
+    def insert(self, pos: int, chars: str) -> None:
+        """Insert `chars` before position pos (0 ≤ pos ≤ len)."""
+        if not 0 <= pos <= len(self):
+            raise IndexError(f"insert position {pos} outside 0..{len(self)}")
+        for i, char in enumerate(chars):
+            self._edit(pos + i, lambda runs, at, char=char: _insert_char(runs, at, char))
+        self._text = None
+
+    def delete(self, pos: int, count: int = 1) -> None:
+        """Delete `count` characters starting at position pos."""
+        if not 0 <= pos <= pos + count <= len(self):
+            raise IndexError(f"delete range {pos}..{pos + count} outside 0..{len(self)}")
+        for _ in range(count):
+            self._edit(pos, _delete_char)
+        self._text = None
+
+    def update(self, text: str) -> None:
+        """
+        Move to `text` by applying only what changed since the last text:
+        the common prefix and suffix are found with C-level comparisons,
+        and the characters between them are deleted and inserted. Finding
+        them is O(n); the k changed characters then cost O(k log n).
+        """
+        old = self.text
+        if text == old:
+            return
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, prefix)
+        removed, added = len(old) - prefix - suffix, len(text) - prefix - suffix
+        if removed + added > max(len(text) // 16, 64):
+            # A paste or a wholesale change: rebuilding is cheaper.
+            self.replace(text)
+            return
+        if removed:
+            self.delete(prefix, removed)
+        if added:
+            self.insert(prefix, text[prefix:prefix + added])
+        self._text = text
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def longest_span(self) -> tuple[int, int] | None:
+        """(start, end) of the leftmost-longest non-empty match, or None."""
+        node = self._root
+        if node is None or node.best == 0:
+            return None
+        best, start = node.best, 0
+        while True:
+            left = node.left
+            if left is not None and left.best == best:
+                node = left
+                continue
+            start += left.chars if left is not None else 0
+            if node.match == best:
+                start += node.offset
+                return start, start + best
+            start += node.length
+            node = node.right
+
+    def longest_text(self) -> str:
+        """The leftmost-longest match itself ("" for none); no slice of the text is taken."""
+        span = self.longest_span()
+        return self._match_text(span[1] - span[0]) if span else ""
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _edit(self, pos: int, change) -> None:
+        """Apply change(runs, local position) to the runs around pos and re-anchor them."""
+        if self._root is None:
+            self._root = self._build(change([], 0), None, None)
+            return
+        rank = self._rank_at(pos)
+        low = max(rank - _WINDOW, 0)
+        head, rest = _split(self._root, low)
+        window, tail = _split(rest, rank + _WINDOW + 1 - low)
+        runs = [[node.char, node.length] for node in _in_order(window, [])]
+        local = pos - (head.chars if head is not None else 0)
+        window = self._build(change(runs, local), _edge(head, "right"), _edge(tail, "left"))
+        self._root = _merge(_merge(head, window), tail)
+
+    def _rank_at(self, pos: int) -> int:
+        """Rank of the run holding position pos; the last run for pos == len."""
+        node, rank = self._root, 0
+        if pos >= node.chars:
+            return node.runs - 1
+        while True:
+            left_chars = node.left.chars if node.left is not None else 0
+            if pos < left_chars:
+                node = node.left
+                continue
+            rank += node.left.runs if node.left is not None else 0
+            if pos < left_chars + node.length:
+                return rank
+            pos -= left_chars + node.length
+            rank += 1
+            node = node.right
+
+    def _build(self, runs: list[list], before: _Run | None, after: _Run | None) -> _Run | None:
+        """
+        A treap of `runs` (a Cartesian tree over random priorities, built
+        in O(m)), anchored with `before` / `after` as outside neighbours.
+        """
+        anchor = self._anchor
+        previous = (before.char, before.length) if before is not None else None
+        stack: list[_Run] = []
+        for i, (char, length) in enumerate(runs):
+            following = runs[i + 1] if i + 1 < len(runs) else (
+                (after.char, after.length) if after is not None else None
+            )
+            node = _Run(char, length, *anchor(previous, (char, length), following), random.random())
+            previous = (char, length)
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = _refresh(stack.pop())
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        while len(stack) > 1:
+            _refresh(stack.pop())
+        return _refresh(stack[0]) if stack else None
+
+
+def _insert_char(runs: list[list], at: int, char: str) -> list[list]:
+    for i, run in enumerate(runs):
+        if at <= run[1]:
+            if run[0] == char:
+                run[1] += 1
+            elif at == run[1] and i + 1 < len(runs) and runs[i + 1][0] == char:
+                runs[i + 1][1] += 1
+            elif at == 0:
+                runs.insert(i, [char, 1])
+            elif at == run[1]:
+                runs.insert(i + 1, [char, 1])
+            else:
+                runs[i:i + 1] = [[run[0], at], [char, 1], [run[0], run[1] - at]]
+            return runs
+        at -= run[1]
+    runs.append([char, 1])
+    return runs
+
+
+def _delete_char(runs: list[list], at: int) -> list[list]:
+    for i, run in enumerate(runs):
+        if at < run[1]:
+            run[1] -= 1
+            if run[1] == 0:
+                del runs[i]
+                if 0 < i < len(runs) and runs[i - 1][0] == runs[i][0]:
+                    runs[i - 1][1] += runs.pop(i)[1]
+            return runs
+        at -= run[1]
+    return runs
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix, by bisection over C-level slice comparisons."""
+    if b.startswith(a):
+        return len(a)
+    if a.startswith(b):
+        return len(b)
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, prefix: int) -> int:
+    """Length of the common suffix that does not overlap the common prefix."""
+    low, high = 0, min(len(a), len(b)) - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
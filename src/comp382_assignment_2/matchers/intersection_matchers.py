@@ -2,12 +2,36 @@
 Intersection matchers
 All functions return LONGEST matching substrings.
 
+The *_span functions return the (start, end) span of that substring (None
+for no match) without copying it out of the input; the string functions
+are thin wrappers around them.
+
+intersection_span() and the intersect_r*_c* functions are memoised in the
+shared LRU MATCH_CACHE (result_cache.py), so repeated calls with the same
+text are answered at once.
+
 """
 
-from comp382_assignment_2.pda.pda_loader import load_pda
-from comp382_assignment_2.matchers.substring_utils import find_longest_matching_substring
+import json
+import os
+from types import MappingProxyType
+
+from comp382_assignment_2.pda.gss import longest_match_span
+from comp382_assignment_2.matchers.aho_corasick import AhoCorasick
+from comp382_assignment_2.matchers.planner import applicable_engines, plan_match, run_length_language
+from comp382_assignment_2.matchers.result_cache import MATCH_CACHE
+from comp382_assignment_2.pda.pda_loader import load_compiled_pda, load_compiled_product
+from comp382_assignment_2.matchers.substring_utils import (
+    longest_matching_span,
+    longest_matching_span_chart,
+    longest_matching_span_per_start
+)
+from comp382_assignment_2.matchers.run_length import (
+    LONGEST_SPANS,
+    longest_spans_by_language,
+    span_text
+)
 from comp382_assignment_2.matchers.child_languages import (
-    check_pda_accept,
     an_bn,
     a_bn_a,
     bn
@@ -15,55 +39,172 @@ from comp382_assignment_2.matchers.child_languages import (
 
 
 # Only need to load PDAs not already covered by child language functions
-L_aa_pda  = load_pda("aa")     # {aa}  — R1∩C2 and R3∩C2
-L_emp_pda = load_pda("empty")  # ∅     — R2∩C1, R2∩C3, R3∩C1, R3∩C3
-
-
-def match_language(pda, input_str: str) -> str:
-    """Find the LONGEST substring accepted by PDA"""
-    return find_longest_matching_substring(input_str, lambda s: check_pda_accept(pda, s))
-
-
+L_aa_pda  = load_compiled_pda("aa")     # {aa}  — R1∩C2 and R3∩C2
+L_emp_pda = load_compiled_pda("empty")  # ∅     — R2∩C1, R2∩C3, R3∩C1, R3∩C3
+
+# Aho–Corasick automata for finite languages, keyed by their word list
+_WORD_MATCHERS: dict[tuple, AhoCorasick] = {}
+
+_LANGUAGES_JSON = os.path.join(os.path.dirname(__file__), "..", "gui", "languages.json")
+
+# (regular key, CFL key) → SuperPDA key, from languages.json
+_INTERSECTIONS: dict[tuple[str, str], str] = {}
+_INTERSECTIONS_VIEW = MappingProxyType(_INTERSECTIONS)
+
+_MODES = ("auto", "empty", "words", "run_length", "per_start", "gss", "chart", "brute_force")
+
+
+def match_language(pda, input_str: str, mode: str = "auto") -> str:
+    """
+    Find the LONGEST substring accepted by a CompiledPDA.
+    mode="auto"        — let the planner (planner.py) pick the cheapest engine
+                         for this PDA and input length (default)
+    mode="empty"       — "" without a search; only for an empty language
+    mode="words"       — one Aho–Corasick pass; only for a finite language
+    mode="run_length"  — the linear run-length scan; only for the registry
+                         languages an_bn, a_bn_a and bn
+    mode="per_start"   — one simulation per start position
+    mode="gss"         — one pass for all start positions (graph-structured stack)
+    mode="chart"       — one CYK chart deciding every substring at once
+    mode="brute_force" — one acceptance check per candidate substring
+    """
+    return span_text(input_str, match_language_span(pda, input_str, mode))
+
+
+def match_language_span(pda, input_str: str, mode: str = "auto") -> tuple[int, int] | None:
+    """match_language() as a (start, end) span, or None."""
+    if mode == "auto":
+        mode = plan_match(pda, len(input_str)).engine
+    elif mode in ("empty", "words", "run_length") and mode not in applicable_engines(pda):
+        raise ValueError(f"Match mode '{mode}' does not apply to this PDA")
+    if mode == "empty":
+        return None
+    if mode == "words":
+        return _word_matcher(pda.language.words).longest_match_span(input_str)
+    if mode == "run_length":
+        return LONGEST_SPANS[run_length_language(pda)](input_str)
+    if mode == "per_start":
+        return longest_matching_span_per_start(input_str, pda)
+    if mode == "gss":
+        return longest_match_span(pda, input_str)
+    if mode == "chart":
+        return longest_matching_span_chart(input_str, pda)
+    if mode == "brute_force":
+        # Candidates are zero-copy slices of one encoded buffer; spans whose
+        # letter counts no accepted word has never reach the PDA.
+        symbols = pda.encode_view(input_str)
+        return longest_matching_span(symbols, pda.parikh.prefilter(symbols).guard(pda.accepts_span))
+    raise ValueError(f"Unknown match mode '{mode}'. Available: {list(_MODES)}")
+
+
+def intersection_languages() -> MappingProxyType:
+    """
+    The intersection_matrix of languages.json, keyed (regular key, CFL key)
+    like the GUI selections; a read-only view of the process-wide table.
+    """
+    if not _INTERSECTIONS:
+        with open(_LANGUAGES_JSON, "r", encoding="utf-8") as f:
+            matrix = json.load(f)["intersection_matrix"]
+        _INTERSECTIONS.update(
+            ((regular, cfl), language)
+            for regular, row in matrix.items() if not regular.startswith("_")
+            for cfl, language in row.items()
+        )
+    return _INTERSECTIONS_VIEW
+
+
+def match_all_intersections(input_str: str) -> dict[tuple[str, str], str]:
+    """
+    Longest match for every (regular, CFL) pair, e.g.
+    {("a_star_b_star", "an_bn"): "aabb", ...}.
+
+    The input is tokenised into runs once (run_length.py) and every
+    run-shaped language is answered from that single pass; pairs sharing a
+    language share its answer. Any other language goes through
+    match_language(), which answers ∅ without a search.
+    """
+    return {pair: span_text(input_str, span) for pair, span in match_all_intersection_spans(input_str).items()}
+
+
+def match_all_intersection_spans(input_str: str) -> dict[tuple[str, str], tuple[int, int] | None]:
+    """match_all_intersections() with (start, end) spans instead of substrings."""
+    spans = longest_spans_by_language(input_str)
+    results = {}
+    for pair, language in intersection_languages().items():
+        if language not in spans:
+            spans[language] = match_language_span(load_compiled_pda(language), input_str)
+        results[pair] = spans[language]
+    return results
+
+
+@MATCH_CACHE.memoize
+def intersection_span(regular: str, cfl: str, input_str: str) -> tuple[int, int] | None:
+    """
+    Span of the longest match of one (regular key, CFL key) pair, e.g.
+    intersection_span("a_star_b_star", "an_bn", text). A pair missing from
+    the intersection_matrix is matched on its DFA × PDA product.
+    """
+    language = intersection_languages().get((regular, cfl))
+    pda = load_compiled_pda(language) if language is not None else load_compiled_product(regular, cfl)
+    return match_language_span(pda, input_str)
+
+
+def _word_matcher(words: tuple) -> AhoCorasick:
+    matcher = _WORD_MATCHERS.get(words)
+    if matcher is None:
+        matcher = _WORD_MATCHERS[words] = AhoCorasick(words)
+    return matcher
+
+
+@MATCH_CACHE.memoize
 def intersect_r1_c1(input_str: str) -> str:
     """R1 (a*b*) ∩ C1 (aⁿbⁿ) = aⁿbⁿ"""
     return an_bn(input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r2_c1(input_str: str) -> str:
     """R2 (ab*a) ∩ C1 (aⁿbⁿ) = ∅  — R2 ends in 'a', C1 ends in 'b'"""
     return match_language(L_emp_pda, input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r3_c1(input_str: str) -> str:
     """R3 (a*) ∩ C1 (aⁿbⁿ) = ∅  — R3 has no b's, C1 requires b's"""
     return match_language(L_emp_pda, input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r1_c2(input_str: str) -> str:
     """R1 (a*b*) ∩ C2 (ab^na) = {aa}  — R1 can only end in 'a' with no b's, so only 'aa'"""
     return match_language(L_aa_pda, input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r2_c2(input_str: str) -> str:
     """R2 (ab*a) ∩ C2 (ab^na) = ab^na"""
     return a_bn_a(input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r3_c2(input_str: str) -> str:
     """R3 (a*) ∩ C2 (ab^na) = {aa}  — R3 has no b's, so only 'aa' satisfies C2"""
     return match_language(L_aa_pda, input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r1_c3(input_str: str) -> str:
     """R1 (a*b*) ∩ C3 (bⁿ) = bⁿ"""
     return bn(input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r2_c3(input_str: str) -> str:
     """R2 (ab*a) ∩ C3 (bⁿ) = ∅  — R2 ends in 'a', C3 has only b's"""
     return match_language(L_emp_pda, input_str)
 
 
+@MATCH_CACHE.memoize
 def intersect_r3_c3(input_str: str) -> str:
     """R3 (a*) ∩ C3 (bⁿ) = ∅  — R3 has only a's, C3 has only b's"""
     return match_language(L_emp_pda, input_str)
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Parallel matcher — one longest-match search spread over several processes.
+
+longest_match_parallel() splits a large input into one shard per worker.
+The text is copied once into a SharedMemory block, so workers attach to it
+by name and the strings are never pickled. Each worker summarises its shard
+with summarise_chunk() (streaming.py): the best match inside the shard plus
+the few runs at its two ends. The parent merges the summaries in order
+through a StreamScanner. That stitching step glues the runs a shard boundary
+cut in two and anchors them with their full lengths, so a match spanning
+any number of boundaries is found exactly as in a one-process scan.
+
+Inputs below MIN_SHARD characters per worker, or workers=1, are searched
+in-process: starting a pool costs more than the scan. Otherwise one process
+is started per shard, never more: an input of three MIN_SHARDs uses three
+processes however many workers are allowed.
+
+Usage
+-----
+longest_match_parallel(text, ("a_star_b_star", "an_bn"), workers=4)   # (start, end) or None
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from comp382_assignment_2.matchers.intersection_matchers import intersection_languages, intersection_span
+from comp382_assignment_2.matchers.run_length import RUN_ANCHORS
+from comp382_assignment_2.matchers.streaming import ChunkSummary, StreamScanner, summarise_chunk
+
+MIN_SHARD = 1 << 20
+
+
+def longest_match_parallel(text: str, key: tuple[str, str], workers: int | None = None) -> tuple[int, int] | None:
+    """
+    Span of the leftmost-longest match of the (regular key, CFL key) pair
+    `key` in text, the same as intersection_span(*key, text), computed by
+    `workers` processes (default: os.cpu_count()).
+    """
+    language = intersection_languages().get(tuple(key))
+    if language is None:
+        raise ValueError(f"Unknown intersection {key!r}. Available: {sorted(intersection_languages())}")
+    if language not in RUN_ANCHORS:
+        raise ValueError(f"Language '{language}' of {key!r} is not run-shaped and cannot be sharded")
+
+    workers = max(workers or os.cpu_count() or 1, 1)
+    shards = min(workers, len(text) // MIN_SHARD)
+    if shards <= 1:
+        return intersection_span(*key, text)
+
+    # One byte per character, so byte offsets are str offsets; anything
+    # but a and b only separates matches.
+    data = text.encode("latin-1", "replace")
+    shared = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shared.buf[:len(data)] = data
+        del data
+        bounds = [len(text) * i // shards for i in range(shards + 1)]
+        scanner = StreamScanner((language,))
+        with ProcessPoolExecutor(max_workers=shards) as pool:
+            for summary in pool.map(
+                _summarise_shard,
+                [shared.name] * shards, bounds[:-1], bounds[1:], [language] * shards,
+            ):
+                scanner.merge(summary)
+        return scanner.spans()[language]
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def _summarise_shard(name: str, start: int, end: int, language: str) -> ChunkSummary:
+    """Worker: summarise input[start:end] straight from the shared block."""
+    shared = shared_memory.SharedMemory(name=name, track=False)
+    try:
+        return summarise_chunk(bytes(shared.buf[start:end]), start, (language,))
+    finally:
+        shared.close()
\ No newline at end of file
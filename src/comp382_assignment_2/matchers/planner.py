@@ -0,0 +1,210 @@
+"""
+Engine planner — pick the cheapest matching engine for each call.
+
+match_language_span(mode="auto") asks plan_match() which engine to run:
+
+  empty       — the language is ∅ (pda.language): no search at all
+  words       — a finite language: one Aho–Corasick pass over its words
+  run_length  — a registry language with a run-length scan (run_length.py)
+  per_start   — one PDA simulation per start position
+  gss         — one pass for all starts (graph-structured stack)
+  chart       — one CYK chart of the PDA's grammar for every substring
+  brute_force — one acceptance check per Parikh-filtered candidate
+
+Each engine's cost is modelled as coefficient · n^exponent seconds for an
+input of n symbols, per runner kind (pda.engine: "deterministic",
+"finite-state", "counter", "saturation" or "general"; "*" when the runner
+does not matter). The coefficients are fitted from a benchmark run
+(benchmarks.py --calibrate) and stored in planner_costs.json next to this
+module, or in $COMP382_COST_MODEL when set. A missing or unreadable file
+falls back to rough built-in estimates. Exponents below an engine's
+MIN_EXPONENTS entry are raised to it, fitted or not: per_start, chart and
+brute_force look at Θ(n²) (start, end) pairs, and no timing on short
+inputs can make them scale better than that.
+
+Usage
+-----
+from comp382_assignment_2.matchers.planner import explain
+
+print(explain(load_compiled_pda("an_bn"), text))   # chosen engine and cost
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass
+
+from comp382_assignment_2.matchers.run_length import LONGEST_SPANS
+from comp382_assignment_2.pda.pda_loader import compiled_pda_key
+
+ENGINES = ("empty", "words", "run_length", "per_start", "gss", "chart", "brute_force")
+
+COST_MODEL_ENV = "COMP382_COST_MODEL"
+
+_ANY = "*"
+_FORMAT = 1
+_COST_MODEL_JSON = os.path.join(os.path.dirname(__file__), "planner_costs.json")
+
+# Used for engines the cost file does not cover: right order of growth,
+# rough constants.
+_DEFAULT_COSTS: dict[str, dict[str, list[float]]] = {
+    "empty": {_ANY: [1e-7, 0.0]},
+    "words": {_ANY: [1e-7, 1.0]},
+    "run_length": {_ANY: [5e-8, 1.0]},
+    "per_start": {_ANY: [1e-6, 2.0]},
+    "gss": {_ANY: [1e-5, 1.5]},
+    "chart": {_ANY: [1e-6, 2.0]},
+    "brute_force": {_ANY: [1e-6, 3.0]},
+}
+
+# Lowest credible exponent per engine; 1 for the rest. Only "empty"
+# answers without reading the input.
+MIN_EXPONENTS = {"empty": 0.0, "per_start": 2.0, "chart": 2.0, "brute_force": 2.0}
+
+_COST_MODEL: dict[str, dict[str, list[float]]] = {}
+
+
+@dataclass(frozen=True)
+class Plan:
+    """
+    The engine chosen for one call, its estimated cost in seconds, the PDA
+    properties that decided it, and every applicable engine, cheapest first.
+    """
+
+    engine: str
+    estimated_seconds: float
+    length: int
+    properties: tuple[str, ...]
+    alternatives: tuple[tuple[str, float], ...]
+
+    def __str__(self) -> str:
+        options = ", ".join(f"{engine} {_format_seconds(cost)}" for engine, cost in self.alternatives)
+        return (
+            f"engine    {self.engine}\n"
+            f"estimate  {_format_seconds(self.estimated_seconds)} for {self.length} symbols\n"
+            f"pda       {', '.join(self.properties)}\n"
+            f"options   {options}"
+        )
+
+
+def plan_match(pda, length: int) -> Plan:
+    """The cheapest applicable engine for an input of `length` symbols."""
+    runner = pda.engine
+    costs = cost_model()
+    estimates = sorted(
+        ((engine, _estimate(costs[engine], runner, length)) for engine in applicable_engines(pda)),
+        key=lambda option: option[1],
+    )
+    engine, cost = estimates[0]
+    return Plan(engine, cost, length, _properties(pda), tuple(estimates))
+
+
+def explain(pda, input_str: str) -> Plan:
+    """plan_match() for this input; print the result for a readable report."""
+    return plan_match(pda, len(input_str))
+
+
+def applicable_engines(pda) -> tuple[str, ...]:
+    """Every engine that can answer for this PDA, in ENGINES order."""
+    language = pda.language
+    engines = []
+    if language.empty:
+        engines.append("empty")
+    if language.words is not None:
+        engines.append("words")
+    if run_length_language(pda) is not None:
+        engines.append("run_length")
+    return tuple(engines) + ("per_start", "gss", "chart", "brute_force")
+
+
+def run_length_language(pda) -> str | None:
+    """The registry key whose run-length scan answers for this PDA, if any."""
+    key = compiled_pda_key(pda)
+    return key if key in LONGEST_SPANS else None
+
+
+# ── Cost model ────────────────────────────────────────────────────────────────
+
+def cost_model_path() -> str:
+    """$COMP382_COST_MODEL, else planner_costs.json beside this module."""
+    return os.environ.get(COST_MODEL_ENV) or _COST_MODEL_JSON
+
+
+def cost_model() -> dict[str, dict[str, list[float]]]:
+    """engine → runner kind → [coefficient, exponent], read once per process."""
+    if not _COST_MODEL:
+        _COST_MODEL.update(_DEFAULT_COSTS)
+        try:
+            with open(cost_model_path(), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("format") == _FORMAT:
+                _COST_MODEL.update(
+                    (engine, {runner: [coefficient, max(exponent, min_exponent(engine))]
+                              for runner, (coefficient, exponent) in stored["costs"][engine].items()})
+                    for engine in ENGINES if engine in stored["costs"]
+                )
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            pass
+    return _COST_MODEL
+
+
+def min_exponent(engine: str) -> float:
+    """The exponent floor for an engine's fitted cost."""
+    return MIN_EXPONENTS.get(engine, 1.0)
+
+
+def save_cost_model(costs: dict[str, dict[str, list[float]]], path: str | None = None) -> None:
+    """Write a calibrated model and use it from now on."""
+    with open(path or cost_model_path(), "w", encoding="utf-8") as f:
+        json.dump({"format": _FORMAT, "costs": costs}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    clear_cost_model()
+
+
+def clear_cost_model() -> None:
+    _COST_MODEL.clear()
+
+
+def fit_cost(lengths: list[int], seconds: list[float], floor: float = 1.0) -> list[float]:
+    """
+    Least-squares fit of seconds ≈ coefficient · length^exponent on a
+    log-log scale; the exponent is clamped to [floor, 3]. A fit below an
+    engine's true order of growth is timing noise and would make it look
+    cheap on long inputs: pass min_exponent(engine) as the floor.
+    """
+    xs = [math.log(length) for length in lengths]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+    exponent = min(max(slope, floor), 3.0)
+    coefficient = sum(t / length ** exponent for length, t in zip(lengths, seconds)) / len(lengths)
+    return [float(f"{coefficient:.4g}"), round(exponent, 3)]
+
+
+def _estimate(costs: dict[str, list[float]], runner: str, length: int) -> float:
+    coefficient, exponent = costs.get(runner) or costs.get(_ANY) or costs.get("general") or next(iter(costs.values()))
+    return coefficient * max(length, 1) ** exponent
+
+
+def _properties(pda) -> tuple[str, ...]:
+    language = pda.language
+    if language.empty:
+        size = "empty language"
+    elif language.finite:
+        size = f"finite language ({len(language.words)} word{'s' * (len(language.words) != 1)})" if language.words is not None else "finite language"
+    else:
+        size = "infinite language"
+    properties = [f"{pda.engine} runner", "deterministic" if pda.deterministic else "nondeterministic", size]
+    key = run_length_language(pda)
+    if key is not None:
+        properties.append(f"run-length scan for {key}")
+    return tuple(properties)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Result cache — bounded LRU memoisation for the intersection matchers.
+
+Callers of the intersection matchers often ask for the same pairs of the
+same text again and again, e.g. when toggling between two intersections
+over one document. MATCH_CACHE remembers recent answers,
+keyed by
+
+    (matcher key, input)
+
+A lookup hashes the input once (str caches its own hash) and compares it
+only on a hash match, where equality checks identity first, so repeated
+calls with the same str object never rescan it. The matcher key is the
+wrapped function's name plus its leading arguments, e.g.
+("intersection_span", "a_star_b_star", "an_bn").
+
+Entries hold their input, so the cache has two limits: `maxsize` entries
+and `max_chars` characters of input across all entries. The least
+recently used entries are evicted until both hold, and an input longer
+than max_chars is answered without being stored. maxsize 0 turns caching
+off. The defaults are 256 entries and 2**20 characters, or
+$COMP382_MATCH_CACHE_SIZE and $COMP382_MATCH_CACHE_CHARS when set. Every
+lookup counts a hit or a miss.
+
+Usage
+-----
+from comp382_assignment_2.matchers.result_cache import MATCH_CACHE
+
+MATCH_CACHE.stats()        # CacheStats(hits=…, misses=…, evictions=…, …)
+MATCH_CACHE.resize(1024, max_chars=1 << 24)   # configurable at run time
+MATCH_CACHE.clear()
+"""
+
+import functools
+import inspect
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+
+CACHE_SIZE_ENV = "COMP382_MATCH_CACHE_SIZE"
+CACHE_CHARS_ENV = "COMP382_MATCH_CACHE_CHARS"
+
+_DEFAULT_SIZE = 256
+_DEFAULT_CHARS = 1 << 20
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    chars: int
+    max_chars: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """An LRU map from (matcher key, input) to a matcher's result."""
+
+    def __init__(self, maxsize: int = _DEFAULT_SIZE, max_chars: int = _DEFAULT_CHARS):
+        self.maxsize = max(maxsize, 0)
+        self.max_chars = max(max_chars, 0)
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key, input_str: str, compute):
+        """The cached result for (key, input_str), else compute() — stored for next time."""
+        if not self.maxsize or len(input_str) > self.max_chars:
+            self.misses += 1
+            return compute()
+
+        entry = (key, input_str)
+        entries = self._entries
+        if entry in entries:
+            entries.move_to_end(entry)
+            self.hits += 1
+            return entries[entry]
+
+        self.misses += 1
+        result = entries[entry] = compute()
+        self.chars += len(input_str)
+        self._evict()
+        return result
+
+    def memoize(self, func):
+        """
+        Decorator for matchers with the signature func(*key_args, input_str);
+        arguments may be passed by keyword too. Results must be immutable,
+        since every caller shares them.
+        """
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def cached(*args, **kwargs):
+            if kwargs:
+                args = signature.bind(*args, **kwargs).args
+            return self.lookup((func.__name__,) + args[:-1], args[-1], lambda: func(*args))
+
+        return cached
+
+    def resize(self, maxsize: int, max_chars: int | None = None) -> None:
+        """Change the limits (max_chars stays if omitted), evicting the oldest entries if they shrink."""
+        self.maxsize = max(maxsize, 0)
+        if max_chars is not None:
+            self.max_chars = max(max_chars, 0)
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.chars = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize, self.chars, self.max_chars)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both limits hold."""
+        entries = self._entries
+        while len(entries) > self.maxsize or self.chars > self.max_chars:
+            (_, input_str), _ = entries.popitem(last=False)
+            self.chars -= len(input_str)
+            self.evictions += 1
+
+
+def _configured(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Shared by every caller of intersection_matchers, including the GUI
+# controller on dropdown changes and resets.
+MATCH_CACHE = ResultCache(_configured(CACHE_SIZE_ENV, _DEFAULT_SIZE), _configured(CACHE_CHARS_ENV, _DEFAULT_CHARS))
\ No newline at end of file
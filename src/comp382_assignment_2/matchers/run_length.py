@@ -0,0 +1,279 @@
+"""
+Run-length engine — linear-time longest-substring search for the base CFLs.
+
+Every base CFL is a short sequence of maximal letter runs:
+
+  a^n b^n  — the tail of an a-run followed by the head of the next b-run,
+             so an a-run of p followed by a b-run of q gives 2·min(p, q)
+  a b^n a  — a whole b-run (possibly empty) fenced by single a's
+  b^n      — any stretch of a single b-run
+
+so the longest match can be read straight off run boundaries instead of
+trying every candidate substring. The scans below stay on C-level str / re
+primitives: sparse inputs (few, long runs) take one pass over the run
+boundaries, dense inputs gallop over the match length k instead, costing
+O(log k) C-level passes.
+
+All functions return the (start, end) span of the LEFTMOST-LONGEST match,
+or None when nothing matches; longest_spans_by_language() answers every
+run-shaped language from one shared tokenisation.
+"""
+
+import re
+
+# Fewer than one a/b boundary per this many characters counts as "sparse":
+# iterating boundaries is then cheaper than probing candidate lengths.
+_SPARSE_RATIO = 64
+# Inputs longer than four times the sampled width are judged from samples.
+_SAMPLES = 64
+_SAMPLE_WIDTH = 1024
+# Inputs this short take the run walk whatever their density.
+_SHORT = 64
+
+_AN_BN_PAIR = re.compile(r"(?<!a)(a++)(b++)")
+_B_RUN = re.compile(r"b++")
+_RUN = re.compile(r"a++|b++|[^ab]++")
+
+
+def _gallop(holds, limit: int) -> int:
+    """
+    Largest k in [0, limit] with holds(k), for a predicate that is monotone
+    (holds(k) ⇒ holds(k - 1)). Gallops up, then bisects, so only O(log k)
+    probes run — each probe is one C-level scan of the input.
+    """
+    low, probe = 0, 1
+    while probe <= limit and holds(probe):
+        low, probe = probe, probe * 2
+    high = min(limit, probe - 1)
+
+    while low < high:
+        mid = (low + high + 1) // 2
+        if holds(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _is_sparse(input_str: str) -> bool:
+    # Counting every boundary of a long dense input costs more than the
+    # scans it chooses between, and either choice is exact, so long inputs
+    # are judged from evenly spaced samples.
+    if len(input_str) > _SAMPLES * _SAMPLE_WIDTH * 4:
+        step = len(input_str) // _SAMPLES
+        sample = "|".join(input_str[i:i + _SAMPLE_WIDTH] for i in range(0, len(input_str), step))
+        # The samples are small enough to count the runs the walk would
+        # visit, other characters included: text with scattered a's and
+        # b's (a log file) has few a/b boundaries but a run every few bytes.
+        return len(_RUN.findall(sample)) * _SPARSE_RATIO <= len(sample)
+    boundaries = input_str.count("ab") + input_str.count("ba")
+    return boundaries * _SPARSE_RATIO <= len(input_str)
+
+
+def longest_an_bn_span(input_str: str) -> tuple[int, int] | None:
+    """C1: a^n b^n, n>=1 — span of the leftmost-longest match."""
+    return _an_bn_span(input_str, _is_sparse(input_str))
+
+
+def _an_bn_span(input_str: str, sparse: bool) -> tuple[int, int] | None:
+    if "ab" not in input_str:
+        return None
+
+    if sparse:
+        best, start = 0, 0
+        for pair in _AN_BN_PAIR.finditer(input_str):
+            boundary = pair.end(1)
+            n = min(boundary - pair.start(1), pair.end(2) - boundary)
+            if n > best:
+                best, start = n, boundary - n
+        return start, start + 2 * best
+
+    n = _gallop(lambda k: "a" * k + "b" * k in input_str, len(input_str) // 2)
+    start = input_str.find("a" * n + "b" * n)
+    return start, start + 2 * n
+
+
+def _longest_b_run(input_str: str, sparse: bool) -> int:
+    if "b" not in input_str:
+        return 0
+    if sparse:
+        return max(map(len, _B_RUN.findall(input_str)))
+    return _gallop(lambda k: "b" * k in input_str, len(input_str))
+
+
+def longest_a_bn_a_span(input_str: str) -> tuple[int, int] | None:
+    """C2: a b^n a, n>=0 — span of the leftmost-longest match."""
+    if "a" not in input_str:
+        return None
+    return _a_bn_a_span(input_str, _longest_b_run(input_str, _is_sparse(input_str)))
+
+
+def _a_bn_a_span(input_str: str, n: int) -> tuple[int, int] | None:
+    # The longest b-run (n) is usually fenced by a's; if not, gallop on the
+    # (monotone) "some fenced b-run has at least k b's" instead.
+    if "a" + "b" * n + "a" not in input_str:
+        n = _gallop(lambda k: re.search(f"ab{{{k},}}+a", input_str) is not None, n - 1)
+
+    needle = "a" + "b" * n + "a"
+    start = input_str.find(needle)
+    if start < 0:
+        return None
+    return start, start + len(needle)
+
+
+def longest_bn_span(input_str: str) -> tuple[int, int] | None:
+    """C3: b^n, n>=1 — span of the leftmost-longest match."""
+    return _bn_span(input_str, _longest_b_run(input_str, _is_sparse(input_str)))
+
+
+def _bn_span(input_str: str, n: int) -> tuple[int, int] | None:
+    if not n:
+        return None
+
+    start = input_str.find("b" * n)
+    return start, start + n
+
+
+# The languages longest_spans_by_language() answers, in the order of
+# longest_run_spans()
+RUN_SHAPED = ("an_bn", "a_bn_a", "bn", "aa")
+
+
+def longest_spans_by_language(input_str: str) -> dict[str, tuple[int, int] | None]:
+    """
+    Leftmost-longest spans for every run-shaped SuperPDA language at once,
+    keyed like the registry: "an_bn", "a_bn_a", "bn" and "aa" ({aa}).
+    """
+    return dict(zip(RUN_SHAPED, longest_run_spans(input_str)))
+
+
+def longest_run_spans(input_str: str) -> tuple:
+    """
+    longest_spans_by_language() as a tuple in RUN_SHAPED order, for callers
+    that answer many short inputs.
+
+    Short and sparse inputs are split into maximal runs once and a single
+    walk over the runs answers all four languages. Long dense inputs have too many runs
+    for a Python-level walk, so they keep the galloping C-level scans, but
+    share the density check and the longest b-run between languages.
+    """
+    if len(input_str) > _SHORT and not _is_sparse(input_str):
+        b_run = _longest_b_run(input_str, False)
+        aa = input_str.find("aa")
+        return (
+            _an_bn_span(input_str, False),
+            _a_bn_a_span(input_str, b_run) if "a" in input_str else None,
+            _bn_span(input_str, b_run),
+            (aa, aa + 2) if aa >= 0 else None,
+        )
+    return _spans_from_runs(input_str)
+
+
+def _spans_from_runs(input_str: str) -> tuple:
+    """
+    One walk over the maximal runs, looking back at most two runs.
+    Candidates appear in order of their start, so only strictly longer
+    ones replace the best so far (ties stay leftmost). Locals only, and no
+    tuple packing or min() in the loop: this is also the path for every
+    short input.
+    """
+    an_bn_len = an_bn_start = a_bn_a_len = a_bn_a_start = bn_len = bn_start = 0
+    aa = -1
+    # char and length of the previous run; char of the one before
+    prev_char = before_char = ""
+    prev_n = 0
+
+    start = 0
+    for run in _RUN.findall(input_str):
+        char = run[0]
+        n = len(run)
+        if char == "b":
+            if n > bn_len:
+                bn_len = n
+                bn_start = start
+            if prev_char == "a":
+                m = prev_n if prev_n < n else n
+                if m + m > an_bn_len:
+                    an_bn_len = m + m
+                    an_bn_start = start - m
+        elif char == "a":
+            if prev_char == "b" and before_char == "a" and prev_n + 2 > a_bn_a_len:
+                a_bn_a_len = prev_n + 2
+                a_bn_a_start = start - prev_n - 1
+            if n > 1:
+                if a_bn_a_len < 2:
+                    a_bn_a_len = 2
+                    a_bn_a_start = start
+                if aa < 0:
+                    aa = start
+        before_char = prev_char
+        prev_char = char
+        prev_n = n
+        start += n
+
+    return (
+        (an_bn_start, an_bn_start + an_bn_len) if an_bn_len else None,
+        (a_bn_a_start, a_bn_a_start + a_bn_a_len) if a_bn_a_len else None,
+        (bn_start, bn_start + bn_len) if bn_len else None,
+        (aa, aa + 2) if aa >= 0 else None,
+    )
+
+
+# Registry language key → its single-language scan
+LONGEST_SPANS = {
+    "an_bn": longest_an_bn_span,
+    "a_bn_a": longest_a_bn_a_span,
+    "bn": longest_bn_span,
+}
+
+
+# ── Anchors ──────────────────────────────────────────────────────────────────
+# Each match of a run-shaped language is "anchored" at one maximal run and
+# depends only on that run and its two neighbours, given as (char, length)
+# or None past either end of the text. anchor(previous, run, next) returns
+# (match length, offset of the match from the run start); (0, 0) for none.
+
+def _an_bn_anchor(previous, run, following):
+    if run[0] == "a" and following is not None and following[0] == "b":
+        m = min(run[1], following[1])
+        return 2 * m, run[1] - m
+    return 0, 0
+
+
+def _a_bn_a_anchor(previous, run, following):
+    if run[0] == "b":
+        if previous is not None and following is not None and previous[0] == following[0] == "a":
+            return run[1] + 2, -1
+    elif run[0] == "a" and run[1] >= 2:
+        return 2, 0
+    return 0, 0
+
+
+def _bn_anchor(previous, run, following):
+    return (run[1], 0) if run[0] == "b" else (0, 0)
+
+
+def _aa_anchor(previous, run, following):
+    return (2, 0) if run[0] == "a" and run[1] >= 2 else (0, 0)
+
+
+def _no_anchor(previous, run, following):
+    return 0, 0
+
+
+# Registry language key → its anchor
+RUN_ANCHORS = {
+    "an_bn": _an_bn_anchor,
+    "a_bn_a": _a_bn_a_anchor,
+    "bn": _bn_anchor,
+    "aa": _aa_anchor,
+    "empty": _no_anchor,
+}
+
+
+def span_text(input_str: str, span: tuple[int, int] | None) -> str:
+    """Materialize a span returned by the engine ("" for no match)."""
+    if span is None:
+        return ""
+    start, end = span
+    return input_str[start:end]
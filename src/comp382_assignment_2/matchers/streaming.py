@@ -0,0 +1,280 @@
+"""
+Streaming matcher — longest intersection matches in files of any size.
+
+The matcher API takes an in-memory str, so a multi-gigabyte log would have
+to be read and decoded whole first. scan_file() memory-maps the file and
+feeds it to a StreamScanner in fixed-size chunks of bytes instead, holding
+one chunk at a time whatever the file size.
+
+Every intersection language is run-shaped (run_length.py) and each match
+is anchored at one run (RUN_ANCHORS), so a chunk is handled in two parts:
+
+  inside  — longest_spans_by_language() on the chunk, with the C-level
+            scans; every span it reports is a real match of the file
+  edges   — the first and last three runs of the chunk, which may be cut
+            by a chunk boundary or need a neighbour from the next chunk,
+            go through a three-run window that glues runs back together
+            across boundaries and anchors them with their full lengths
+
+Between chunks only the window and the best match per language are kept.
+summarise_chunk() does a chunk's share of the work on its own, so chunks
+can also be summarised in other processes and merged in order
+(parallel.py).
+Bytes other than a and b separate matches like any other character, and
+spans are byte offsets into the file.
+
+Usage
+-----
+scan_file("huge.log")      # {(regular key, CFL key): (start, end) or None}
+python -m comp382_assignment_2.matchers.streaming huge.log [--json]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from dataclasses import dataclass
+from itertools import islice
+from time import perf_counter
+
+from comp382_assignment_2.matchers.intersection_matchers import intersection_languages
+from comp382_assignment_2.matchers.run_length import LONGEST_SPANS, RUN_ANCHORS, longest_spans_by_language
+
+CHUNK_SIZE = 8 << 20
+
+# Runs at each end of a chunk that the window re-anchors: the first run
+# needs its next run complete, which needs the run after that.
+_EDGE_RUNS = 3
+
+_RUN = re.compile(rb"a++|b++|[^ab]++")
+_CHARS = {ord("a"): "a", ord("b"): "b"}
+# Run char for bytes other than a and b, and for the ends of the input.
+_OTHER = "-"
+_END = ""
+
+
+@dataclass(frozen=True)
+class ChunkSummary:
+    """
+    What one chunk contributes to a scan, computable on its own: the best
+    span per language inside it, its first runs and, when it has more than
+    2·_EDGE_RUNS runs, its last runs (else None). Runs are (char, length,
+    start); offsets are in the whole input.
+    """
+
+    start: int
+    length: int
+    spans: dict
+    head: tuple
+    tail: tuple | None
+
+
+def summarise_chunk(chunk: bytes, start: int = 0, languages: tuple[str, ...] = tuple(RUN_ANCHORS)) -> ChunkSummary:
+    """The ChunkSummary of input[start:start + len(chunk)] == chunk."""
+    spans = {
+        language: (start + span[0], start + span[1]) if span is not None else None
+        for language, span in _inside_spans(chunk.decode("latin-1"), languages).items()
+    }
+    runs = [_run(chunk, start, run) for run in islice(_RUN.finditer(chunk), 2 * _EDGE_RUNS + 1)]
+    if len(runs) <= 2 * _EDGE_RUNS:
+        return ChunkSummary(start, len(chunk), spans, tuple(runs), None)
+    tail = tuple(_run(chunk, start, run) for run in _last_runs(chunk, _EDGE_RUNS))
+    return ChunkSummary(start, len(chunk), spans, tuple(runs[:_EDGE_RUNS]), tail)
+
+
+class StreamScanner:
+    """Leftmost-longest span of run-shaped languages over a stream of byte chunks."""
+
+    def __init__(self, languages: tuple[str, ...] = tuple(RUN_ANCHORS)):
+        unknown = [language for language in languages if language not in RUN_ANCHORS]
+        if unknown:
+            raise ValueError(f"Languages {unknown} are not run-shaped. Available: {list(RUN_ANCHORS)}")
+        self.languages = tuple(languages)
+        self.position = 0
+        self._anchors = [(language, RUN_ANCHORS[language]) for language in self.languages]
+        # language → (match length, start)
+        self._best = {language: (0, 0) for language in self.languages}
+        # The last runs seen, as [char, length, start]; indexable like the
+        # (char, length) runs RUN_ANCHORS takes.
+        self._window: list[list] = [[_END, 0, 0]]
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the input."""
+        if chunk:
+            self.merge(summarise_chunk(chunk, self.position, self.languages))
+
+    def merge(self, summary: ChunkSummary) -> None:
+        """
+        Add the next chunk from its summary, which may have been computed
+        elsewhere (another process); summaries must arrive in input order.
+        """
+        if summary.start != self.position:
+            raise ValueError(f"Expected the chunk at offset {self.position}, got {summary.start}")
+        for language, span in summary.spans.items():
+            if span is not None and language in self._best:
+                _offer(self._best, language, span[1] - span[0], span[0])
+        self._push_runs(summary.head)
+        if summary.tail is not None:
+            # The runs in between were anchored inside the chunk.
+            self._window = []
+            self._push_runs(summary.tail)
+        self.position += summary.length
+
+    def spans(self) -> dict[str, tuple[int, int] | None]:
+        """language → (start, end) of its leftmost-longest match so far, or None."""
+        best = dict(self._best)
+        window = self._window + [[_END, 0, self.position]]
+        for previous, run, following in zip(window, window[1:], window[2:]):
+            _settle(best, self._anchors, previous, run, following)
+        return {language: (start, start + length) if length else None for language, (length, start) in best.items()}
+
+    def _push_runs(self, runs: tuple) -> None:
+        window = self._window
+        for char, length, start in runs:
+            if window and window[-1][0] == char:
+                # The run went on past the previous chunk boundary.
+                window[-1][1] += length
+                continue
+            window.append([char, length, start])
+            if len(window) > 3:
+                # window[-2] is complete now, so window[1] has both its neighbours.
+                _settle(self._best, self._anchors, *window[:3])
+                del window[0]
+
+
+def _inside_spans(text: str, languages: tuple[str, ...]) -> dict[str, tuple[int, int] | None]:
+    if len(languages) != 1:
+        return longest_spans_by_language(text)
+    language = languages[0]
+    if language in LONGEST_SPANS:
+        return {language: LONGEST_SPANS[language](text)}
+    if language == "aa":
+        start = text.find("aa")
+        return {language: (start, start + 2) if start >= 0 else None}
+    return {}
+
+
+def _run(chunk: bytes, base: int, run: re.Match) -> tuple[str, int, int]:
+    start, end = run.span()
+    return _CHARS.get(chunk[start], _OTHER), end - start, base + start
+
+
+def _settle(best: dict, anchors: list, previous: list, run: list, following: list) -> None:
+    for language, anchor in anchors:
+        length, offset = anchor(previous, run, following)
+        if length:
+            _offer(best, language, length, run[2] + offset)
+
+
+def _offer(best: dict, language: str, length: int, start: int) -> None:
+    best_length, best_start = best[language]
+    if length > best_length or (length == best_length and start < best_start):
+        best[language] = (length, start)
+
+
+def _last_runs(chunk: bytes, count: int) -> list[re.Match]:
+    """The last `count` runs, tokenising a growing tail window."""
+    width = 64
+    while True:
+        offset = max(len(chunk) - width, 0)
+        runs = list(_RUN.finditer(chunk, offset))
+        # The first run of a partial window may be cut short.
+        if len(runs) > count or offset == 0:
+            return runs[-count:]
+        width *= 2
+
+
+def scan_buffer(buffer, chunk_size: int = CHUNK_SIZE) -> dict[tuple[str, str], tuple[int, int] | None]:
+    """scan_file() for a bytes-like object or an open mmap."""
+    return intersection_spans(_scan(buffer, chunk_size, None))
+
+
+def scan_file(path, chunk_size: int = CHUNK_SIZE) -> dict[tuple[str, str], tuple[int, int] | None]:
+    """
+    Span of the longest match of every (regular key, CFL key) pair in the
+    file, like match_all_intersection_spans() but in byte offsets and with
+    memory bounded by chunk_size.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return scan_buffer(b"", chunk_size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return intersection_spans(_scan(mapped, chunk_size, mapped))
+
+
+def _scan(buffer, chunk_size: int, mapped: mmap.mmap | None) -> dict[str, tuple[int, int] | None]:
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    release = mapped is not None and hasattr(mmap, "MADV_DONTNEED")
+    scanner, released = StreamScanner(), 0
+    for offset in range(0, len(buffer), chunk_size):
+        scanner.feed(buffer[offset:offset + chunk_size])
+        if release:
+            # Pages already scanned are dropped from the resident set, so
+            # it stays at about one chunk however large the file is.
+            done = min(offset + chunk_size, len(buffer)) // mmap.PAGESIZE * mmap.PAGESIZE
+            if done > released:
+                mapped.madvise(mmap.MADV_DONTNEED, released, done - released)
+                released = done
+    return scanner.spans()
+
+
+def intersection_spans(spans: dict[str, tuple[int, int] | None]) -> dict[tuple[str, str], tuple[int, int] | None]:
+    """Per-language spans (StreamScanner.spans()) keyed by (regular key, CFL key) pair."""
+    results = {}
+    for pair, language in intersection_languages().items():
+        if language not in spans:
+            raise ValueError(f"Language '{language}' of {pair} is not run-shaped and cannot be streamed")
+        results[pair] = spans[language]
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="scan",
+        description="Longest match of every intersection language in large files, read through a memory map.",
+    )
+    parser.add_argument("paths", nargs="+", help="files to scan")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes per chunk (default %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per file")
+    args = parser.parse_args(argv)
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+
+    for path in args.paths:
+        started = perf_counter()
+        spans = scan_file(path, args.chunk_size)
+        seconds = perf_counter() - started
+        size = os.path.getsize(path)
+        languages = intersection_languages()
+        if args.json:
+            print(json.dumps({
+                "path": path,
+                "bytes": size,
+                "seconds": round(seconds, 6),
+                "matches": [
+                    {
+                        "regular": regular,
+                        "cfl": cfl,
+                        "language": languages[(regular, cfl)],
+                        "span": list(span) if span else None,
+                        "length": span[1] - span[0] if span else 0,
+                    }
+                    for (regular, cfl), span in spans.items()
+                ],
+            }))
+            continue
+        rate = size / seconds / 1e6 if seconds else 0.0
+        print(f"{path}: {size} bytes in {seconds:.3f} s ({rate:.1f} MB/s)")
+        for (regular, cfl), span in spans.items():
+            found = f"{span[0]}..{span[1]}  length {span[1] - span[0]}" if span else "no match"
+            print(f"  {regular:<14} ∩ {cfl:<7} ({languages[(regular, cfl)]:<6})  {found}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
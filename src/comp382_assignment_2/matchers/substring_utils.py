@@ -1,8 +1,64 @@
 """
 Utility functions for finding substrings that match language predicates.
 
+The search itself works on spans: a span acceptor is called as
+accept_span(text, start, end) and decides text[start:end] without the
+slice being made (text may be a str or an encoded memoryview, see
+CompiledPDA.encode_view), and the *_span functions return (start, end)
+pairs or None. The find_* functions keep the original string API as thin
+wrappers around them.
+
 """
 
+from comp382_assignment_2.matchers.run_length import span_text
+from comp382_assignment_2.pda.chart import SubstringChart
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+
+def longest_matching_span(text, accept_span) -> tuple[int, int] | None:
+    """
+    Span of the LONGEST text[start:end] for which accept_span(text, start, end)
+    holds; ties go to the leftmost start. None if nothing matches.
+    """
+    n = len(text)
+
+    # Try longest substrings first
+    for length in range(n, 0, -1):
+        for start in range(n - length + 1):
+            if accept_span(text, start, start + length):
+                return start, start + length
+
+    return None
+
+
+def shortest_matching_span(text, accept_span) -> tuple[int, int] | None:
+    """Span of the SHORTEST accepted text[start:end] (leftmost on ties), or None."""
+    n = len(text)
+
+    for length in range(1, n + 1):
+        for start in range(n - length + 1):
+            if accept_span(text, start, start + length):
+                return start, start + length
+
+    return None
+
+
+def all_matching_spans(text, accept_span) -> list[tuple[int, int]]:
+    """Every accepted (start, end), shortest first, then by start."""
+    n = len(text)
+    return [
+        (start, start + length)
+        for length in range(1, n + 1)
+        for start in range(n - length + 1)
+        if accept_span(text, start, start + length)
+    ]
+
+
+def _on_slices(accept_func):
+    """Adapt a string predicate to the span protocol (this one does slice)."""
+    return lambda text, start, end: accept_func(text[start:end])
+
+
 def find_longest_matching_substring(input_str: str, accept_func) -> str:
     """
     Find the LONGEST substring that satisfies accept_func.
@@ -10,21 +66,59 @@ def find_longest_matching_substring(input_str: str, accept_func) -> str:
     
     Args:
         input_str: The string to search within
-        accept_func: A function that takes a string and returns bool
+        accept_func: A function that takes a string and returns bool, or a
+                     CompiledPDA, whose answer is read off one chart
+                     (see longest_matching_span_chart)
         
     Returns:
         The longest matching substring found, or empty string if none found
     """
-    n = len(input_str)
-    
-    # Try longest substrings first
-    for length in range(n, 0, -1):
-        for start in range(n - length + 1):
-            candidate = input_str[start:start + length]
-            if accept_func(candidate):
-                return candidate
-    
-    return ""
+    if isinstance(accept_func, CompiledPDA):
+        return find_longest_matching_substring_chart(input_str, accept_func)
+    return span_text(input_str, longest_matching_span(input_str, _on_slices(accept_func)))
+
+
+def longest_matching_span_per_start(input_str: str, pda) -> tuple[int, int] | None:
+    """
+    Span of the LONGEST substring accepted by a CompiledPDA, simulating the
+    PDA once per start position instead of once per candidate substring.
+
+    Each run reports every end index with an accepting configuration, so a
+    start position costs one pass over the remaining suffix: O(n·sim) overall
+    rather than O(n²·sim). Ties go to the leftmost start, as above.
+    """
+    symbols = pda.encode(input_str)
+    n = len(symbols)
+    best_start, best_length = 0, 0
+
+    for start in range(n):
+        if n - start <= best_length:
+            break
+        for end in pda.accepting_ends(symbols, start):
+            if end - start > best_length:
+                best_start, best_length = start, end - start
+
+    return (best_start, best_start + best_length) if best_length else None
+
+
+def find_longest_matching_substring_per_start(input_str: str, pda) -> str:
+    """String form of longest_matching_span_per_start()."""
+    return span_text(input_str, longest_matching_span_per_start(input_str, pda))
+
+
+def longest_matching_span_chart(input_str: str, pda) -> tuple[int, int] | None:
+    """
+    Span of the LONGEST substring accepted by a CompiledPDA, read off one
+    CYK chart of its grammar (pda/chart.py) that decides every substring
+    at once: O(n²·|rules|) bitset steps however nondeterministic the PDA.
+    Ties go to the leftmost start, as above.
+    """
+    return SubstringChart(pda.grammar, pda.encode(input_str)).longest_span()
+
+
+def find_longest_matching_substring_chart(input_str: str, pda) -> str:
+    """String form of longest_matching_span_chart()."""
+    return span_text(input_str, longest_matching_span_chart(input_str, pda))
 
 
 def find_shortest_matching_substring(input_str: str, accept_func) -> str:
@@ -32,15 +126,7 @@ def find_shortest_matching_substring(input_str: str, accept_func) -> str:
     Find the SHORTEST substring that satisfies accept_func.
     Kept for compatibility if needed.
     """
-    n = len(input_str)
-    
-    for length in range(1, n + 1):
-        for start in range(n - length + 1):
-            candidate = input_str[start:start + length]
-            if accept_func(candidate):
-                return candidate
-    
-    return ""
+    return span_text(input_str, shortest_matching_span(input_str, _on_slices(accept_func)))
 
 
 def find_all_matching_substrings(input_str: str, accept_func) -> list:
@@ -48,13 +134,7 @@ def find_all_matching_substrings(input_str: str, accept_func) -> list:
     Find all substrings that satisfy accept_func.
     Returns list of (substring, start, end) tuples.
     """
-    n = len(input_str)
-    matches = []
-    
-    for length in range(1, n + 1):
-        for start in range(n - length + 1):
-            candidate = input_str[start:start + length]
-            if accept_func(candidate):
-                matches.append((candidate, start, start + length))
-    
-    return matches
\ No newline at end of file
+    return [
+        (input_str[start:end], start, end)
+        for start, end in all_matching_spans(input_str, _on_slices(accept_func))
+    ]
\ No newline at end of file
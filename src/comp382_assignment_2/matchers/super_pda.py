@@ -2,25 +2,19 @@
 Super PDA function - checks if the ENTIRE string matches an intersection language.
 Returns "matched" or "unmatched".
 
+Membership is decided by running the compiled SuperPDA for the pair
+(super_pda/registry.py, via the intersection_matrix in languages.json)
+on the whole string: one linear simulation that stops at the first
+character the machine cannot take.
+
 """
 
-from comp382_assignment_2.matchers.intersection_matchers import (
-    intersect_r1_c1, intersect_r2_c1, intersect_r3_c1,
-    intersect_r1_c2, intersect_r2_c2, intersect_r3_c2,
-    intersect_r1_c3, intersect_r2_c3, intersect_r3_c3
-)
-
-_INTERSECTION_MAP = {
-    ("r1", "c1"): intersect_r1_c1,  # aⁿbⁿ
-    ("r2", "c1"): intersect_r2_c1,  # ∅
-    ("r3", "c1"): intersect_r3_c1,  # ∅
-    ("r1", "c2"): intersect_r1_c2,  # {aa}
-    ("r2", "c2"): intersect_r2_c2,  # ab^na
-    ("r3", "c2"): intersect_r3_c2,  # {aa}
-    ("r1", "c3"): intersect_r1_c3,  # bⁿ
-    ("r2", "c3"): intersect_r2_c3,  # ∅
-    ("r3", "c3"): intersect_r3_c3,  # ∅
-}
+from comp382_assignment_2.matchers.intersection_matchers import intersection_languages
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+from comp382_assignment_2.pda.pda_loader import load_compiled_pda
+
+_REGULAR_KEYS = {"r1": "a_star_b_star", "r2": "a_b_star_a", "r3": "a_star"}
+_CFL_KEYS = {"c1": "an_bn", "c2": "a_bn_a", "c3": "bn"}
 
 
 def super_accept(input_str: str, regular: str = "r1", cfl: str = "c1") -> str:
@@ -35,12 +29,21 @@ def super_accept(input_str: str, regular: str = "r1", cfl: str = "c1") -> str:
 
     Default (r1, c1) = aⁿbⁿ
     """
-    if input_str == "":
+    pda = _super_pda(regular, cfl)
+    if input_str == "" or pda is None:
         return "unmatched"
+    return "matched" if pda.accepts(input_str) else "unmatched"
+
+
+def super_accept_many(strings, regular: str = "r1", cfl: str = "c1") -> list[str]:
+    """super_accept() for many strings against one pair; the SuperPDA is looked up once."""
+    pda = _super_pda(regular, cfl)
+    if pda is None:
+        return ["unmatched" for _ in strings]
+    return ["matched" if s and pda.accepts(s) else "unmatched" for s in strings]
 
-    func = _INTERSECTION_MAP.get((regular.lower(), cfl.lower()))
-    if func is None:
-        return "unmatched"
 
-    result = func(input_str)
-    return "matched" if result == input_str else "unmatched"
\ No newline at end of file
+def _super_pda(regular: str, cfl: str) -> CompiledPDA | None:
+    pair = (_REGULAR_KEYS.get(regular.lower()), _CFL_KEYS.get(cfl.lower()))
+    key = intersection_languages().get(pair)
+    return load_compiled_pda(key) if key is not None else None
\ No newline at end of file
@@ -0,0 +1,357 @@
+"""
+analysis.py — pick a specialised runner for a CompiledPDA.
+
+Most PDAs in this project barely use their stack, so the general search
+(hash-consed stacks, one frontier per position) is more machinery than
+they need. select_runner() looks at the compiled move table and returns:
+
+  FiniteStateRunner   — only finitely many (state, stack) configurations
+                        are reachable, whatever the input. They are
+                        determinised into a DFA table: one list index per
+                        character.
+  SaturationRunner    — the PDA has ε-move cycles, which may push without
+                        bound; post* saturation (saturation.py) terminates.
+  DeterministicRunner — never more than one applicable move: a single run
+                        on a mutable list stack, which stops at the first
+                        configuration with no move.
+  CounterRunner       — every reachable stack is X^k Z for one symbol X over
+                        the initial symbol Z, so the stack is just the int k.
+  None                — anything else; the general engine runs.
+
+The stack analyses are conservative: they follow every move on every input
+symbol, so a PDA is only specialised when all its runs fit the shape.
+
+Runners with `streaming = True` take any iterable of symbols in accepts()
+and stop reading at the first symbol they cannot take, so CompiledPDA
+feeds them lazily encoded text and a rejection at character k costs O(k).
+"""
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from comp382_assignment_2.pda.saturation import SaturationRunner
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+_EPSILON = 0
+_EMPTY_STACK = 0
+
+# Give up on the finite-state runner beyond this many reachable
+# configurations / DFA states; the other engines handle those PDAs.
+_MAX_CONFIGS = 256
+_MAX_DFA_STATES = 1024
+
+
+class FiniteStateRunner:
+    """DFA over ε-closed sets of (state, stack) configurations."""
+
+    engine = "finite-state"
+    streaming = True
+
+    __slots__ = ("_n_inputs", "_delta", "_accepting")
+
+    _DEAD = 0  # the empty configuration set
+
+    def __init__(self, n_inputs: int, delta: tuple, accepting: tuple):
+        self._n_inputs = n_inputs
+        self._delta = delta
+        self._accepting = accepting
+
+    def accepting_ends(self, symbols: list[int], start: int = 0) -> Iterator[int]:
+        delta, accepting, n_inputs = self._delta, self._accepting, self._n_inputs
+        dfa_state = 1
+        for idx in range(start, len(symbols)):
+            if accepting[dfa_state]:
+                yield idx
+            dfa_state = delta[dfa_state * n_inputs + symbols[idx]]
+            if dfa_state == self._DEAD:
+                return
+        if accepting[dfa_state]:
+            yield len(symbols)
+
+    def accepts(self, symbols: Iterable[int]) -> bool:
+        delta, n_inputs = self._delta, self._n_inputs
+        dfa_state = 1
+        for symbol in symbols:
+            dfa_state = delta[dfa_state * n_inputs + symbol]
+            if dfa_state == self._DEAD:
+                return False
+        return self._accepting[dfa_state]
+
+
+class CounterRunner:
+    """Simulates (state, k) pairs, k being the number of X's above Z."""
+
+    engine = "counter"
+    streaming = False
+
+    __slots__ = ("_n_inputs", "_moves", "_initial", "_final")
+
+    def __init__(self, pda: "CompiledPDA", moves: tuple):
+        self._n_inputs = pda._n_inputs
+        self._moves = moves
+        self._initial = pda.initial_state
+        self._final = pda.final
+
+    def accepting_ends(self, symbols: list[int], start: int = 0) -> Iterator[int]:
+        n = len(symbols)
+        moves, final, n_inputs = self._moves, self._final, self._n_inputs
+
+        frontier = {(self._initial, 0)}
+        idx = start
+        while True:
+            # While one configuration has exactly one (consuming) move, step
+            # it with plain ints; fall back to sets as soon as that stops.
+            if len(frontier) == 1:
+                ((state, count),) = frontier
+                while idx < n:
+                    cell = moves[(state * n_inputs + symbols[idx]) * 2 + (count > 0)]
+                    if len(cell) != 1 or not cell[0][2]:
+                        break
+                    if final[state]:
+                        yield idx
+                    state, delta, _ = cell[0]
+                    count += delta
+                    idx += 1
+                frontier = {(state, count)}
+
+            symbol = symbols[idx] if idx < n else _EPSILON
+            pending = list(frontier)
+            seen = None
+            advanced = set()
+            accepting = False
+
+            while pending:
+                state, count = pending.pop()
+                if final[state]:
+                    accepting = True
+                for target, delta, consumes in moves[(state * n_inputs + symbol) * 2 + (count > 0)]:
+                    config = (target, count + delta)
+                    if consumes:
+                        advanced.add(config)
+                        continue
+                    if seen is None:
+                        seen = set(frontier)
+                    if config not in seen:
+                        seen.add(config)
+                        pending.append(config)
+
+            if accepting:
+                yield idx
+            if not advanced:
+                return
+            frontier = advanced
+            idx += 1
+
+    def accepts(self, symbols: list[int]) -> bool:
+        return any(end == len(symbols) for end in self.accepting_ends(symbols))
+
+
+class DeterministicRunner:
+    """One run, one mutable stack: a straight-line loop with early rejection."""
+
+    engine = "deterministic"
+    streaming = True
+
+    __slots__ = ("_table", "_n_tops", "_stride", "_initial", "_initial_stack", "_final")
+
+    def __init__(self, pda: "CompiledPDA"):
+        self._table = pda._table
+        self._n_tops = pda._n_tops
+        self._stride = pda._n_inputs * pda._n_tops
+        self._initial = pda.initial_state
+        self._initial_stack = pda.initial_stack
+        self._final = pda.final
+
+    def accepting_ends(self, symbols: list[int], start: int = 0) -> Iterator[int]:
+        n = len(symbols)
+        table, n_tops, stride, final = self._table, self._n_tops, self._stride, self._final
+
+        state, stack = self._initial, [self._initial_stack]
+        for idx in range(start, n + 1):
+            symbol_base = (symbols[idx] if idx < n else _EPSILON) * n_tops
+            accepting = False
+            # ε-moves (acyclic, see is_deterministic) up to one consuming move.
+            while True:
+                if final[state]:
+                    accepting = True
+                cell = table[state * stride + symbol_base + (stack[-1] if stack else _EMPTY_STACK)]
+                if not cell:
+                    if accepting:
+                        yield idx
+                    return
+                state, push, consumes, pops = cell[0]
+                if pops:
+                    stack.pop()
+                if push:
+                    stack.extend(push)
+                if consumes:
+                    break
+            if accepting:
+                yield idx
+
+    def accepts(self, symbols: Iterable[int]) -> bool:
+        table, n_tops, stride, final = self._table, self._n_tops, self._stride, self._final
+
+        state, stack = self._initial, [self._initial_stack]
+        for symbol in symbols:
+            symbol_base = symbol * n_tops
+            while True:
+                cell = table[state * stride + symbol_base + (stack[-1] if stack else _EMPTY_STACK)]
+                if not cell:
+                    return False
+                state, push, consumes, pops = cell[0]
+                if pops:
+                    stack.pop()
+                if push:
+                    stack.extend(push)
+                if consumes:
+                    break
+
+        # Input exhausted: follow the (acyclic) ε-moves looking for a final state.
+        while not final[state]:
+            cell = table[state * stride + (stack[-1] if stack else _EMPTY_STACK)]
+            if not cell:
+                return False
+            state, push, consumes, pops = cell[0]
+            if pops:
+                stack.pop()
+            if push:
+                stack.extend(push)
+        return True
+
+
+def is_deterministic(pda: "CompiledPDA") -> bool:
+    """
+    True when no configuration ever has two applicable moves. Table cells
+    already merge ε-input and any-top moves with the exact ones, so this is
+    just "every cell holds at most one move".
+    """
+    return all(len(cell) <= 1 for cell in pda._table)
+
+
+def _epsilon_acyclic(pda: "CompiledPDA") -> bool:
+    """No chain of ε-moves can return to a state (on any stack top)."""
+    successors = {
+        state: {
+            target
+            for top in range(pda._n_tops)
+            for target, _, _, _ in pda.moves(state, _EPSILON, top)
+        }
+        for state in range(len(pda.states))
+    }
+    done, active = set(), set()
+
+    def visit(state: int) -> bool:
+        active.add(state)
+        for target in successors[state]:
+            if target in active or (target not in done and not visit(target)):
+                return False
+        active.discard(state)
+        done.add(state)
+        return True
+
+    return all(state in done or visit(state) for state in successors)
+
+
+def select_runner(pda: "CompiledPDA"):
+    """The cheapest runner that is exact for pda, or None for the general engine."""
+    runner = _finite_state_runner(pda)
+    if runner is not None:
+        return runner
+    if not _epsilon_acyclic(pda):
+        # An ε-cycle may push forever; only saturation is sure to stop.
+        return SaturationRunner(pda)
+    if pda.deterministic:
+        return DeterministicRunner(pda)
+    return _counter_runner(pda)
+
+
+def _finite_state_runner(pda: "CompiledPDA") -> FiniteStateRunner | None:
+    n_inputs = pda._n_inputs
+
+    # Every (state, stack) reachable on some input, numbered in discovery order.
+    initial = (pda.initial_state, (pda.initial_stack,))
+    ids = {initial: 0}
+    configs = [initial]
+    for state, stack in configs:
+        top = stack[-1] if stack else _EMPTY_STACK
+        for symbol in range(n_inputs):
+            for target, push, _, pops in pda.moves(state, symbol, top):
+                config = (target, (stack[:-1] if pops else stack) + push)
+                if config not in ids:
+                    if len(configs) == _MAX_CONFIGS:
+                        return None
+                    ids[config] = len(configs)
+                    configs.append(config)
+
+    def successors(config_id: int, symbol: int, consumes: bool) -> list[int]:
+        state, stack = configs[config_id]
+        top = stack[-1] if stack else _EMPTY_STACK
+        return [
+            ids[(target, (stack[:-1] if pops else stack) + push)]
+            for target, push, moves_on, pops in pda.moves(state, symbol, top)
+            if moves_on == consumes
+        ]
+
+    def closure(config_ids) -> frozenset:
+        closed, pending = set(config_ids), list(config_ids)
+        while pending:
+            for successor in successors(pending.pop(), _EPSILON, False):
+                if successor not in closed:
+                    closed.add(successor)
+                    pending.append(successor)
+        return frozenset(closed)
+
+    # Subset construction; DFA state 0 is the dead (empty) set, 1 the start.
+    subsets = [frozenset(), closure([0])]
+    subset_ids = {subset: i for i, subset in enumerate(subsets)}
+    delta = []
+    for subset in subsets:
+        for symbol in range(n_inputs):
+            if symbol == _EPSILON:
+                delta.append(0)
+                continue
+            target = closure([s for c in subset for s in successors(c, symbol, True)])
+            if target not in subset_ids:
+                if len(subsets) == _MAX_DFA_STATES:
+                    return None
+                subset_ids[target] = len(subsets)
+                subsets.append(target)
+            delta.append(subset_ids[target])
+
+    accepting = tuple(any(pda.final[configs[c][0]] for c in subset) for subset in subsets)
+    return FiniteStateRunner(n_inputs, tuple(delta), accepting)
+
+
+def _counter_runner(pda: "CompiledPDA") -> CounterRunner | None:
+    bottom = pda.initial_stack
+    pushed = {
+        symbol
+        for state in range(len(pda.states))
+        for symbol_id in range(pda._n_inputs)
+        for top in range(pda._n_tops)
+        for _, push, _, _ in pda.moves(state, symbol_id, top)
+        for symbol in push
+    } - {bottom}
+    if len(pushed) != 1:
+        return None
+    (counter,) = pushed
+
+    # moves[(state * n_inputs + symbol) * 2 + (k > 0)] → (target, Δk, consumes)
+    moves = []
+    for state in range(len(pda.states)):
+        for symbol in range(pda._n_inputs):
+            for top in (bottom, counter):
+                cell = []
+                for target, push, consumes, pops in pda.moves(state, symbol, top):
+                    if pops and top == bottom:
+                        # Popping Z must put it straight back.
+                        if push[:1] != (bottom,):
+                            return None
+                        push = push[1:]
+                    if any(symbol != counter for symbol in push):
+                        return None
+                    cell.append((target, len(push) - (1 if pops and top == counter else 0), consumes))
+                moves.append(tuple(cell))
+    return CounterRunner(pda, tuple(moves))
@@ -0,0 +1,159 @@
+"""
+cfg.py — a PDA's language as a grammar in Chomsky normal form.
+
+normal_grammar() starts from the triple-construction grammar of language.py
+(the PDA accepts w iff its start symbol derives w) and normalises it for
+the chart parser in chart.py:
+
+  1. trim     — keep productive nonterminals reachable from the start
+  2. ε-rules  — drop them, adding every body with nullable symbols left
+                out; ε itself is never a match, so nothing is lost
+  3. terminal — a terminal inside a longer body gets a nonterminal of its own
+  4. binarise — bodies of three or more symbols become chains of pairs
+  5. units    — A → B rules are closed over: every rule that yields B
+                yields all A with A ⇒* B as well
+
+Nonterminals are numbered 0..size-1 so a set of them is an int bitmask,
+and terminals are the input symbol ids of CompiledPDA.encode().
+"""
+
+from itertools import combinations
+from typing import TYPE_CHECKING
+
+from comp382_assignment_2.pda.language import START, triple_grammar
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+
+class NormalGrammar:
+    """
+    A grammar in Chomsky normal form over input symbol ids, with unit rules
+    folded in:
+        terminal_masks[x]  — nonterminals deriving the single symbol x
+        binary_rules[B]    — ((C, mask), …): B C is derived by every
+                             nonterminal in mask
+        start_mask         — the start symbol's bit (0 for ∅)
+    """
+
+    __slots__ = ("size", "start_mask", "terminal_masks", "binary_rules")
+
+    def __init__(self, size: int, start_mask: int, terminal_masks: dict, binary_rules: tuple):
+        self.size = size
+        self.start_mask = start_mask
+        self.terminal_masks = terminal_masks
+        self.binary_rules = binary_rules
+
+
+def normal_grammar(pda: "CompiledPDA") -> NormalGrammar:
+    """Use CompiledPDA.grammar instead: it converts once and keeps the result."""
+    ids = {symbol: i for i, symbol in enumerate(pda.input_symbols, start=1)}
+    productions = _trim(triple_grammar(pda))
+    if START not in productions:
+        return NormalGrammar(0, 0, {}, ())
+
+    rules = _without_epsilon(productions)
+    numbers: dict = {}
+
+    def number(nonterminal) -> int:
+        if nonterminal not in numbers:
+            numbers[nonterminal] = len(numbers)
+        return numbers[nonterminal]
+
+    number(START)
+    terminal_rules: list[tuple[int, int]] = []   # (A, symbol id)
+    unit_rules: list[tuple[int, int]] = []       # (A, B)
+    pair_rules: list[tuple[int, int, int]] = []  # (A, B, C)
+
+    def symbol_number(symbol) -> int:
+        if isinstance(symbol, tuple):
+            return number(symbol)
+        terminal = number(("terminal", symbol))
+        terminal_rules.append((terminal, ids[symbol]))
+        return terminal
+
+    for nonterminal, bodies in rules.items():
+        head = number(nonterminal)
+        for body in bodies:
+            if len(body) == 1:
+                if isinstance(body[0], tuple):
+                    unit_rules.append((head, number(body[0])))
+                else:
+                    terminal_rules.append((head, ids[body[0]]))
+                continue
+            # A → X1 X2 … Xk as A → X1 R1, R1 → X2 R2, …, R(k-2) → X(k-1) Xk
+            left = head
+            for i, symbol in enumerate(body[:-2]):
+                rest = number(("rest", nonterminal, body, i))
+                pair_rules.append((left, symbol_number(symbol), rest))
+                left = rest
+            pair_rules.append((left, symbol_number(body[-2]), symbol_number(body[-1])))
+
+    size = len(numbers)
+    # above[B]: every A with A ⇒* B through unit rules, B included.
+    above = [1 << b for b in range(size)]
+    changed = True
+    while changed:
+        changed = False
+        for a, b in unit_rules:
+            if above[b] | above[a] != above[b]:
+                above[b] |= above[a]
+                changed = True
+
+    terminal_masks: dict[int, int] = {}
+    for a, symbol in terminal_rules:
+        terminal_masks[symbol] = terminal_masks.get(symbol, 0) | above[a]
+    pairs: list[dict[int, int]] = [{} for _ in range(size)]
+    for a, b, c in pair_rules:
+        pairs[b][c] = pairs[b].get(c, 0) | above[a]
+    binary_rules = tuple(tuple(by_right.items()) for by_right in pairs)
+    return NormalGrammar(size, 1 << numbers[START], terminal_masks, binary_rules)
+
+
+def _trim(productions: dict[tuple, list[tuple]]) -> dict[tuple, list[tuple]]:
+    """Productive nonterminals reachable from the start, with only their productive bodies."""
+    productive, changed = set(), True
+    while changed:
+        changed = False
+        for nonterminal, bodies in productions.items():
+            if nonterminal not in productive and any(
+                all(not isinstance(s, tuple) or s in productive for s in body) for body in bodies
+            ):
+                productive.add(nonterminal)
+                changed = True
+
+    useful: dict[tuple, list[tuple]] = {}
+    pending = [START] if START in productive else []
+    while pending:
+        nonterminal = pending.pop()
+        if nonterminal in useful:
+            continue
+        useful[nonterminal] = [
+            body for body in productions[nonterminal]
+            if all(not isinstance(s, tuple) or s in productive for s in body)
+        ]
+        pending.extend(s for body in useful[nonterminal] for s in body if isinstance(s, tuple))
+    return useful
+
+
+def _without_epsilon(productions: dict[tuple, list[tuple]]) -> dict[tuple, set[tuple]]:
+    """Every non-empty body obtainable by leaving out nullable symbols; no ε-bodies."""
+    nullable, changed = set(), True
+    while changed:
+        changed = False
+        for nonterminal, bodies in productions.items():
+            if nonterminal not in nullable and any(all(s in nullable for s in body) for body in bodies):
+                nullable.add(nonterminal)
+                changed = True
+
+    rules: dict[tuple, set[tuple]] = {}
+    for nonterminal, bodies in productions.items():
+        variants = rules.setdefault(nonterminal, set())
+        for body in bodies:
+            optional = [i for i, s in enumerate(body) if s in nullable]
+            for k in range(len(optional) + 1):
+                for dropped in combinations(optional, k):
+                    variant = tuple(s for i, s in enumerate(body) if i not in dropped)
+                    if variant and variant != (nonterminal,):
+                        variants.add(variant)
+    return rules
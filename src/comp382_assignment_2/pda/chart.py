@@ -0,0 +1,107 @@
+"""
+chart.py — bitset CYK over a NormalGrammar: every substring's membership
+from one table.
+
+Deciding each of the O(n²) substrings separately repeats the same work
+over and over; a CYK chart decides them all at once, in O(n² · |rules|)
+bitset operations whatever the language, so an arbitrary context-free
+PDA scales polynomially.
+
+The chart is filled left to right by end position j, and for each j by
+decreasing start i. Two kinds of bitsets make the inner step cheap:
+
+  cell(i, j)   — bitmask of the nonterminals deriving symbols[i:j]
+  rows[A][i]   — bitmask of the ends k with A deriving symbols[i:k]
+  ending[C]    — while filling end j: bitmask of the starts k with C
+                 deriving symbols[k:j]
+
+so a rule A → B C covers symbols[i:j] iff rows[B][i] & ending[C] ≠ 0, one
+C-level AND of two ints for all split points together. Only the rows are
+kept; a cell is read back from them on demand.
+
+Usage
+-----
+chart = SubstringChart(pda.grammar, pda.encode(text))
+chart.accepts(2, 6)      # is text[2:6] in the language?
+chart.longest_span()     # leftmost-longest match, read off the start rows
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.cfg import NormalGrammar
+
+
+class SubstringChart:
+    """All substring memberships of one encoded input for one grammar."""
+
+    __slots__ = ("grammar", "n", "_rows")
+
+    def __init__(self, grammar: "NormalGrammar", symbols):
+        self.grammar = grammar
+        self.n = n = len(symbols)
+        size = grammar.size
+        terminal_masks = grammar.terminal_masks
+        binary_rules = grammar.binary_rules
+        rows = self._rows = [[0] * (n + 1) for _ in range(size)]
+        # Nonterminals deriving some substring that starts at i.
+        starting = [0] * (n + 1)
+        # Only nonterminals that can open a pair rule matter on the left.
+        openers = sum(1 << b for b, by_right in enumerate(binary_rules) if by_right)
+
+        for j in range(1, n + 1):
+            ending = [0] * size
+            end_bit = 1 << j
+            for i in range(j - 1, -1, -1):
+                if i == j - 1:
+                    cell = terminal_masks.get(symbols[i], 0)
+                else:
+                    cell = 0
+                    left = starting[i] & openers
+                    while left:
+                        low = left & -left
+                        left ^= low
+                        b = low.bit_length() - 1
+                        splits = rows[b][i]
+                        for c, heads in binary_rules[b]:
+                            if splits & ending[c]:
+                                cell |= heads
+                if not cell:
+                    continue
+                starting[i] |= cell
+                start_bit = 1 << i
+                while cell:
+                    low = cell & -cell
+                    cell ^= low
+                    a = low.bit_length() - 1
+                    rows[a][i] |= end_bit
+                    ending[a] |= start_bit
+
+    def cell(self, start: int, end: int) -> int:
+        """Bitmask of the nonterminals deriving symbols[start:end]."""
+        mask = 0
+        for a, row in enumerate(self._rows):
+            if row[start] >> end & 1:
+                mask |= 1 << a
+        return mask
+
+    def accepts(self, start: int, end: int) -> bool:
+        """Whether the PDA accepts symbols[start:end] (always False for start == end)."""
+        return bool(self.cell(start, end) & self.grammar.start_mask) if start < end else False
+
+    def accepting_ends(self, start: int) -> list[int]:
+        """Every end with symbols[start:end] accepted, in increasing order."""
+        ends = self._start_row()[start]
+        return [end for end in range(start + 1, self.n + 1) if ends >> end & 1]
+
+    def longest_span(self) -> tuple[int, int] | None:
+        """Leftmost-longest accepted span, or None."""
+        best_start, best_length = 0, 0
+        for start, ends in enumerate(self._start_row()):
+            if ends and ends.bit_length() - 1 - start > best_length:
+                best_start, best_length = start, ends.bit_length() - 1 - start
+        return (best_start, best_start + best_length) if best_length else None
+
+    def _start_row(self) -> list[int]:
+        mask = self.grammar.start_mask
+        return self._rows[mask.bit_length() - 1] if mask else [0] * (self.n + 1)
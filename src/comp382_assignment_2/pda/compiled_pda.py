@@ -0,0 +1,312 @@
+"""
+compiled_pda.py — immutable, integer-indexed runtime for a PushdownAutomataModel.
+
+compile_pda() interns states, input symbols and stack symbols to small ints
+and precomputes, for every (state, input symbol, stack top) triple, the merged
+list of candidate moves that check_pda_accept used to assemble from four
+tuple-keyed dict lookups per configuration.
+
+Interning
+---------
+  input symbol 0   → no input left (only ε-moves apply)
+  input symbol 1.. → alphabet, in sorted order; one extra id for any
+                     character outside the alphabet (only ε-moves apply)
+  stack symbol 0   → empty stack (only "match any top" moves apply)
+  stack symbol 1.. → stack alphabet, in sorted order
+
+Moves follow the model's documented semantics: a move consumes input iff its
+input_symbol is not None, and pops the top iff its stack_top is not None.
+Acceptance is by final state once the whole input is consumed. Searches keep
+stacks as hash-consed cons cells (see cons_stack.py), so a configuration is
+a pair of ints however deep its stack is.
+"""
+
+from array import array
+from itertools import repeat
+from weakref import WeakKeyDictionary
+
+from comp382_assignment_2.pda.analysis import is_deterministic, select_runner
+from comp382_assignment_2.pda.cfg import NormalGrammar, normal_grammar
+from comp382_assignment_2.pda.cons_stack import EMPTY, StackPool
+from comp382_assignment_2.pda.language import LanguageSummary, analyse_language
+from comp382_assignment_2.pda.parikh import ParikhConstraints
+from comp382_assignment_2.pda.pruning import InputBounds, SearchStats
+from comp382_assignment_2.pda.pushdown_automata_model import PushdownAutomataModel
+from comp382_assignment_2.pda.saturation import saturation_accepting_ends
+
+_EPSILON = 0
+_EMPTY_STACK = 0
+
+ALGORITHMS = ("auto", "saturation")
+
+_COMPILED: "WeakKeyDictionary[PushdownAutomataModel, CompiledPDA]" = WeakKeyDictionary()
+
+
+class CompiledPDA:
+    """
+    Read-only PDA runtime. Each table cell holds a tuple of moves:
+        (target_state, push, consumes, pops)
+    where push is a tuple of stack ids in bottom-to-top order. Within a cell
+    the top is known, so "pop X, push X…" is pre-folded into "push …".
+    """
+
+    __slots__ = (
+        "states", "input_symbols", "stack_symbols",
+        "initial_state", "initial_stack", "final",
+        "deterministic", "runner", "_bounds", "_language", "_parikh", "_grammar", "_symbol_ids", "_foreign", "_n_inputs", "_n_tops", "_table",
+    )
+
+    def __init__(self, model: PushdownAutomataModel, specialise: bool = True):
+        states = sorted(model.states | {model.initial_state} | _referenced_states(model))
+        symbols = sorted(model.alphabet | {key[1] for key in model.transitions if key[1] is not None})
+        stack = sorted(model.stack_alphabet | {model.initial_stack_symbol} | _stack_symbols(model))
+
+        self.states = tuple(states)
+        self.input_symbols = tuple(symbols)
+        self.stack_symbols = tuple(stack)
+
+        state_ids = {state: i for i, state in enumerate(states)}
+        self._symbol_ids = {symbol: i + 1 for i, symbol in enumerate(symbols)}
+        self._foreign = len(symbols) + 1
+        stack_ids = {symbol: i + 1 for i, symbol in enumerate(stack)}
+
+        self._n_inputs = len(symbols) + 2
+        self._n_tops = len(stack) + 1
+
+        self.initial_state = state_ids[model.initial_state]
+        self.initial_stack = stack_ids[model.initial_stack_symbol]
+        self.final = tuple(state in model.final_states for state in states)
+
+        moves: dict = {}
+        for (source, symbol, top), targets in model.transitions.items():
+            key = (
+                state_ids[source],
+                _EPSILON if symbol is None else self._symbol_ids[symbol],
+                None if top is None else stack_ids[top],
+            )
+            for target, push_list in targets:
+                push = tuple(stack_ids[s] for s in reversed(push_list) if s)
+                moves.setdefault(key, []).append(
+                    (state_ids[target], push, symbol is not None, top is not None)
+                )
+
+        # Same merge order as the old per-configuration lookups:
+        # exact, ε-input, any-top, ε-input + any-top.
+        table = []
+        for state in range(len(states)):
+            for symbol in range(self._n_inputs):
+                for top in range(self._n_tops):
+                    cell = []
+                    exact_top = top if top != _EMPTY_STACK else -1
+                    cell.extend(moves.get((state, symbol, exact_top), ()))
+                    if symbol != _EPSILON:
+                        cell.extend(moves.get((state, _EPSILON, exact_top), ()))
+                    cell.extend(moves.get((state, symbol, None), ()))
+                    if symbol != _EPSILON:
+                        cell.extend(moves.get((state, _EPSILON, None), ()))
+                    table.append(tuple(_fold_rewrite(move, top) for move in cell))
+        self._table = tuple(table)
+
+        # A specialised runner when the PDA allows one (see analysis.py);
+        # None means the general search below.
+        self.deterministic = is_deterministic(self)
+        self.runner = select_runner(self) if specialise else None
+        self._bounds = InputBounds(self) if self.runner is None else None
+        self._language: LanguageSummary | None = None
+        self._parikh: ParikhConstraints | None = None
+        self._grammar: NormalGrammar | None = None
+
+    @property
+    def engine(self) -> str:
+        """
+        Which runner accepts() uses: "finite-state", "deterministic",
+        "saturation", "counter" or "general".
+        """
+        return self.runner.engine if self.runner is not None else "general"
+
+    @property
+    def language(self) -> LanguageSummary:
+        """Whether the accepted language is empty or finite (language.py); analysed on first use."""
+        if self._language is None:
+            self._language = analyse_language(self)
+        return self._language
+
+    @property
+    def parikh(self) -> ParikhConstraints:
+        """Letter-count constraints of the accepted language (parikh.py); derived on first use."""
+        if self._parikh is None:
+            self._parikh = ParikhConstraints(self)
+        return self._parikh
+
+    @property
+    def grammar(self) -> NormalGrammar:
+        """The accepted language in Chomsky normal form (cfg.py), for chart parsing; converted on first use."""
+        if self._grammar is None:
+            self._grammar = normal_grammar(self)
+        return self._grammar
+
+    def encode(self, text: str) -> list[int]:
+        """Translate text into input symbol ids."""
+        lookup, foreign = self._symbol_ids.get, self._foreign
+        return [lookup(char, foreign) for char in text]
+
+    def encode_view(self, text: str) -> memoryview:
+        """encode() into a compact buffer; slicing the view copies nothing."""
+        return memoryview(array("B" if self._n_inputs <= 256 else "H", self.encode(text)))
+
+    def moves(self, state: int, symbol: int, top: int) -> tuple:
+        """Merged candidate moves for one (state, input symbol, stack top)."""
+        return self._table[(state * self._n_inputs + symbol) * self._n_tops + top]
+
+    def accepts(self, text: str, algorithm: str = "auto") -> bool:
+        """
+        True if some run consumes all of text and ends in a final state.
+        algorithm="auto"       — the engine picked at compile time (default)
+        algorithm="saturation" — post* saturation (saturation.py); always
+                                 terminates, even with ε-push loops
+        """
+        _check_algorithm(algorithm)
+        if algorithm == "auto" and self.runner is not None and self.runner.streaming:
+            # Encode lazily: the runner stops at the first character it rejects.
+            return self.runner.accepts(map(self._symbol_ids.get, text, repeat(self._foreign)))
+        return self._accepts_symbols(self.encode(text), algorithm)
+
+    def accepts_span(self, symbols, start: int, end: int, algorithm: str = "auto") -> bool:
+        """
+        accepts() for symbols[start:end] of an encoded text. With a view from
+        encode_view() the slice is zero-copy, so testing many spans of one
+        text allocates nothing per span.
+        """
+        _check_algorithm(algorithm)
+        return self._accepts_symbols(symbols[start:end], algorithm)
+
+    def _accepts_symbols(self, symbols, algorithm: str) -> bool:
+        if algorithm == "saturation":
+            return len(symbols) in saturation_accepting_ends(self, symbols)
+        if self.runner is not None:
+            return self.runner.accepts(symbols)
+        return any(end == len(symbols) for end in self._search(symbols))
+
+    def accepting_ends(self, symbols: list[int], start: int = 0, algorithm: str = "auto"):
+        """
+        Run the PDA once from `start` over encoded symbols (see encode()) and
+        yield, in increasing order, every end index at which an accepting
+        configuration is reachable with symbols[start:end] consumed.
+        Stops as soon as no configuration survives. `algorithm` is as for
+        accepts().
+        """
+        if algorithm == "saturation":
+            return iter(saturation_accepting_ends(self, symbols, start))
+        _check_algorithm(algorithm)
+        if self.runner is not None:
+            return self.runner.accepting_ends(symbols, start)
+        return self._search(symbols, start)
+
+    def search_stats(self, text: str, prune: bool = True) -> SearchStats:
+        """Run the general search on text and report how much work it did."""
+        stats = SearchStats()
+        symbols = self.encode(text)
+        stats.accepted = any(end == len(symbols) for end in self._search(symbols, 0, prune, stats))
+        return stats
+
+    def _search(self, symbols: list[int], start: int = 0, prune: bool = True, stats: SearchStats | None = None):
+        """The general engine behind accepting_ends()."""
+        n = len(symbols)
+        table, n_tops, final = self._table, self._n_tops, self.final
+        state_stride = self._n_inputs * n_tops
+        pool = StackPool()
+        tops, below, push_onto = pool.tops, pool.below, pool.push
+
+        # need[stack][state]: least input still required (see pruning.py),
+        # filled in as the pool hands out new stack ids.
+        initial_stack = push_onto(EMPTY, (self.initial_stack,))
+        bounds = self._bounds if prune else None
+        need = None
+        if bounds is not None:
+            need = [bounds.empty]
+            need.append(bounds.push(self.initial_stack, need[EMPTY]))
+        explored = pruned = 0
+
+        # One frontier of (state, stack id) per input position; ε-moves are
+        # closed over within the position, input moves feed the next one.
+        frontier = {(self.initial_state, initial_stack)}
+        for idx in range(start, n + 1):
+            symbol_base = (symbols[idx] if idx < n else _EPSILON) * n_tops
+            pending = list(frontier)
+            seen = None
+            advanced = set()
+            accepting = False
+
+            while pending:
+                state, stack = pending.pop()
+                explored += 1
+                if final[state]:
+                    accepting = True
+
+                for target, push, consumes, pops in table[state * state_stride + symbol_base + tops[stack]]:
+                    target_stack = below[stack] if pops else stack
+                    if push:
+                        target_stack = push_onto(target_stack, push)
+                        if need is not None:
+                            while len(need) < len(tops):
+                                need.append(bounds.push(tops[len(need)], need[below[len(need)]]))
+                    if need is not None and need[target_stack][target] > n - idx - consumes:
+                        pruned += 1
+                        continue
+
+                    config = (target, target_stack)
+                    if consumes:
+                        advanced.add(config)
+                        continue
+                    if seen is None:
+                        seen = set(frontier)
+                    if config not in seen:
+                        seen.add(config)
+                        pending.append(config)
+
+            if stats is not None:
+                stats.explored += explored
+                stats.pruned += pruned
+                explored = pruned = 0
+            if accepting:
+                yield idx
+            if not advanced:
+                return
+            frontier = advanced
+
+
+def _check_algorithm(algorithm: str) -> None:
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown acceptance algorithm '{algorithm}'. Available: {list(ALGORITHMS)}")
+
+
+def _fold_rewrite(move: tuple, top: int) -> tuple:
+    """A move that pops `top` only to push it back leaves the stack alone."""
+    target, push, consumes, pops = move
+    if pops and push[:1] == (top,):
+        return target, push[1:], consumes, False
+    return move
+
+
+def _referenced_states(model: PushdownAutomataModel) -> set[str]:
+    states = {key[0] for key in model.transitions} | set(model.final_states)
+    for moves in model.transitions.values():
+        states.update(target for target, _ in moves)
+    return states
+
+
+def _stack_symbols(model: PushdownAutomataModel) -> set[str]:
+    symbols = {key[2] for key in model.transitions if key[2] is not None}
+    for moves in model.transitions.values():
+        for _, push_list in moves:
+            symbols.update(s for s in push_list if s)
+    return symbols
+
+
+def compile_pda(model: PushdownAutomataModel) -> CompiledPDA:
+    """Compile a model once; later calls for the same model reuse the runtime."""
+    compiled = _COMPILED.get(model)
+    if compiled is None:
+        compiled = CompiledPDA(model)
+        _COMPILED[model] = compiled
+    return compiled
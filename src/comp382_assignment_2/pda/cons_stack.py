@@ -0,0 +1,54 @@
+"""
+cons_stack.py — persistent, hash-consed PDA stacks.
+
+A stack is an int id naming a cons cell (symbol, id of the stack below).
+Cells are interned, so equal stacks get the same id: comparing and hashing
+a stack is O(1), and every push shares the tail it was pushed onto instead
+of copying it. Id 0 is the empty stack.
+
+A pool only grows; build one per search and drop it afterwards.
+"""
+
+EMPTY = 0
+
+
+class StackPool:
+    """Interned cons cells, stored column-wise in parallel lists."""
+
+    __slots__ = ("tops", "below", "_cells")
+
+    def __init__(self):
+        self.tops: list[int] = [0]     # tops[EMPTY] is the empty-stack symbol
+        self.below: list[int] = [EMPTY]
+        self._cells: dict[tuple[int, int], int] = {}
+
+    def push(self, stack: int, symbols: tuple) -> int:
+        """Push symbols (bottom-to-top order) onto stack."""
+        cells, tops, below = self._cells, self.tops, self.below
+        for symbol in symbols:
+            key = (stack, symbol)
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = len(tops)
+                tops.append(symbol)
+                below.append(stack)
+            stack = cell
+        return stack
+
+    def pop(self, stack: int) -> int:
+        return self.below[stack]
+
+    def top(self, stack: int) -> int:
+        return self.tops[stack]
+
+    def to_tuple(self, stack: int) -> tuple:
+        """The stack's symbols, bottom-to-top."""
+        symbols = []
+        while stack != EMPTY:
+            symbols.append(self.tops[stack])
+            stack = self.below[stack]
+        return tuple(reversed(symbols))
+
+    def __len__(self) -> int:
+        """Number of distinct non-empty stacks interned so far."""
+        return len(self.tops) - 1
@@ -0,0 +1,199 @@
+"""
+gss.py — all-substrings PDA simulation on a graph-structured stack (GLR style).
+
+A fresh thread is seeded at every input position, and all threads advance
+together in one left-to-right pass. Threads are never copied: stacks live in
+a shared graph whose nodes are (symbol, parent links), and a node is reused
+whenever the same move pushes the same symbols into the same state at the
+same position. A configuration is then just (state, top node), so the work
+and memory per input position are bounded by the size of the PDA, not by the
+number of live threads.
+
+Every path from a node down to a bottom link is a real stack of a real run,
+and the bottom link records the position that run started at. Only the
+earliest start matters for each configuration, so after a position is
+closed each node caches the earliest start below it.
+
+earliest_starts(pda, text)[end] is the earliest start s with text[s:end]
+accepted (None if there is none, or only s == end).
+"""
+
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA, compile_pda
+from comp382_assignment_2.pda.pushdown_automata_model import PushdownAutomataModel
+
+_EPSILON = 0
+_EMPTY_STACK = 0
+_NEVER = float("inf")
+
+
+class _Node:
+    """One stack cell. `bottom` is the earliest start of an empty stack below."""
+
+    __slots__ = ("symbol", "level", "parents", "bottom", "pops", "earliest")
+
+    def __init__(self, symbol: int, level: int):
+        self.symbol = symbol
+        self.level = level
+        self.parents: set[_Node] = set()
+        self.bottom = _NEVER
+        self.pops: list[tuple] = []
+        self.earliest = _NEVER
+
+
+class _Level:
+    """Configurations and stack nodes at one input position."""
+
+    __slots__ = ("configs", "empty", "nodes")
+
+    def __init__(self):
+        self.configs: set[tuple[int, _Node]] = set()
+        self.empty: dict[int, int] = {}
+        self.nodes: dict[tuple, _Node] = {}
+
+
+class _Pass:
+    """State of one left-to-right pass: the level being closed and the next."""
+
+    def __init__(self, pda: CompiledPDA):
+        self.pda = pda
+        self.idx = 0
+        self.current = _Level()
+        self.following = _Level()
+        self.pending: list[tuple[int, _Node | None]] = []
+
+    def advance(self, idx: int) -> None:
+        self.idx = idx
+        self.current, self.following = self.following, _Level()
+        self.pending = list(self.current.configs)
+        self.pending.extend((state, None) for state in self.current.empty)
+
+    def seed(self) -> None:
+        """Start a new thread at the current position."""
+        node = self.current.nodes[("seed",)] = _Node(self.pda.initial_stack, self.idx)
+        node.bottom = self.idx
+        self.add(self.current, self.pda.initial_state, node, self.idx)
+
+    def close(self, symbol: int) -> None:
+        """Apply every move at this position until no new configuration appears."""
+        pending, moves = self.pending, self.pda.moves
+        while pending:
+            state, node = pending.pop()
+            if node is None:
+                for target, push, consumes, _ in moves(state, symbol, _EMPTY_STACK):
+                    self.move(None, self.current.empty[state], target, push, consumes)
+                continue
+
+            for target, push, consumes, pops in moves(state, symbol, node.symbol):
+                if not pops:
+                    # Re-push the top instead of keeping the node: otherwise
+                    # threads that differ only below the top never merge.
+                    push = (node.symbol,) + push
+                if node.level == self.idx:
+                    node.pops.append((target, push, consumes))
+                for parent in list(node.parents):
+                    self.move(parent, _NEVER, target, push, consumes)
+                if node.bottom < _NEVER:
+                    self.move(None, node.bottom, target, push, consumes)
+
+    def move(self, base: _Node | None, start: float, target: int, push: tuple, consumes: bool) -> None:
+        """Push onto base (None = empty stack since `start`) and enter target."""
+        level = self.following if consumes else self.current
+        top = base
+        for i, stack_symbol in enumerate(push):
+            key = (target, push, i)
+            node = level.nodes.get(key)
+            if node is None:
+                node = level.nodes[key] = _Node(stack_symbol, self.idx + consumes)
+            if i == 0:
+                self.link(node, base, start)
+            else:
+                node.parents.add(top)
+            top = node
+        self.add(level, target, top, start)
+
+    def link(self, node: _Node, base: _Node | None, start: float) -> None:
+        """Add a link below node, replaying pops already taken through it."""
+        if base is None:
+            if start >= node.bottom:
+                return
+            node.bottom = start
+        elif base in node.parents:
+            return
+        else:
+            node.parents.add(base)
+        for target, push, consumes in node.pops:
+            self.move(base, start, target, push, consumes)
+
+    def add(self, level: _Level, state: int, node: _Node | None, start: float) -> None:
+        if node is None:
+            if start < level.empty.get(state, _NEVER):
+                level.empty[state] = start
+                if level is self.current:
+                    self.pending.append((state, None))
+        elif (state, node) not in level.configs:
+            level.configs.add((state, node))
+            if level is self.current:
+                self.pending.append((state, node))
+
+    def earliest_accepting(self) -> float:
+        final, best = self.pda.final, _NEVER
+        for state, start in self.current.empty.items():
+            if final[state] and start < best:
+                best = start
+        for state, node in self.current.configs:
+            if final[state] and node.earliest < best:
+                best = node.earliest
+        return best
+
+
+def earliest_starts(pda: CompiledPDA | PushdownAutomataModel, text: str) -> list[int | None]:
+    """Earliest accepting start for every end position 0..len(text)."""
+    if not isinstance(pda, CompiledPDA):
+        pda = compile_pda(pda)
+    symbols = pda.encode(text)
+    n = len(symbols)
+    run = _Pass(pda)
+    result: list[int | None] = []
+
+    for idx in range(n + 1):
+        run.advance(idx)
+        if idx < n:
+            run.seed()
+        run.close(symbols[idx] if idx < n else _EPSILON)
+        _close_level(run.current, idx)
+
+        best = run.earliest_accepting()
+        result.append(int(best) if best < idx else None)
+
+    return result
+
+
+def _close_level(level: _Level, idx: int) -> None:
+    """Fix each node's earliest start now that no more links can arrive."""
+    nodes = list(level.nodes.values())
+    for node in nodes:
+        node.pops = []
+        earliest = node.bottom
+        for parent in node.parents:
+            if parent.level < idx and parent.earliest < earliest:
+                earliest = parent.earliest
+        node.earliest = earliest
+
+    # Links within the level (ε-pushes, possibly cyclic) relax to a fixpoint.
+    changed = True
+    while changed:
+        changed = False
+        for node in nodes:
+            for parent in node.parents:
+                if parent.level == idx and parent.earliest < node.earliest:
+                    node.earliest = parent.earliest
+                    changed = True
+
+
+def longest_match_span(pda: CompiledPDA | PushdownAutomataModel, text: str) -> tuple[int, int] | None:
+    """Leftmost-longest accepted substring, from a single GSS pass."""
+    best = None
+    for end, start in enumerate(earliest_starts(pda, text)):
+        if start is not None and (best is None or end - start > best[1] - best[0]):
+            best = (start, end)
+    return best
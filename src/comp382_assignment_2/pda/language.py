@@ -0,0 +1,256 @@
+"""
+language.py — decide whether a PDA's language is empty or finite.
+
+Most intersection pairs are ∅ or a handful of words ({aa}); searching the
+input for them is wasted work. LanguageSummary is computed once per
+CompiledPDA (its `language` property) from the triple construction: a context-free grammar whose
+nonterminals summarise runs between configurations,
+
+  ("pop", q, X, p)     — from q with X on top, reach p with X popped
+  ("finish", q, X)     — from q with X on top, reach a final state with X
+                         still on the stack
+  ("empty", q)         — from q on the empty stack, reach a final state
+  ("pops", q, W, p)    — pop the whole word W (bottom→top) from q, end in p
+  ("finishes", q, W)   — finish while some symbol of W remains
+
+so the PDA accepts w iff the start symbol derives w. Only nonterminals
+reachable from the start symbol are generated. Then, on the usual grammar
+fixpoints:
+
+  empty   — the start symbol is not productive
+  finite  — no useful nonterminal derives A ⇒* αAβ with αβ non-empty,
+            i.e. no strongly connected component of the useful grammar
+            holds a production that also generates some terminal
+  words   — a finite language is enumerated by a set fixpoint (up to
+            _MAX_WORDS words), ready for a multi-pattern substring search
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+_EPSILON = 0
+_EMPTY_STACK = 0
+START = ("start",)
+_MAX_WORDS = 4096
+
+
+@dataclass(frozen=True)
+class LanguageSummary:
+    """
+    empty / finite describe the whole language; words lists it when it is
+    finite and small enough (None otherwise), shortest first.
+    """
+
+    empty: bool
+    finite: bool
+    words: tuple[str, ...] | None
+
+
+def analyse_language(pda: "CompiledPDA") -> LanguageSummary:
+    """Use CompiledPDA.language instead: it runs this once and keeps the result."""
+    return _analyse(_Grammar(pda))
+
+
+def triple_grammar(pda: "CompiledPDA") -> dict[tuple, list[tuple]]:
+    """
+    The triple-construction grammar: nonterminal → bodies, where a body is a
+    tuple of terminals (input symbols as str) and nonterminals (tuples).
+    The start symbol is ("start",).
+    """
+    return _Grammar(pda).productions
+
+
+class _Grammar:
+    """Productions of the triple construction, generated from the start symbol."""
+
+    def __init__(self, pda: "CompiledPDA"):
+        self.pda = pda
+        self.states = range(len(pda.states))
+        self.productions: dict[tuple, list[tuple]] = {}
+
+        pending = [START]
+        while pending:
+            nonterminal = pending.pop()
+            if nonterminal in self.productions:
+                continue
+            bodies = self.expand(nonterminal)
+            self.productions[nonterminal] = bodies
+            pending.extend(s for body in bodies for s in body if isinstance(s, tuple))
+
+    def consuming_moves(self, state: int, top: int):
+        """(terminal or None, target, word left in place of top, bottom→top)."""
+        pda = self.pda
+        for target, push, consumes, pops in pda.moves(state, _EPSILON, top):
+            yield None, target, self.replaced(top, push, pops)
+        for index, symbol in enumerate(pda.input_symbols, start=1):
+            for target, push, consumes, pops in pda.moves(state, index, top):
+                if consumes:
+                    yield symbol, target, self.replaced(top, push, pops)
+
+    @staticmethod
+    def replaced(top: int, push: tuple, pops: bool) -> tuple:
+        return push if pops or top == _EMPTY_STACK else (top,) + push
+
+    def expand(self, nonterminal: tuple) -> list[tuple]:
+        kind = nonterminal[0]
+        final = self.pda.final
+
+        if kind == "start":
+            return self.finish_or_empty(self.pda.initial_state, (self.pda.initial_stack,))
+
+        if kind == "empty":
+            (_, q) = nonterminal
+            bodies = [()] if final[q] else []
+            for terminal, target, word in self.consuming_moves(q, _EMPTY_STACK):
+                lead = (terminal,) if terminal else ()
+                bodies += [lead + body for body in self.finish_or_empty(target, word)]
+            return bodies
+
+        if kind == "pop":
+            _, q, top, p = nonterminal
+            return [
+                ((terminal,) if terminal else ()) + (("pops", target, word, p),)
+                for terminal, target, word in self.consuming_moves(q, top)
+            ]
+
+        if kind == "finish":
+            _, q, top = nonterminal
+            bodies = [()] if final[q] else []
+            for terminal, target, word in self.consuming_moves(q, top):
+                if word:
+                    bodies.append(((terminal,) if terminal else ()) + (("finishes", target, word),))
+            return bodies
+
+        if kind == "pops":
+            _, q, word, p = nonterminal
+            if not word:
+                return [()] if q == p else []
+            return [(("pop", q, word[-1], r), ("pops", r, word[:-1], p)) for r in self.states]
+
+        # "finishes"
+        _, q, word = nonterminal
+        bodies = [(("finish", q, word[-1]),)]
+        if len(word) > 1:
+            bodies += [(("pop", q, word[-1], r), ("finishes", r, word[:-1])) for r in self.states]
+        return bodies
+
+    def finish_or_empty(self, q: int, word: tuple) -> list[tuple]:
+        """Accept with `word` on an empty stack: finish inside it, or pop it all first."""
+        bodies = [(("finishes", q, word),)] if word else []
+        bodies += [(("pops", q, word, r), ("empty", r)) for r in self.states]
+        return bodies
+
+
+def _analyse(grammar: _Grammar) -> LanguageSummary:
+    productions = grammar.productions
+
+    def fixpoint(holds) -> set:
+        """Least set of nonterminals closed under `holds(body, set)`."""
+        result, changed = set(), True
+        while changed:
+            changed = False
+            for nonterminal, bodies in productions.items():
+                if nonterminal not in result and any(holds(body, result) for body in bodies):
+                    result.add(nonterminal)
+                    changed = True
+        return result
+
+    productive = fixpoint(lambda body, done: all(not isinstance(s, tuple) or s in done for s in body))
+    if START not in productive:
+        return LanguageSummary(empty=True, finite=True, words=())
+
+    # Useful productions: every symbol productive, reachable from the start.
+    useful: dict[tuple, list[tuple]] = {}
+    pending = [START]
+    while pending:
+        nonterminal = pending.pop()
+        if nonterminal in useful:
+            continue
+        useful[nonterminal] = [
+            body for body in productions[nonterminal]
+            if all(not isinstance(s, tuple) or s in productive for s in body)
+        ]
+        pending.extend(s for body in useful[nonterminal] for s in body if isinstance(s, tuple))
+    productions = useful
+
+    # Nonterminals that derive some non-empty string.
+    solid = fixpoint(lambda body, done: any(not isinstance(s, tuple) or s in done for s in body))
+
+    component = _components(productions)
+    for nonterminal, bodies in productions.items():
+        for body in bodies:
+            for i, symbol in enumerate(body):
+                if not isinstance(symbol, tuple) or component[symbol] != component[nonterminal]:
+                    continue
+                rest = body[:i] + body[i + 1:]
+                if any(not isinstance(s, tuple) or s in solid for s in rest):
+                    return LanguageSummary(empty=False, finite=False, words=None)
+
+    return LanguageSummary(empty=False, finite=True, words=_enumerate(productions))
+
+
+def _components(productions: dict[tuple, list[tuple]]) -> dict[tuple, int]:
+    """Strongly connected components of the nonterminal graph (iterative Tarjan)."""
+    successors = {
+        nonterminal: [s for body in bodies for s in body if isinstance(s, tuple)]
+        for nonterminal, bodies in productions.items()
+    }
+    index: dict[tuple, int] = {}
+    low: dict[tuple, int] = {}
+    component: dict[tuple, int] = {}
+    stack: list[tuple] = []
+
+    for root in successors:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    work.append((child, iter(successors[child])))
+                elif child not in component:
+                    low[node] = min(low[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    component[member] = index[node]
+                    if member == node:
+                        break
+    return component
+
+
+def _enumerate(productions: dict[tuple, list[tuple]]) -> tuple[str, ...] | None:
+    """Every word of a finite language, or None past _MAX_WORDS."""
+    words: dict[tuple, set[str]] = {nonterminal: set() for nonterminal in productions}
+    changed = True
+    while changed:
+        changed = False
+        for nonterminal, bodies in productions.items():
+            for body in bodies:
+                strings = {""}
+                for symbol in body:
+                    parts = words[symbol] if isinstance(symbol, tuple) else (symbol,)
+                    strings = {prefix + part for prefix in strings for part in parts}
+                    if not strings:
+                        break
+                new = strings - words[nonterminal]
+                if new:
+                    words[nonterminal] |= new
+                    changed = True
+                    if len(words[nonterminal]) > _MAX_WORDS:
+                        return None
+    return tuple(sorted(words[START], key=lambda word: (len(word), word)))
@@ -0,0 +1,254 @@
+"""
+parikh.py — letter-count constraints that every accepted word satisfies.
+
+The Parikh vector of a word counts each input symbol (#a, #b, …). A
+substring whose counts break a constraint of the language cannot be
+accepted, and with prefix sums over the encoded input the counts of any
+span cost one subtraction per symbol — much cheaper than a PDA run.
+
+ParikhConstraints is derived once per CompiledPDA (its `parikh` property)
+from the triple-construction grammar of language.py, by two fixpoints over
+the nonterminals:
+
+  equalities — the affine hull of each nonterminal's Parikh image, i.e. the
+               smallest affine subspace holding the count vectors of all
+               its words. Bodies add hulls (Minkowski sum), alternatives
+               join them; a hull only ever grows in dimension, so the
+               fixpoint ends after at most |Σ| + 1 changes per nonterminal.
+               The start symbol's hull gives equations such as #a − #b = 0
+               for aⁿbⁿ or #a = 2 for abⁿa.
+  minimums   — the fewest occurrences of each symbol in any word.
+
+Both are sound over-approximations: no accepted word is ever rejected.
+Characters outside the alphabet are never consumed, so any span holding
+one is rejected as well.
+
+Usage
+-----
+candidates = pda.parikh.prefilter(symbols)        # symbols from encode_view()
+span = longest_matching_span(symbols, candidates.guard(pda.accepts_span))
+candidates.rejection_ratio                        # share of spans never run
+"""
+
+from fractions import Fraction
+from itertools import accumulate
+from math import lcm
+from typing import TYPE_CHECKING
+
+from comp382_assignment_2.pda.language import START, triple_grammar
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+_UNBOUNDED = float("inf")
+
+
+class ParikhConstraints:
+    """
+    Linear count constraints over pda.input_symbols, in encoded order:
+    `equalities` holds (coefficients, total) pairs, `minimums` the least
+    count of each symbol. `empty` is set when no word is accepted.
+    """
+
+    __slots__ = ("input_symbols", "empty", "equalities", "minimums")
+
+    def __init__(self, pda: "CompiledPDA"):
+        self.input_symbols = pda.input_symbols
+        productions = triple_grammar(pda)
+        index = {symbol: i for i, symbol in enumerate(self.input_symbols)}
+        hull = _affine_hulls(productions, index, len(index)).get(START)
+
+        self.empty = hull is None
+        self.equalities: tuple[tuple[tuple[int, ...], int], ...] = () if hull is None else _equations(*hull)
+        self.minimums: tuple[int, ...] = (
+            () if hull is None else _minimum_counts(productions, index, len(index))[START]
+        )
+
+    def admits(self, text: str) -> bool:
+        """Whether the counts of `text` satisfy every constraint (a word check, not a span check)."""
+        symbols = {symbol: i for i, symbol in enumerate(self.input_symbols)}
+        counts = [0] * len(symbols)
+        for char in text:
+            if char not in symbols:
+                return False
+            counts[symbols[char]] += 1
+        return self._holds(counts)
+
+    def _holds(self, counts) -> bool:
+        if self.empty:
+            return False
+        for count, minimum in zip(counts, self.minimums):
+            if count < minimum:
+                return False
+        for coefficients, total in self.equalities:
+            if sum(c * k for c, k in zip(coefficients, counts)) != total:
+                return False
+        return True
+
+    def prefilter(self, symbols) -> "ParikhPrefilter":
+        """A span filter over `symbols`, encoded by the same CompiledPDA."""
+        return ParikhPrefilter(self, symbols)
+
+
+class ParikhPrefilter:
+    """
+    O(1) span test over one encoded input. Each constraint is folded into a
+    single prefix-sum array — Σ cᵢ·#symbolᵢ for an equality, #symbol for a
+    minimum, #foreign for the alphabet — so a span costs one subtraction
+    per constraint. Counts every span it checks and rejects, so callers
+    can report the rejection ratio.
+    """
+
+    __slots__ = ("constraints", "checked", "rejected", "_exact", "_least")
+
+    def __init__(self, constraints: ParikhConstraints, symbols):
+        self.constraints = constraints
+        self.checked = 0
+        self.rejected = 0
+        n_inputs = len(constraints.input_symbols)
+        # Ids 1..n_inputs are the alphabet; anything above is foreign.
+        foreign = list(accumulate((symbol > n_inputs for symbol in symbols), initial=0))
+        self._exact: list[tuple[list[int], int]] = [(foreign, 0)]
+        self._least: list[tuple[list[int], int]] = []
+        if constraints.empty:
+            # No word at all: a constraint no span meets.
+            self._least.append((list(range(len(symbols) + 1)), len(symbols) + 1))
+            return
+
+        weights = [0] * (n_inputs + 2)
+        for coefficients, total in constraints.equalities:
+            weights[1:n_inputs + 1] = coefficients
+            self._exact.append((list(accumulate((weights[min(s, n_inputs + 1)] for s in symbols), initial=0)), total))
+        for i, minimum in enumerate(constraints.minimums, start=1):
+            if minimum:
+                self._least.append((list(accumulate((s == i for s in symbols), initial=0)), minimum))
+
+    def plausible(self, start: int, end: int) -> bool:
+        """False only if no accepted word has the counts of symbols[start:end]."""
+        self.checked += 1
+        for prefix, total in self._exact:
+            if prefix[end] - prefix[start] != total:
+                self.rejected += 1
+                return False
+        for prefix, minimum in self._least:
+            if prefix[end] - prefix[start] < minimum:
+                self.rejected += 1
+                return False
+        return True
+
+    def guard(self, accept_span):
+        """Wrap a span acceptor (symbols, start, end) so implausible spans skip it."""
+        plausible = self.plausible
+
+        def guarded(symbols, start: int, end: int) -> bool:
+            return plausible(start, end) and accept_span(symbols, start, end)
+
+        return guarded
+
+    @property
+    def rejection_ratio(self) -> float:
+        return self.rejected / self.checked if self.checked else 0.0
+
+
+# ── Affine hulls of Parikh images ─────────────────────────────────────────────
+# A hull is (point, basis) with the basis in reduced row echelon form and the
+# point reduced against it, so equal subspaces compare equal. None is ∅.
+
+def _affine_hulls(productions: dict, index: dict[str, int], n: int) -> dict:
+    hulls: dict[tuple, tuple | None] = {nonterminal: None for nonterminal in productions}
+    changed = True
+    while changed:
+        changed = False
+        for nonterminal, bodies in productions.items():
+            hull = hulls[nonterminal]
+            for body in bodies:
+                total = ((Fraction(0),) * n, ())
+                for symbol in body:
+                    part = hulls[symbol] if isinstance(symbol, tuple) else _unit(index[symbol], n)
+                    if part is None:
+                        total = None
+                        break
+                    total = _add(total, part)
+                if total is not None:
+                    hull = total if hull is None else _join(hull, total)
+            if hull != hulls[nonterminal]:
+                hulls[nonterminal] = hull
+                changed = True
+    return hulls
+
+
+def _unit(i: int, n: int) -> tuple:
+    return tuple(Fraction(int(j == i)) for j in range(n)), ()
+
+
+def _add(left: tuple, right: tuple) -> tuple:
+    point = tuple(x + y for x, y in zip(left[0], right[0]))
+    return _normalise(point, left[1] + right[1])
+
+
+def _join(left: tuple, right: tuple) -> tuple:
+    offset = tuple(y - x for x, y in zip(left[0], right[0]))
+    return _normalise(left[0], left[1] + right[1] + (offset,))
+
+
+def _normalise(point: tuple, vectors: tuple) -> tuple:
+    """(point, vectors) → canonical (point, reduced row echelon basis)."""
+    rows = [list(v) for v in vectors]
+    basis: list[list[Fraction]] = []
+    pivots: list[int] = []
+    for column in range(len(point)):
+        pivot = next((r for r in rows if r[column] != 0), None)
+        if pivot is None:
+            continue
+        rows.remove(pivot)
+        pivot = [x / pivot[column] for x in pivot]
+        rows = [[x - r[column] * y for x, y in zip(r, pivot)] for r in rows]
+        basis = [[x - b[column] * y for x, y in zip(b, pivot)] for b in basis]
+        basis.append(pivot)
+        pivots.append(column)
+
+    point = list(point)
+    for row, column in zip(basis, pivots):
+        factor = point[column]
+        point = [x - factor * y for x, y in zip(point, row)]
+    return tuple(point), tuple(tuple(row) for row in basis)
+
+
+def _equations(point: tuple, basis: tuple) -> tuple:
+    """Integer equations c · x = t cutting out the hull: one per free column."""
+    pivots = [next(i for i, x in enumerate(row) if x != 0) for row in basis]
+    equations = []
+    for free in range(len(point)):
+        if free in pivots:
+            continue
+        normal = [Fraction(0)] * len(point)
+        normal[free] = Fraction(1)
+        for row, column in zip(basis, pivots):
+            normal[column] = -row[free]
+        scale = lcm(*(x.denominator for x in normal))
+        coefficients = tuple(int(x * scale) for x in normal)
+        total = sum(c * x for c, x in zip(coefficients, point))
+        equations.append((coefficients, int(total)))
+    return tuple(equations)
+
+
+def _minimum_counts(productions: dict, index: dict[str, int], n: int) -> dict:
+    """Per nonterminal, the fewest occurrences of each symbol in one of its words."""
+    least: dict[tuple, list] = {nonterminal: [_UNBOUNDED] * n for nonterminal in productions}
+    changed = True
+    while changed:
+        changed = False
+        for nonterminal, bodies in productions.items():
+            current = least[nonterminal]
+            for body in bodies:
+                counts = [0] * n
+                for symbol in body:
+                    if isinstance(symbol, tuple):
+                        counts = [x + y for x, y in zip(counts, least[symbol])]
+                    else:
+                        counts[index[symbol]] += 1
+                for i, count in enumerate(counts):
+                    if count < current[i]:
+                        current[i] = count
+                        changed = True
+    return {nonterminal: tuple(int(x) for x in counts) for nonterminal, counts in least.items() if _UNBOUNDED not in counts}
@@ -3,14 +3,73 @@ pda_loader.py — instantiate PushdownAutomataModel from SuperPDA class implemen
 
 Usage
 -----
-from comp382_assignment_2.pda.pda_loader import load_cfl_pda, load_super_pda
-
-cfl_model   = load_cfl_pda("an_bn")    # raw CFL PDA for individual CFL check
-super_model = load_super_pda("an_bn")  # intersection SuperPDA for simulation
+from comp382_assignment_2.pda.pda_loader import load_cfl_pda, load_compiled_pda, load_super_pda
+
+cfl_model   = load_cfl_pda("an_bn")           # raw CFL PDA for individual CFL check
+super_model = load_super_pda("an_bn").copy()  # shared models are frozen; copy one to simulate
+compiled    = load_compiled_pda("an_bn")
+
+Caching
+-------
+Definitions are built once per key, straight from the SuperPDA class (no GUI
+runtime object is instantiated), and shared process-wide: configs are
+read-only mappings and models are frozen (copy() one to simulate it). GUI
+code keeps calling get_super_pda() for its own runtime instances.
+
+clear_pda_cache() drops one key (or all) after a definition changes,
+together with every product built from that CFL and the memoised match
+results in MATCH_CACHE; pda_cache_size() reports how many keys are loaded.
+
+Engines
+-------
+Compiling runs the analysis in analysis.py: PDAs whose reachable stacks are
+finite become a DFA, deterministic PDAs run a single straight-line loop,
+one-counter PDAs count with an int, and the rest use the general search.
+pda_engine(name) reports which one a key got; the compiled PDA's
+`deterministic` flag records the determinism check on its own.
+
+Loading also decides whether each language is empty or finite
+(language.py), so match_language() can answer ∅ without a search and
+finite languages with one Aho–Corasick pass.
+
+Products
+--------
+load_product_pda(regex_key, cfl_key) builds the SuperPDA for any pair
+automatically as the trimmed DFA × PDA product (product.py) instead of
+going through a hand-written class. Products are memoized per pair under
+product_key() — the same "regex__cfl" form as intersection_map. With
+$COMP382_CACHE_DIR set they are also written there, so later launches load
+the JSON instead of rebuilding it; by default nothing touches the disk.
+The registry falls back to a product for any "regex__cfl" key without a
+hand-written SuperPDA class (super_pda/product.py).
 """
 
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA, compile_pda
+from comp382_assignment_2.pda.product import (
+    product_config,
+    product_fingerprint,
+    read_cached_product,
+    write_cached_product,
+)
 from comp382_assignment_2.pda.pushdown_automata_model import PushdownAutomataModel
-from comp382_assignment_2.super_pda.registry import get_super_pda, list_super_pda_keys
+from comp382_assignment_2.regex.regex_loader import load_regex
+from comp382_assignment_2.super_pda.registry import get_super_pda_class, list_super_pda_keys
+
+
+@dataclass(frozen=True)
+class _CachedPDA:
+    config: MappingProxyType
+    model: PushdownAutomataModel
+    compiled: CompiledPDA
+
+
+_PDA_CACHE: dict[str, _CachedPDA] = {}
+_PRODUCT_CACHE: dict[str, _CachedPDA] = {}
+# Shared CompiledPDA → its SuperPDA key, kept in step with _PDA_CACHE
+_PDA_KEYS: dict[CompiledPDA, str] = {}
 
 
 def parse_transitions(transition_list: list) -> dict:
@@ -47,13 +106,117 @@ def load_cfl_pda(name: str) -> PushdownAutomataModel:
 
 
 def load_super_pda(name: str) -> PushdownAutomataModel:
-    """Load an intersection SuperPDA model by key."""
-    return build_model(load_super_pda_config(name))
+    """Load the shared, frozen SuperPDA model by key."""
+    return _cached(name).model
+
+
+def load_super_pda_config(name: str) -> MappingProxyType:
+    """Return the shared, read-only SuperPDA config by key."""
+    return _cached(name).config
+
+
+def load_compiled_pda(name: str) -> CompiledPDA:
+    """Return the shared CompiledPDA runtime by key."""
+    return _cached(name).compiled
+
+
+def compiled_pda_key(pda: CompiledPDA) -> str | None:
+    """The SuperPDA key a shared CompiledPDA was loaded for; None for any other PDA."""
+    return _PDA_KEYS.get(pda)
 
 
-def load_super_pda_config(name: str) -> dict:
-    """Return the SuperPDA config dict from class implementation by key."""
-    return get_super_pda(name).to_config()
+def pda_engine(name: str) -> str:
+    """Which acceptance engine the compiled PDA for `name` runs on."""
+    return _cached(name).compiled.engine
+
+
+def product_key(regex_key: str, cfl_key: str) -> str:
+    return f"{regex_key}__{cfl_key}"
+
+
+def load_product_pda(regex_key: str, cfl_key: str) -> PushdownAutomataModel:
+    """The shared, frozen DFA × PDA product for a (regex, CFL) pair."""
+    return _cached_product(regex_key, cfl_key).model
+
+
+def load_product_config(regex_key: str, cfl_key: str) -> MappingProxyType:
+    return _cached_product(regex_key, cfl_key).config
+
+
+def load_compiled_product(regex_key: str, cfl_key: str) -> CompiledPDA:
+    return _cached_product(regex_key, cfl_key).compiled
+
+
+def clear_pda_cache(name: str | None = None) -> None:
+    """
+    Forget one cached key (SuperPDA or product key), or every key when name
+    is None. Clearing a CFL key also forgets the "regex__cfl" products built
+    from it, and the registry's product classes go with their configs.
+    Match results memoised in MATCH_CACHE may come from any of them, so
+    that cache is cleared as well.
+    """
+    # Imported here: both modules load their PDAs through this one.
+    from comp382_assignment_2.matchers.result_cache import MATCH_CACHE
+    from comp382_assignment_2.super_pda.product import clear_product_classes
+
+    MATCH_CACHE.clear()
+    if name is None:
+        clear_product_classes()
+        _PDA_CACHE.clear()
+        _PRODUCT_CACHE.clear()
+        _PDA_KEYS.clear()
+        return
+    keys = {name} | {key for key in (*_PDA_CACHE, *_PRODUCT_CACHE) if key.endswith(f"__{name}")}
+    for key in keys:
+        clear_product_classes(key)
+        entry = _PDA_CACHE.pop(key, None)
+        if entry is not None:
+            _PDA_KEYS.pop(entry.compiled, None)
+        _PRODUCT_CACHE.pop(key, None)
+
+
+def pda_cache_size() -> int:
+    return len(_PDA_CACHE) + len(_PRODUCT_CACHE)
+
+
+def _cached(name: str) -> _CachedPDA:
+    entry = _PDA_CACHE.get(name)
+    if entry is None:
+        config = _freeze(get_super_pda_class(name).to_config())
+        model = build_model(config).freeze()
+        entry = _PDA_CACHE[name] = _CachedPDA(config, model, _analysed(compile_pda(model)))
+        _PDA_KEYS[entry.compiled] = name
+    return entry
+
+
+def _cached_product(regex_key: str, cfl_key: str) -> _CachedPDA:
+    key = product_key(regex_key, cfl_key)
+    entry = _PRODUCT_CACHE.get(key)
+    if entry is None:
+        dfa, cfl = load_regex(regex_key), load_cfl_pda(cfl_key)
+        fingerprint = product_fingerprint(dfa, cfl)
+        config = read_cached_product(key, fingerprint)
+        if config is None:
+            config = {"source_dfa": regex_key, "source_cfl": cfl_key, **product_config(dfa, cfl)}
+            write_cached_product(key, fingerprint, config)
+        config = _freeze(config)
+        model = build_model(config).freeze()
+        entry = _PRODUCT_CACHE[key] = _CachedPDA(config, model, _analysed(compile_pda(model)))
+    return entry
+
+
+def _analysed(compiled: CompiledPDA) -> CompiledPDA:
+    """Run the emptiness / finiteness analysis now rather than on the first match."""
+    compiled.language
+    return compiled
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
 
 
 # ── backward-compat shim ───────────────────────────────────────────────────────
@@ -64,5 +227,5 @@ def load_pda(name: str) -> PushdownAutomataModel:
 
 def list_pdas() -> dict:
     """Return flat dict of all PDA configs keyed by name."""
-    return {k: get_super_pda(k).to_config() for k in list_super_pda_keys()}
+    return {k: load_super_pda_config(k) for k in list_super_pda_keys()}
 
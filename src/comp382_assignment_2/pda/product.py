@@ -0,0 +1,171 @@
+"""
+product.py — SuperPDAs built automatically as DFA × PDA products.
+
+For a DFA D and a PDA P, the product runs both machines in lock-step: its
+states are pairs (q, d), an input move of P on symbol x also moves D on x,
+and an ε-move of P leaves D where it is. The stack is P's stack, untouched.
+A pair is final when q is final in P and d is accepting in D, so the
+product accepts exactly L(D) ∩ L(P) — the construction behind the
+hand-written SuperPDAs in super_pda_implementations/.
+
+The raw product has |P| · |D| states; most are dead weight. product_config()
+only keeps pairs that are reachable from the initial pair and can reach a
+final pair in the state graph (stacks ignored, so the trim is sound).
+
+Configs use the same JSON shape as BaseSuperPDA.to_config(), so the loader
+can build them with build_model() and, when $COMP382_CACHE_DIR names a
+directory, cache them on disk: see read_cached_product() /
+write_cached_product(). Without it nothing is written. Each cache file
+records a fingerprint of the DFA pattern and the PDA definition; a stale or
+corrupt file is simply rebuilt.
+
+Pairs with a hand-written SuperPDA keep using it; get_super_pda() builds
+the product for any other pair (super_pda/product.py).
+"""
+
+import hashlib
+import json
+import os
+
+from comp382_assignment_2.pda.pushdown_automata_model import PushdownAutomataModel
+from comp382_assignment_2.regex.dfa import ALPHABET, DFA
+
+_DEAD = 0
+_FORMAT = 1  # bump when the product layout changes
+
+CACHE_DIR_ENV = "COMP382_CACHE_DIR"
+
+
+def product_config(dfa: DFA, pda: PushdownAutomataModel) -> dict:
+    """Trimmed DFA × PDA product as a SuperPDA-style config dict."""
+    columns = {symbol: i + 1 for i, symbol in enumerate(ALPHABET)}
+    outgoing: dict[str, list] = {}
+    for (source, symbol, top), targets in pda.transitions.items():
+        outgoing.setdefault(source, []).append((symbol, top, targets))
+
+    # (q, d) → [((q', d'), input, stack_top, push)]
+    edges: dict[tuple, list] = {}
+
+    def successors(pair: tuple) -> list:
+        if pair not in edges:
+            q, d = pair
+            moves = []
+            for symbol, top, targets in outgoing.get(q, ()):
+                if symbol is None:
+                    d_next = d
+                else:
+                    d_next = dfa.step(d, columns.get(symbol, 0))
+                    if d_next == _DEAD:
+                        continue
+                for target, push in targets:
+                    moves.append(((target, d_next), symbol, top, list(push)))
+            edges[pair] = moves
+        return edges[pair]
+
+    # Forward: pairs reachable from the initial pair, in BFS order.
+    initial = (pda.initial_state, dfa.start)
+    order, reachable = [initial], {initial}
+    for pair in order:
+        for target, *_ in successors(pair):
+            if target not in reachable:
+                reachable.add(target)
+                order.append(target)
+
+    # Backward: of those, the pairs that can still reach a final pair.
+    predecessors: dict[tuple, list] = {}
+    for pair in order:
+        for target, *_ in successors(pair):
+            predecessors.setdefault(target, []).append(pair)
+    final = [pair for pair in order if pair[0] in pda.final_states and dfa.accepting[pair[1]]]
+    useful, pending = set(final), list(final)
+    while pending:
+        for source in predecessors.get(pending.pop(), ()):
+            if source not in useful:
+                useful.add(source)
+                pending.append(source)
+
+    kept = [pair for pair in order if pair in useful] or [initial]
+    names = {pair: f"{pair[0]}.d{pair[1]}" for pair in kept}
+    transitions = [
+        {"from": names[pair], "input": symbol, "stack_top": top, "to": names[target], "push": push}
+        for pair in kept if pair in useful
+        for target, symbol, top, push in successors(pair)
+        if target in useful
+    ]
+
+    return {
+        "description": f"Product of the DFA for {dfa.pattern} and a {len(pda.states)}-state PDA",
+        "states": [names[pair] for pair in kept],
+        "alphabet": sorted(pda.alphabet),
+        "stack_alphabet": sorted(pda.stack_alphabet),
+        "initial_state": names[initial],
+        "initial_stack_symbol": pda.initial_stack_symbol,
+        "final_states": [names[pair] for pair in final if pair in useful],
+        "transitions": transitions,
+    }
+
+
+def product_fingerprint(dfa: DFA, pda: PushdownAutomataModel) -> str:
+    """Identifies the inputs of a product; cache files are only reused on a match."""
+    definition = {
+        "format": _FORMAT,
+        "pattern": dfa.pattern,
+        "states": sorted(pda.states),
+        "alphabet": sorted(pda.alphabet),
+        "stack_alphabet": sorted(pda.stack_alphabet),
+        "initial_state": pda.initial_state,
+        "initial_stack_symbol": pda.initial_stack_symbol,
+        "final_states": sorted(pda.final_states),
+        "transitions": sorted(
+            [source, symbol or "", top or "", target, list(push)]
+            for (source, symbol, top), moves in pda.transitions.items()
+            for target, push in moves
+        ),
+    }
+    encoded = json.dumps(definition, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# ── On-disk cache ─────────────────────────────────────────────────────────────
+
+def product_cache_dir() -> str | None:
+    """$COMP382_CACHE_DIR, or None when unset: the disk cache is opt-in."""
+    return os.environ.get(CACHE_DIR_ENV) or None
+
+
+def product_cache_path(key: str) -> str | None:
+    cache_dir = product_cache_dir()
+    return os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+
+
+def read_cached_product(key: str, fingerprint: str) -> dict | None:
+    """The cached config for `key`, or None if uncached, missing, stale or unreadable."""
+    path = product_cache_path(key)
+    if path is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+        return None
+    return entry.get("config")
+
+
+def write_cached_product(key: str, fingerprint: str, config: dict) -> None:
+    """Best effort: an unwritable cache directory only costs a rebuild next launch."""
+    path = product_cache_path(key)
+    if path is None:
+        return
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "config": config}, f, ensure_ascii=False)
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
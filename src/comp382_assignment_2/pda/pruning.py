@@ -0,0 +1,137 @@
+"""
+pruning.py — lower bounds on the input a configuration still needs.
+
+A configuration that needs more input to reach a final state than the text
+has left can be dropped from the search. InputBounds derives such bounds
+statically, once per PDA, from two min-plus summaries (input cost = number
+of consuming moves):
+
+  pop[q][X][p]  — least input to get from state q with X on top to state p
+                  with X (and everything pushed above it) popped
+  finish[q][X]  — least input to reach a final state from q with X on top
+                  without popping X
+
+The bound for a whole stack then follows its symbols top-down:
+
+  need(q, X·below) = min(finish[q][X], min_p pop[q][X][p] + need(p, below))
+
+Stacks are hash-consed (cons_stack.py), so the search computes the vector
+need(·, stack) once per stack cell from the vector of the cell below.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+_EMPTY_STACK = 0
+_INF = float("inf")
+
+
+class InputBounds:
+    """need(q, stack) as one tuple per stack, indexed by state."""
+
+    __slots__ = ("empty", "_rows")
+
+    def __init__(self, pda: "CompiledPDA"):
+        n_states, n_tops = len(pda.states), pda._n_tops
+        states = range(n_states)
+
+        # Every move from (q, X) on any input, with its input cost.
+        moves = {
+            (q, top): {
+                (target, push, consumes, pops)
+                for symbol in range(pda._n_inputs)
+                for target, push, consumes, pops in pda.moves(q, symbol, top)
+            }
+            for q in states
+            for top in range(n_tops)
+        }
+
+        pop = [[[_INF] * n_states for _ in range(n_tops)] for _ in states]
+        finish = [[0 if pda.final[q] else _INF] * n_tops for q in states]
+        empty = [0 if pda.final[q] else _INF for q in states]
+
+        # Least fixpoint by relaxation; costs only ever decrease.
+        changed = True
+        while changed:
+            changed = False
+            for (q, top), cell in moves.items():
+                for target, push, consumes, pops in cell:
+                    if top == _EMPTY_STACK:
+                        # Nothing to pop: finish on the pushed symbols or
+                        # pop them all and finish from the empty stack.
+                        cost = consumes + min(
+                            self._finish_within(pop, finish, target, push),
+                            min((c + empty[r] for r, c in self._pop_all(pop, target, push).items()), default=_INF),
+                        )
+                        if cost < empty[q]:
+                            empty[q] = cost
+                            changed = True
+                        continue
+
+                    replaced = push if pops else (top,) + push
+                    for r, cost in self._pop_all(pop, target, replaced).items():
+                        if consumes + cost < pop[q][top][r]:
+                            pop[q][top][r] = consumes + cost
+                            changed = True
+                    cost = consumes + self._finish_within(pop, finish, target, replaced)
+                    if cost < finish[q][top]:
+                        finish[q][top] = cost
+                        changed = True
+
+        # _rows[X][q] = (finish[q][X], finite (p, pop[q][X][p]) pairs)
+        self._rows = tuple(
+            tuple(
+                (finish[q][top], tuple((p, cost) for p, cost in enumerate(pop[q][top]) if cost < _INF))
+                for q in states
+            )
+            for top in range(n_tops)
+        )
+        self.empty = tuple(empty)
+
+    def push(self, top: int, below: tuple) -> tuple:
+        """need(·, top·below) from need(·, below)."""
+        vector = []
+        for best, pops in self._rows[top]:
+            for p, cost in pops:
+                if cost + below[p] < best:
+                    best = cost + below[p]
+            vector.append(best)
+        return tuple(vector)
+
+    @staticmethod
+    def _pop_step(pop, reached: dict[int, float], symbol: int) -> dict[int, float]:
+        following = {}
+        for r, cost in reached.items():
+            for p, step in enumerate(pop[r][symbol]):
+                if cost + step < following.get(p, _INF):
+                    following[p] = cost + step
+        return following
+
+    @classmethod
+    def _pop_all(cls, pop, state: int, symbols: tuple) -> dict[int, float]:
+        """Least cost to pop `symbols` (bottom→top) from `state`, per end state."""
+        reached = {state: 0}
+        for symbol in reversed(symbols):
+            reached = cls._pop_step(pop, reached, symbol)
+        return reached
+
+    @classmethod
+    def _finish_within(cls, pop, finish, state: int, symbols: tuple) -> float:
+        """Least cost to finish while some of `symbols` (bottom→top) remains."""
+        best, reached = _INF, {state: 0}
+        for symbol in reversed(symbols):
+            best = min(best, min((cost + finish[r][symbol] for r, cost in reached.items()), default=_INF))
+            reached = cls._pop_step(pop, reached, symbol)
+        return best
+
+
+@dataclass
+class SearchStats:
+    """What one general search did: configurations expanded and dropped."""
+
+    explored: int = 0
+    pruned: int = 0
+    accepted: bool = False
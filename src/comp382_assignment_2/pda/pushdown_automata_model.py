@@ -8,9 +8,15 @@ Transition table format:
   - input_symbol = None  → epsilon (ε) transition on input
   - stack_top    = None  → match any top-of-stack
   - stack_push   = []    → pop without pushing (epsilon push)
+
+A frozen model (see freeze()) is a shared, read-only definition: its
+containers, stack and history are immutable and it refuses to run or
+reset. Call copy() to get a private model, with its own history, that can
+load input and step.
 """
 
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Optional
 
 
@@ -40,6 +46,7 @@ class PushdownAutomataModel:
         self.initial_state = initial_state
         self.initial_stack_symbol = initial_stack_symbol
         self.final_states = final_states
+        self.frozen = False
         self.history: list[Snapshot] = []
         self.reset()
 
@@ -49,6 +56,7 @@ class PushdownAutomataModel:
 
     def reset(self):
         """Return to initial configuration."""
+        self.ensure_mutable()
         self.current_state: str = self.initial_state
         self.stack: list[str] = [self.initial_stack_symbol]
         self.input_string: str = ""
@@ -56,6 +64,7 @@ class PushdownAutomataModel:
         self.history.clear()
 
     def load_input(self, input_string: str):
+        self.ensure_mutable()
         self.reset()
         self.input_string = input_string
 
@@ -64,6 +73,7 @@ class PushdownAutomataModel:
         Execute one transition (deterministic: first matching rule wins).
         Returns True if a transition fired, False if stuck.
         """
+        self.ensure_mutable()
         char = self.input_string[self.input_index] if self.input_index < len(self.input_string) else None
         stack_top = self.stack[-1] if self.stack else None
 
@@ -93,6 +103,38 @@ class PushdownAutomataModel:
         self.current_state = next_state
         return True
 
+    def freeze(self) -> "PushdownAutomataModel":
+        """Make the definition immutable so one instance can be shared."""
+        self.states = frozenset(self.states)
+        self.alphabet = frozenset(self.alphabet)
+        self.stack_alphabet = frozenset(self.stack_alphabet)
+        self.final_states = frozenset(self.final_states)
+        self.transitions = MappingProxyType({
+            key: tuple((next_state, tuple(push)) for next_state, push in moves)
+            for key, moves in self.transitions.items()
+        })
+        self.reset()
+        self.stack = tuple(self.stack)
+        self.history = ()
+        self.frozen = True
+        return self
+
+    def copy(self) -> "PushdownAutomataModel":
+        """Private, mutable model with the same definition."""
+        return PushdownAutomataModel(
+            states=set(self.states),
+            alphabet=set(self.alphabet),
+            stack_alphabet=set(self.stack_alphabet),
+            transitions={key: [(s, list(push)) for s, push in moves] for key, moves in self.transitions.items()},
+            initial_state=self.initial_state,
+            initial_stack_symbol=self.initial_stack_symbol,
+            final_states=set(self.final_states),
+        )
+
+    def ensure_mutable(self):
+        if self.frozen:
+            raise RuntimeError("This PDA model is shared and read-only; use copy() to simulate it.")
+
     def is_accepted(self) -> bool:
         return (
             self.current_state in self.final_states
@@ -0,0 +1,130 @@
+"""
+saturation.py — PDA acceptance by post* saturation (P-automata).
+
+The search engines enumerate whole stacks, so an ε-move that keeps pushing
+gives them infinitely many configurations to visit. Saturation instead
+builds a finite automaton (a P-automaton) for the set of ALL reachable
+configurations and never materialises a stack, so it terminates on every
+PDA, in time polynomial in the size of the PDA and of the input.
+
+Construction
+------------
+The PDA is run on the product with input positions: control (q, i) means
+"in state q with text[start:i] consumed", and an input move goes from
+(q, i) to (q', i + 1). The initial stack sits on a bottom marker ⊥ (stack
+id 0, the table's empty-stack column) that is never popped, so "empty
+stack" is just "⊥ on top". Every move is rewritten as a pushdown rule
+<p, γ> → <p', w> with |w| ≤ 2; longer pushes go through fresh
+intermediate controls. post* then follows Schwoon's saturation
+(Schwoon 2002, Algorithm 2).
+
+A control is reachable iff the saturated automaton has a transition
+leaving it, so accepting ends are the i with some (final, i) reachable.
+"""
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from comp382_assignment_2.pda.compiled_pda import CompiledPDA
+
+_EPSILON = 0
+_BOTTOM = 0
+_ACCEPT = "accept"  # the P-automaton's final state
+
+
+class SaturationRunner:
+    """Acceptance via post*; exact and terminating on every PDA."""
+
+    engine = "saturation"
+    streaming = False
+
+    __slots__ = ("_pda",)
+
+    def __init__(self, pda: "CompiledPDA"):
+        self._pda = pda
+
+    def accepting_ends(self, symbols: list[int], start: int = 0) -> Iterator[int]:
+        return iter(saturation_accepting_ends(self._pda, symbols, start))
+
+    def accepts(self, symbols: list[int]) -> bool:
+        return len(symbols) in saturation_accepting_ends(self._pda, symbols)
+
+
+def saturation_accepting_ends(pda: "CompiledPDA", symbols: list[int], start: int = 0) -> list[int]:
+    """Sorted end indices e with symbols[start:e] accepted."""
+    n = len(symbols)
+    final = pda.final
+
+    def rules(control, top: int) -> list[tuple]:
+        """<control, top> → <control', w>, w top-first with |w| <= 2."""
+        if control[0] == "mid":
+            # ("mid", target control, word still to push (bottom→top), k):
+            # top is word[k - 1]; put word[k] on it and move on.
+            _, target, word, k = control
+            following = target if k == len(word) - 1 else ("mid", target, word, k + 1)
+            return [(following, (word[k], word[k - 1]))]
+
+        state, idx = control
+        symbol = symbols[idx] if idx < n else _EPSILON
+        result = []
+        for target_state, push, consumes, pops in pda.moves(state, symbol, top):
+            target = (target_state, idx + consumes)
+            word = push if pops else (top,) + push  # replaces top, bottom→top
+            if len(word) <= 2:
+                result.append((target, word[::-1]))
+            else:
+                result.append((("mid", target, word, 2), (word[1], word[0])))
+        return result
+
+    # P-automaton transitions (source, symbol | None for ε, destination).
+    # `rel` is indexed two ways for the ε-rule and the push rule below.
+    seen = set()
+    out_of = defaultdict(list)       # source → [(symbol, destination)]
+    eps_into = defaultdict(list)     # destination → [source] for ε-transitions
+    reached = set()
+
+    def record(transition) -> None:
+        source, symbol, destination = transition
+        seen.add(transition)
+        if symbol is None:
+            eps_into[destination].append(source)
+        else:
+            out_of[source].append((symbol, destination))
+
+    initial = (pda.initial_state, start)
+    below_initial = ("stack", 1)
+    worklist = [(initial, pda.initial_stack, below_initial)]
+    record((below_initial, _BOTTOM, _ACCEPT))
+
+    while worklist:
+        transition = worklist.pop()
+        if transition in seen:
+            continue
+        record(transition)
+        control, symbol, destination = transition
+        reached.add(control)
+
+        if symbol is None:
+            for next_symbol, next_destination in list(out_of[destination]):
+                worklist.append((control, next_symbol, next_destination))
+            continue
+
+        for target, word in rules(control, symbol):
+            if not word:
+                worklist.append((target, None, destination))
+            elif len(word) == 1:
+                worklist.append((target, word[0], destination))
+            else:
+                mid = ("pushed", target, word[0])
+                worklist.append((target, word[0], mid))
+                below = (mid, word[1], destination)
+                if below not in seen:
+                    record(below)
+                    for source in list(eps_into[mid]):
+                        worklist.append((source, word[1], destination))
+
+    return sorted({
+        control[1] for control in reached
+        if control[0] != "mid" and final[control[0]]
+    })
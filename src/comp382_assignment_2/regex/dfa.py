@@ -0,0 +1,258 @@
+"""
+dfa.py — regex → Thompson NFA → subset-constructed, Hopcroft-minimised DFA.
+
+compile_regex(pattern) returns a DFA whose transitions are one flat tuple
+of ints, indexed by state * n_columns + column:
+
+  column 0        → any character outside the alphabet (always dead)
+  column 1..      → the alphabet (common/symbols.py STRING_SYMBOLS)
+  state 0         → the dead state; every DFA has one
+
+DFAs are cached per pattern string, like the PDA definitions in pda_loader.
+"""
+
+from comp382_assignment_2.common.symbols import STRING_SYMBOLS
+from comp382_assignment_2.regex.regex_parser import parse_regex
+
+ALPHABET = tuple(str(symbol) for symbol in STRING_SYMBOLS)
+
+_DEAD = 0
+_DFA_CACHE: dict[str, "DFA"] = {}
+
+
+class DFA:
+    """Minimal complete DFA over ALPHABET as a dense integer table."""
+
+    __slots__ = ("pattern", "n_states", "start", "accepting", "_columns", "_n_columns", "_table", "_scan")
+
+    def __init__(self, pattern: str, table: tuple, start: int, accepting: tuple):
+        self.pattern = pattern
+        self.n_states = len(accepting)
+        self.start = start
+        self.accepting = accepting
+        self._columns = {symbol: i + 1 for i, symbol in enumerate(ALPHABET)}
+        self._n_columns = len(ALPHABET) + 1
+        self._table = table
+        self._scan: _ScanTable | None = None
+
+    def encode(self, text: str) -> list[int]:
+        """Translate text into column ids."""
+        lookup = self._columns.get
+        return [lookup(char, 0) for char in text]
+
+    def step(self, state: int, column: int) -> int:
+        return self._table[state * self._n_columns + column]
+
+    def accepts(self, text: str) -> bool:
+        table, n_columns, lookup = self._table, self._n_columns, self._columns.get
+        state = self.start
+        for char in text:
+            state = table[state * n_columns + lookup(char, 0)]
+            if state == _DEAD:
+                return False
+        return self.accepting[state]
+
+    def longest_match_span(self, text: str) -> tuple[int, int] | None:
+        """
+        Leftmost-longest non-empty match in one O(n) pass.
+
+        A thread starts at every index; threads that reach the same DFA
+        state share their future, so only the earliest start per state is
+        kept. The live threads, ordered by start, form a "configuration"
+        whose successor depends only on the next character, so successors
+        are memoised and most characters cost one table lookup.
+        """
+        n_columns = self._n_columns
+        scan = self._scan_table()
+        steps = scan.steps
+        configuration = 0  # no live threads
+        starts: list[int] = []
+        best_start, best_length = 0, 0
+
+        for idx, column in enumerate(self.encode(text)):
+            step = steps[configuration * n_columns + column]
+            if step is None:
+                step = steps[configuration * n_columns + column] = scan.successor(configuration, column)
+            configuration, keep, accepting_slot = step
+
+            if keep is not None:
+                starts.append(idx)
+                starts = [starts[slot] for slot in keep]
+            if accepting_slot >= 0 and idx + 1 - starts[accepting_slot] > best_length:
+                best_start, best_length = starts[accepting_slot], idx + 1 - starts[accepting_slot]
+
+        return (best_start, best_start + best_length) if best_length else None
+
+    def _scan_table(self) -> "_ScanTable":
+        if self._scan is None:
+            self._scan = _ScanTable(self)
+        return self._scan
+
+
+class _ScanTable:
+    """
+    Lazily built successor table for longest_match_span(). A configuration
+    is the tuple of live DFA states ordered by thread start; a step is
+    (next configuration, slots kept or None if unchanged, earliest
+    accepting slot or -1).
+    """
+
+    __slots__ = ("dfa", "configurations", "ids", "steps")
+
+    def __init__(self, dfa: DFA):
+        self.dfa = dfa
+        self.configurations: list[tuple] = [()]
+        self.ids: dict[tuple, int] = {(): 0}
+        self.steps: list = [None] * dfa._n_columns
+
+    def successor(self, configuration: int, column: int) -> tuple:
+        dfa = self.dfa
+        live = self.configurations[configuration]
+        # The thread starting at this character comes last (latest start).
+        candidates = live + ((dfa.start,) if dfa.start != _DEAD else ())
+
+        states, keep = [], []
+        for slot, state in enumerate(candidates):
+            target = dfa.step(state, column)
+            if target != _DEAD and target not in states:
+                states.append(target)
+                keep.append(slot)
+        states = tuple(states)
+
+        if states not in self.ids:
+            self.ids[states] = len(self.configurations)
+            self.configurations.append(states)
+            self.steps.extend([None] * dfa._n_columns)
+        accepting_slot = next((i for i, state in enumerate(states) if dfa.accepting[state]), -1)
+        unchanged = keep == list(range(len(live)))
+        return self.ids[states], None if unchanged else tuple(keep), accepting_slot
+
+
+def compile_regex(pattern: str) -> DFA:
+    """Compile a pattern once; later calls with the same string reuse the DFA."""
+    dfa = _DFA_CACHE.get(pattern)
+    if dfa is None:
+        dfa = _DFA_CACHE[pattern] = _minimise(pattern, *_determinise(*_thompson(parse_regex(pattern))))
+    return dfa
+
+
+def clear_regex_cache() -> None:
+    _DFA_CACHE.clear()
+
+
+# ── Thompson construction ─────────────────────────────────────────────────────
+
+def _thompson(tree: tuple) -> tuple[list, int, int]:
+    """NFA as a list of per-state edge lists [(symbol | None, target)]."""
+    edges: list[list] = []
+
+    def new_state() -> int:
+        edges.append([])
+        return len(edges) - 1
+
+    def build(node: tuple) -> tuple[int, int]:
+        kind = node[0]
+        start, end = new_state(), new_state()
+        if kind == "symbol":
+            edges[start].append((node[1], end))
+        elif kind == "epsilon":
+            edges[start].append((None, end))
+        elif kind == "concat":
+            left_start, left_end = build(node[1])
+            right_start, right_end = build(node[2])
+            edges[start].append((None, left_start))
+            edges[left_end].append((None, right_start))
+            edges[right_end].append((None, end))
+        elif kind == "union":
+            for branch in node[1:]:
+                branch_start, branch_end = build(branch)
+                edges[start].append((None, branch_start))
+                edges[branch_end].append((None, end))
+        elif kind == "star":
+            inner_start, inner_end = build(node[1])
+            edges[start] += [(None, inner_start), (None, end)]
+            edges[inner_end] += [(None, inner_start), (None, end)]
+        # "empty": no edge at all
+        return start, end
+
+    start, end = build(tree)
+    return edges, start, end
+
+
+# ── Subset construction ───────────────────────────────────────────────────────
+
+def _determinise(edges: list, start: int, end: int) -> tuple[list, list]:
+    """Complete DFA as (rows of targets per ALPHABET symbol, accepting flags); 0 is dead."""
+
+    def closure(states) -> frozenset:
+        closed, pending = set(states), list(states)
+        while pending:
+            for symbol, target in edges[pending.pop()]:
+                if symbol is None and target not in closed:
+                    closed.add(target)
+                    pending.append(target)
+        return frozenset(closed)
+
+    subsets = [frozenset(), closure([start])]
+    ids = {subset: i for i, subset in enumerate(subsets)}
+    rows = []
+    for subset in subsets:
+        row = []
+        for symbol in ALPHABET:
+            target = closure([t for s in subset for label, t in edges[s] if label == symbol])
+            if target not in ids:
+                ids[target] = len(subsets)
+                subsets.append(target)
+            row.append(ids[target])
+        rows.append(row)
+    return rows, [end in subset for subset in subsets]
+
+
+# ── Hopcroft minimisation ─────────────────────────────────────────────────────
+
+def _minimise(pattern: str, rows: list, accepting: list) -> DFA:
+    n = len(rows)
+    inverse = [[[] for _ in range(n)] for _ in ALPHABET]
+    for state, row in enumerate(rows):
+        for column, target in enumerate(row):
+            inverse[column][target].append(state)
+
+    final = frozenset(s for s in range(n) if accepting[s])
+    partition = [block for block in (final, frozenset(range(n)) - final) if block]
+    waiting = [min(partition, key=len)] if len(partition) == 2 else list(partition)
+
+    while waiting:
+        splitter = waiting.pop()
+        for column in range(len(ALPHABET)):
+            predecessors = {p for s in splitter for p in inverse[column][s]}
+            if not predecessors:
+                continue
+            refined = []
+            for block in partition:
+                inside, outside = block & predecessors, block - predecessors
+                if inside and outside:
+                    refined += [inside, outside]
+                    if block in waiting:
+                        waiting.remove(block)
+                        waiting += [inside, outside]
+                    else:
+                        waiting.append(min(inside, outside, key=len))
+                else:
+                    refined.append(block)
+            partition = refined
+
+    # Renumber blocks: the dead block first, then the start block.
+    block_of = {state: block for block in partition for state in block}
+    order = [block_of[_DEAD]]
+    if block_of[1] is not block_of[_DEAD]:
+        order.append(block_of[1])
+    order += [block for block in partition if block not in order]
+    number = {block: i for i, block in enumerate(order)}
+
+    table = []
+    for block in order:
+        representative = next(iter(block))
+        table.append(_DEAD)  # column 0: foreign characters
+        table.extend(number[block_of[target]] for target in rows[representative])
+    start = number[block_of[1]]
+    return DFA(pattern, tuple(table), start, tuple(accepting[next(iter(block))] for block in order))
@@ -0,0 +1,47 @@
+"""
+regex_loader.py — compiled DFAs for the regular languages in gui/languages.json.
+
+The `pattern` of each entry under "regular_languages" is the source of
+truth: it is parsed in the project's ∪ ◦ * notation and compiled with
+compile_regex() (cached per pattern).
+
+Usage
+-----
+from comp382_assignment_2.regex.regex_loader import load_regex
+
+dfa  = load_regex("a_star_b_star")
+span = dfa.longest_match_span("abaabbb")   # (2, 7)
+"""
+
+import json
+import os
+
+from comp382_assignment_2.regex.dfa import DFA, compile_regex
+
+_LANGUAGES_JSON = os.path.join(os.path.dirname(__file__), "..", "gui", "languages.json")
+
+_REGULAR_LANGUAGES: dict[str, dict] = {}
+
+
+def _regular_languages() -> dict[str, dict]:
+    if not _REGULAR_LANGUAGES:
+        with open(_LANGUAGES_JSON, "r", encoding="utf-8") as f:
+            _REGULAR_LANGUAGES.update(json.load(f)["regular_languages"])
+    return _REGULAR_LANGUAGES
+
+
+def list_regex_keys() -> list[str]:
+    return list(_regular_languages())
+
+
+def regex_pattern(key: str) -> str:
+    """The ∪ ◦ * pattern declared for a regular-language key."""
+    languages = _regular_languages()
+    if key not in languages:
+        raise KeyError(f"Unknown regular language '{key}'. Available: {list(languages)}")
+    return languages[key]["pattern"]
+
+
+def load_regex(key: str) -> DFA:
+    """Return the shared, minimised DFA for a regular-language key."""
+    return compile_regex(regex_pattern(key))
@@ -0,0 +1,97 @@
+"""
+regex_parser.py — parse the project's regex notation (common/symbols.py).
+
+Grammar, loosest binding first; concatenation may be written with ◦ or by
+juxtaposition ("ab*a" is a ◦ b* ◦ a), and spaces are ignored:
+
+  union  := concat ("∪" concat)*
+  concat := star ("◦"? star)*
+  star   := atom "*"*
+  atom   := "a" | "b" | "ε" | "∅" | "(" union ")"
+
+The result is a small tuple AST:
+  ("symbol", c) | ("epsilon",) | ("empty",)
+  ("concat", left, right) | ("union", left, right) | ("star", inner)
+"""
+
+from comp382_assignment_2.common.symbols import STRING_SYMBOLS, Symbols
+
+_LITERALS = {str(symbol) for symbol in STRING_SYMBOLS}
+
+
+class RegexSyntaxError(ValueError):
+    """The pattern is not in the ∪ ◦ * notation."""
+
+
+def parse_regex(pattern: str) -> tuple:
+    tokens = [char for char in pattern if char != Symbols.SPACE]
+    parser = _Parser(tokens, pattern)
+    tree = parser.union()
+    if parser.pos != len(tokens):
+        parser.fail("unexpected")
+    return tree
+
+
+class _Parser:
+    def __init__(self, tokens: list[str], pattern: str):
+        self.tokens = tokens
+        self.pattern = pattern
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def fail(self, problem: str):
+        found = self.peek()
+        where = f"'{found}' at token {self.pos}" if found is not None else "end of pattern"
+        raise RegexSyntaxError(f"Invalid regex '{self.pattern}': {problem} {where}")
+
+    def union(self) -> tuple:
+        tree = self.concat()
+        while self.peek() == Symbols.UNION:
+            self.pos += 1
+            tree = ("union", tree, self.concat())
+        return tree
+
+    def concat(self) -> tuple:
+        tree = self.star()
+        while True:
+            if self.peek() == Symbols.CONCATENATION:
+                self.pos += 1
+            elif not self.starts_atom():
+                return tree
+            tree = ("concat", tree, self.star())
+
+    def star(self) -> tuple:
+        tree = self.atom()
+        while self.peek() == Symbols.STAR:
+            self.pos += 1
+            tree = ("star", tree)
+        return tree
+
+    def starts_atom(self) -> bool:
+        token = self.peek()
+        return token is not None and (
+            token in _LITERALS
+            or token in (Symbols.EPSILON, Symbols.EMPTY_SET, Symbols.LEFT_PARENTHESIS)
+        )
+
+    def atom(self) -> tuple:
+        token = self.peek()
+        if token in _LITERALS:
+            self.pos += 1
+            return ("symbol", token)
+        if token == Symbols.EPSILON:
+            self.pos += 1
+            return ("epsilon",)
+        if token == Symbols.EMPTY_SET:
+            self.pos += 1
+            return ("empty",)
+        if token == Symbols.LEFT_PARENTHESIS:
+            self.pos += 1
+            tree = self.union()
+            if self.peek() != Symbols.RIGHT_PARENTHESIS:
+                self.fail("expected ')' but found")
+            self.pos += 1
+            return tree
+        self.fail("expected a, b, ε, ∅ or '(' but found")
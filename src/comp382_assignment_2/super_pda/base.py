@@ -126,19 +126,20 @@ class BaseSuperPDA:
         start_x = -((len(self.states) - 1) * spacing) // 2
         return {state: (start_x + idx * spacing, 0) for idx, state in enumerate(self.states)}
 
-    def to_config(self) -> dict:
+    @classmethod
+    def to_config(cls) -> dict:
         return {
-            "description": self.description,
-            "source_dfa": self.source_dfa,
-            "source_cfl": self.source_cfl,
-            "language": self.language,
-            "example_strings": list(self.example_strings),
-            "states": list(self.states),
-            "alphabet": list(self.alphabet),
-            "stack_alphabet": list(self.stack_alphabet),
-            "initial_state": self.initial_state,
-            "initial_stack_symbol": self.initial_stack_symbol,
-            "final_states": list(self.final_states),
+            "description": cls.description,
+            "source_dfa": cls.source_dfa,
+            "source_cfl": cls.source_cfl,
+            "language": cls.language,
+            "example_strings": list(cls.example_strings),
+            "states": list(cls.states),
+            "alphabet": list(cls.alphabet),
+            "stack_alphabet": list(cls.stack_alphabet),
+            "initial_state": cls.initial_state,
+            "initial_stack_symbol": cls.initial_stack_symbol,
+            "final_states": list(cls.final_states),
             "transitions": [
                 {
                     "from": t.source,
@@ -147,7 +148,7 @@ class BaseSuperPDA:
                     "to": t.target,
                     "push": list(t.push),
                 }
-                for t in self.transitions
+                for t in cls.transitions
             ],
         }
 
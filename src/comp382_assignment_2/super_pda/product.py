@@ -0,0 +1,52 @@
+"""
+product.py — SuperPDA classes for pairs without a hand-written one.
+
+product_super_pda_class(regex_key, cfl_key) wraps the DFA × PDA product of
+the pair (pda/product.py, loaded through load_product_config) in a
+BaseSuperPDA subclass, so the GUI steps and renders it like any
+hand-written SuperPDA. A new regular language in languages.json therefore
+needs neither a new class nor an intersection_map entry. Classes are built
+once per pair; clear_pda_cache() drops them with the configs they hold.
+"""
+
+from comp382_assignment_2.pda.pda_loader import load_product_config, product_key
+from comp382_assignment_2.super_pda.base import BaseSuperPDA, Transition
+
+_PRODUCT_CLASSES: dict[str, type[BaseSuperPDA]] = {}
+
+
+def product_super_pda_class(regex_key: str, cfl_key: str) -> type[BaseSuperPDA]:
+    """The BaseSuperPDA subclass for the (regex, CFL) product; KeyError for unknown keys."""
+    key = product_key(regex_key, cfl_key)
+    cls = _PRODUCT_CLASSES.get(key)
+    if cls is None:
+        config = load_product_config(regex_key, cfl_key)
+        cls = _PRODUCT_CLASSES[key] = type(
+            "ProductSuperPDA",
+            (BaseSuperPDA,),
+            {
+                "key": key,
+                "description": config["description"],
+                "source_dfa": regex_key,
+                "source_cfl": cfl_key,
+                "states": list(config["states"]),
+                "alphabet": list(config["alphabet"]),
+                "stack_alphabet": list(config["stack_alphabet"]),
+                "initial_state": config["initial_state"],
+                "initial_stack_symbol": config["initial_stack_symbol"],
+                "final_states": list(config["final_states"]),
+                "transitions": [
+                    Transition(t["from"], t["input"], t["stack_top"], t["to"], list(t["push"]))
+                    for t in config["transitions"]
+                ],
+            },
+        )
+    return cls
+
+
+def clear_product_classes(key: str | None = None) -> None:
+    """Forget the class for one product key, or every class when key is None."""
+    if key is None:
+        _PRODUCT_CLASSES.clear()
+    else:
+        _PRODUCT_CLASSES.pop(key, None)
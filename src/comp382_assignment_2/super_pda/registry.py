@@ -16,11 +16,25 @@ _SUPER_PDA_MAP: dict[str, type[BaseSuperPDA]] = {
 }
 
 
-def get_super_pda(key: str) -> BaseSuperPDA:
+def get_super_pda_class(key: str) -> type[BaseSuperPDA]:
+    """
+    The hand-written class for `key`, else, for a "regex__cfl" pair key, the
+    class built from that pair's DFA × PDA product.
+    """
     cls = _SUPER_PDA_MAP.get(key)
-    if cls is None:
-        raise KeyError(f"Unknown SuperPDA '{key}'. Available: {list(_SUPER_PDA_MAP)}")
-    return cls()
+    if cls is not None:
+        return cls
+    regex_key, _, cfl_key = key.partition("__")
+    if not cfl_key:
+        raise KeyError(f"Unknown SuperPDA '{key}'. Available: {list(_SUPER_PDA_MAP)} or a 'regex__cfl' pair")
+    # Imported here: the product is loaded through pda_loader, which imports this module.
+    from comp382_assignment_2.super_pda.product import product_super_pda_class
+
+    return product_super_pda_class(regex_key, cfl_key)
+
+
+def get_super_pda(key: str) -> BaseSuperPDA:
+    return get_super_pda_class(key)()
 
 
 def list_super_pda_keys() -> list[str]:
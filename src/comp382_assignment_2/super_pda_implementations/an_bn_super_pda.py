@@ -11,17 +11,18 @@ class AnBnSuperPDA(BaseSuperPDA):
     source_cfl = "an_bn"
     language = "{ aⁿbⁿ | n ≥ 1 }"
     example_strings = ["ab", "aabb", "aaabbb"]
-    states = ["q0", "q1", "q2"]
+    states = ["q0", "q1", "q2", "q3"]
     alphabet = ["a", "b"]
     stack_alphabet = ["A", "Z"]
     initial_state = "q0"
     initial_stack_symbol = "Z"
-    final_states = ["q2"]
+    final_states = ["q3"]
     transitions = [
         Transition("q0", "a", "Z", "q1", ["A", "Z"]),
         Transition("q1", "a", "A", "q1", ["A", "A"]),
         Transition("q1", "b", "A", "q2", []),
         Transition("q2", "b", "A", "q2", []),
+        Transition("q2", None, "Z", "q3", ["Z"]),
     ]
 
     def __init__(self):
@@ -133,6 +134,7 @@ class AnBnSuperPDA(BaseSuperPDA):
             self.input_index += 1
 
             if self.input_index == len(self.input_string) and self.stack_view.is_empty():
+                self.current_state = "q3"
                 self.machine_status = Status.ACCEPTED
             else:
                 self.machine_status = Status.RUNNING
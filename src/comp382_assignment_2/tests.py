@@ -4,7 +4,78 @@ Tests against PDA definitions exposed by implementation-backed loaders.
 
 """
 
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+from itertools import product
+
+from comp382_assignment_2 import batch
+from comp382_assignment_2.batch import BatchMatcher, run_batches
 from comp382_assignment_2.matchers import *
+from comp382_assignment_2.matchers.aho_corasick import AhoCorasick
+from comp382_assignment_2.matchers.enumeration import iter_matches
+from comp382_assignment_2.matchers.incremental import LANGUAGES as INCREMENTAL_LANGUAGES, IncrementalMatcher
+from comp382_assignment_2.matchers.child_languages import check_pda_accept
+from comp382_assignment_2.matchers.intersection_matchers import (
+    intersection_languages,
+    intersection_span,
+    match_all_intersection_spans,
+    match_all_intersections,
+    match_language,
+    match_language_span,
+)
+from comp382_assignment_2.matchers.planner import (
+    COST_MODEL_ENV,
+    MIN_EXPONENTS,
+    applicable_engines,
+    clear_cost_model,
+    cost_model,
+    explain,
+    fit_cost,
+    plan_match,
+    run_length_language,
+    save_cost_model,
+)
+from comp382_assignment_2.matchers.result_cache import ResultCache
+from comp382_assignment_2.matchers import intersection_matchers, parallel
+from comp382_assignment_2.matchers.run_length import longest_spans_by_language, span_text
+from comp382_assignment_2.matchers.streaming import StreamScanner, scan_buffer, scan_file
+from comp382_assignment_2.matchers.substring_utils import (
+    all_matching_spans,
+    find_all_matching_substrings,
+    find_longest_matching_substring,
+    find_shortest_matching_substring,
+    longest_matching_span,
+    shortest_matching_span,
+)
+from comp382_assignment_2.pda.analysis import DeterministicRunner
+from comp382_assignment_2.pda.chart import SubstringChart
+from comp382_assignment_2.pda.compiled_pda import CompiledPDA, compile_pda
+from comp382_assignment_2.pda.cons_stack import EMPTY, StackPool
+from comp382_assignment_2.pda.gss import earliest_starts
+from comp382_assignment_2.pda.pda_loader import (
+    clear_pda_cache,
+    load_cfl_pda,
+    load_compiled_pda,
+    load_compiled_product,
+    load_pda,
+    load_product_config,
+    load_super_pda_config,
+    pda_cache_size,
+    pda_engine,
+    product_key,
+)
+from comp382_assignment_2.pda.product import CACHE_DIR_ENV, product_cache_path
+from comp382_assignment_2.pda.pushdown_automata_model import PushdownAutomataModel
+from comp382_assignment_2.regex.dfa import compile_regex
+from comp382_assignment_2.regex.regex_loader import list_regex_keys, load_regex, regex_pattern
+from comp382_assignment_2.regex.regex_parser import RegexSyntaxError
+from comp382_assignment_2.super_pda.registry import get_super_pda, list_super_pda_keys
 
 
 def print_header(title):
@@ -260,6 +331,970 @@ def test_mixed_string():
         result = func(test_str)
         print(f"  {name:20} ({desc:10}): '{result}'")
 
+def test_run_length_engine_matches_pda_search():
+    """The linear CFL matchers agree with the brute-force PDA search"""
+    for name, func in [("an_bn", an_bn), ("a_bn_a", a_bn_a), ("bn", bn)]:
+        pda = load_pda(name)
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                expected = find_longest_matching_substring(s, lambda c: check_pda_accept(pda, c))
+                assert func(s) == expected, (name, s)
+
+
+def test_run_length_engine_long_inputs():
+    """Sparse (few long runs) and dense (many short runs) inputs"""
+    sparse = "c" * 300 + "aaabbbb" + "c" * 300 + "aabb" + "abbbbba" + "bbbbbbbb"
+    assert an_bn(sparse) == "aaabbb"
+    assert a_bn_a(sparse) == "abbbbba"
+    assert bn(sparse) == "bbbbbbbb"
+
+    dense = "ab" * 500 + "aaaabbbc" + "ba" * 500 + "abba"
+    assert an_bn(dense) == "aaabbb"
+    assert a_bn_a(dense) == "abba"
+    assert bn(dense) == "bbb"
+
+    n = 10 ** 6
+    assert an_bn("a" * n + "b" * (n + 1)) == "a" * n + "b" * n
+
+    # Log-like text: scattered a's and b's, long enough to be sampled.
+    log = "".join(f"id={i} path=/a/b took {i % 97}ms\n" for i in range(20_000)) + "xaabbbx"
+    end = len(log) - 1
+    assert longest_spans_by_language(log) == {
+        "an_bn": (end - 5, end - 1), "a_bn_a": (end - 5, end - 3), "bn": (end - 3, end), "aa": (end - 5, end - 3),
+    }
+
+
+def test_compiled_pda_matches_language_definitions():
+    """CompiledPDA.accepts decides exactly each registered SuperPDA language"""
+    languages = {
+        "an_bn":  lambda s: re.fullmatch(r"(a+)(b+)", s) is not None and s.count("a") == s.count("b"),
+        "a_bn_a": lambda s: re.fullmatch(r"ab*a", s) is not None,
+        "bn":     lambda s: re.fullmatch(r"b*", s) is not None,  # q0 is final
+        "aa":     lambda s: s == "aa",
+        "empty":  lambda s: False,
+    }
+    for name, member in languages.items():
+        compiled = compile_pda(load_pda(name))
+        for length in range(9):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert compiled.accepts(s) == member(s), (name, s)
+
+
+def test_pda_cache_shares_read_only_definitions():
+    """Loaded PDAs are shared and frozen; GUI instances stay separate"""
+    clear_pda_cache()
+    assert pda_cache_size() == 0
+
+    model = load_pda("an_bn")
+    assert load_pda("an_bn") is model
+    assert load_super_pda_config("an_bn") is load_super_pda_config("an_bn")
+    assert load_compiled_pda("an_bn").accepts("aabb")
+    assert pda_cache_size() == 1
+
+    try:
+        model.load_input("ab")
+        assert False, "shared model must refuse to run"
+    except RuntimeError:
+        pass
+    try:
+        model.reset()
+        assert False, "shared model must refuse to reset"
+    except RuntimeError:
+        pass
+    assert model.history == () and model.stack == ("Z",)
+    runtime = model.copy()
+    runtime.load_input("ab")
+    assert runtime.step()
+    assert len(runtime.history) == 1 and model.history == () and model.copy().history == []
+
+    try:
+        load_super_pda_config("an_bn")["states"] = []
+        assert False, "shared config must be read-only"
+    except TypeError:
+        pass
+
+    assert get_super_pda("an_bn") is not get_super_pda("an_bn")
+
+    clear_pda_cache("an_bn")
+    assert pda_cache_size() == 0
+    assert load_pda("an_bn") is not model
+
+    # Clearing a CFL also drops its products and the results computed from it.
+    product_pda = load_compiled_product("a_star_b_star", "an_bn")
+    other = load_compiled_product("a_star_b_star", "bn")
+    intersection_span("a_star_b_star", "an_bn", "aabb")
+    assert len(MATCH_CACHE) > 0
+    clear_pda_cache("an_bn")
+    assert len(MATCH_CACHE) == 0
+    assert load_compiled_product("a_star_b_star", "an_bn") is not product_pda
+    assert load_compiled_product("a_star_b_star", "bn") is other
+    clear_pda_cache()
+
+
+def test_per_start_matcher_matches_brute_force():
+    """One simulation per start finds the same leftmost-longest substring"""
+    for name in list_super_pda_keys():
+        pda = load_compiled_pda(name)
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert match_language(pda, s) == match_language(pda, s, "brute_force"), (name, s)
+
+
+def test_gss_matches_per_start_simulation():
+    """One graph-structured-stack pass agrees with a simulation per start"""
+    for name in list_super_pda_keys():
+        pda = load_compiled_pda(name)
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert match_language(pda, s, "gss") == match_language(pda, s), (name, s)
+
+    # ε-moves and "any top" moves that push without popping
+    model = PushdownAutomataModel(
+        states={"q0", "q1", "q2"},
+        alphabet={"a", "b"},
+        stack_alphabet={"A", "Z"},
+        transitions={
+            ("q0", "a", None): [("q0", ["A"])],
+            ("q0", None, None): [("q1", [])],
+            ("q1", "b", "A"): [("q1", [])],
+            ("q1", None, "Z"): [("q2", ["Z"])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"q2"},
+    )
+    for length in range(9):
+        for chars in product("ab", repeat=length):
+            s = "".join(chars)
+            expected = [
+                next((start for start in range(end) if check_pda_accept(model, s[start:end])), None)
+                for end in range(length + 1)
+            ]
+            assert earliest_starts(model, s) == expected, s
+
+
+def test_cons_stacks_are_interned():
+    """Equal stacks share one id, pushes share their tail"""
+    pool = StackPool()
+    ab = pool.push(EMPTY, (1, 2))
+    assert pool.push(pool.push(EMPTY, (1,)), (2,)) == ab
+    assert pool.top(ab) == 2 and pool.to_tuple(pool.pop(ab)) == (1,)
+    assert pool.to_tuple(pool.push(ab, (3,))) == (1, 2, 3)
+    assert len(pool) == 3
+
+    pda = load_compiled_pda("an_bn")
+    assert pda.accepts("a" * 3000 + "b" * 3000)
+    assert not pda.accepts("a" * 3000 + "b" * 2999)
+
+
+def test_specialised_runners_match_general_search():
+    """Stack analysis picks a cheaper runner that accepts exactly the same strings"""
+    assert pda_engine("an_bn") == "deterministic"
+    for name in ("aa", "a_bn_a", "bn", "empty"):
+        assert pda_engine(name) == "finite-state", name
+
+    for name in list_super_pda_keys():
+        specialised = load_compiled_pda(name)
+        general = CompiledPDA(load_pda(name), specialise=False)
+        assert general.engine == "general"
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                symbols = specialised.encode("".join(chars))
+                for start in range(length + 1):
+                    assert list(specialised.accepting_ends(symbols, start)) == list(
+                        general.accepting_ends(symbols, start)
+                    ), (name, chars, start)
+
+
+def test_deterministic_detection():
+    """Every registered SuperPDA is deterministic; a guess between moves is not"""
+    for name in list_super_pda_keys():
+        assert load_compiled_pda(name).deterministic, name
+
+    model = PushdownAutomataModel(
+        states={"q0", "q1"},
+        alphabet={"a"},
+        stack_alphabet={"Z"},
+        transitions={
+            ("q0", "a", "Z"): [("q0", ["Z"])],
+            ("q0", None, "Z"): [("q1", ["Z"])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"q1"},
+    )
+    compiled = CompiledPDA(model)
+    assert not compiled.deterministic
+    assert compiled.accepts("aaa") and compiled.accepts("")
+
+    # Same language, deterministic, with a growing stack
+    an_bn = CompiledPDA(load_pda("an_bn"), specialise=False)
+    runner = DeterministicRunner(an_bn)
+    for text in ("ab", "aabb", "aab", "abb", "ba", "", "a" * 500 + "b" * 500):
+        assert runner.accepts(an_bn.encode(text)) == an_bn.accepts(text), text
+
+
+def test_counter_runner():
+    """A non-deterministic one-counter PDA runs on (state, count) pairs, like the general search"""
+    # a^n b^n ∪ a^n b^2n: q0 guesses when the a's end and which branch to take
+    model = PushdownAutomataModel(
+        states={"q0", "q1", "q2", "q3", "qf"},
+        alphabet={"a", "b"},
+        stack_alphabet={"X", "Z"},
+        transitions={
+            ("q0", "a", None): [("q0", ["X"])],
+            ("q0", None, None): [("q1", []), ("q2", [])],
+            ("q1", "b", "X"): [("q1", [])],
+            ("q2", "b", None): [("q3", [])],
+            ("q3", "b", "X"): [("q2", [])],
+            ("q1", None, "Z"): [("qf", ["Z"])],
+            ("q2", None, "Z"): [("qf", ["Z"])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"qf"},
+    )
+    counter = CompiledPDA(model)
+    general = CompiledPDA(model, specialise=False)
+    assert counter.engine == "counter" and general.engine == "general"
+    assert not counter.deterministic
+
+    for length in range(9):
+        for chars in product("ab", repeat=length):
+            symbols = counter.encode("".join(chars))
+            for start in range(length + 1):
+                assert list(counter.accepting_ends(symbols, start)) == list(
+                    general.accepting_ends(symbols, start)
+                ), (chars, start)
+    for text in ("a" * 300 + "b" * 300, "a" * 300 + "b" * 600, "a" * 300 + "b" * 450):
+        assert counter.accepts(text) == general.accepts(text), len(text)
+    assert counter.accepts("a" * 300 + "b" * 600) and not counter.accepts("a" * 300 + "b" * 450)
+
+
+def test_saturation_terminates_on_epsilon_push_loops():
+    """post* saturation agrees with the search engines and survives ε-push loops"""
+    for name in list_super_pda_keys():
+        pda = load_compiled_pda(name)
+        for length in range(7):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert pda.accepts(s, "saturation") == pda.accepts(s), (name, s)
+
+    # q0 can push X forever without reading input; the search would never stop
+    model = PushdownAutomataModel(
+        states={"q0", "q1"},
+        alphabet={"a"},
+        stack_alphabet={"X", "Z"},
+        transitions={
+            ("q0", None, None): [("q0", ["X"])],
+            ("q0", "a", "X"): [("q1", [])],
+            ("q1", "a", "X"): [("q1", [])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"q1"},
+    )
+    assert compile_pda(model).engine == "saturation"
+    assert [check_pda_accept(model, "a" * k) for k in range(4)] == [False, True, True, True]
+    assert not check_pda_accept(model, "ab", algorithm="saturation")
+
+    try:
+        check_pda_accept(model, "a", algorithm="bfs")
+        assert False, "unknown algorithm accepted"
+    except ValueError:
+        pass
+
+
+def test_input_bound_pruning():
+    """Pruned search drops hopeless configurations without changing the answer"""
+    an_bn = CompiledPDA(load_pda("an_bn"), specialise=False)
+    near_miss = an_bn.search_stats("a" * 500 + "b" * 499)
+    assert not near_miss.accepted and near_miss.pruned > 0
+    assert near_miss.explored < an_bn.search_stats("a" * 500 + "b" * 499, prune=False).explored
+    assert an_bn.search_stats("a" * 500 + "b" * 500).accepted
+
+    for name in list_super_pda_keys():
+        pda = CompiledPDA(load_pda(name), specialise=False)
+        for length in range(7):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert pda.search_stats(s).accepted == pda.search_stats(s, prune=False).accepted, (name, s)
+
+
+def test_regex_compiler():
+    """∪ ◦ * patterns compile to minimal DFAs with an exact leftmost-longest scan"""
+    cases = {
+        "a*b*": ("a*b*", 3),
+        "ab*a": ("ab*a", 4),
+        "a*": ("a*", 2),
+        "(a∪b)*◦a◦b": ("(a|b)*ab", 4),
+        "(ab)* ∪ b*": ("(ab)*|b*", 5),
+        "ε": ("", 2),
+        "∅": ("(?!)", 1),
+    }
+    for pattern, (python_regex, n_states) in cases.items():
+        dfa = compile_regex(pattern)
+        assert dfa.n_states == n_states, pattern
+        assert compile_regex(pattern) is dfa
+        for length in range(7):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert dfa.accepts(s) == bool(re.fullmatch(python_regex, s)), (pattern, s)
+                longest = max(
+                    ((i, j) for i in range(length) for j in range(i + 1, length + 1)
+                     if re.fullmatch(python_regex, s[i:j])),
+                    key=lambda span: (span[1] - span[0], -span[0]),
+                    default=None,
+                )
+                assert dfa.longest_match_span(s) == longest, (pattern, s)
+
+    for key in list_regex_keys():
+        assert load_regex(key) is compile_regex(regex_pattern(key))
+
+    for bad in ("a∪", "(ab", "a)", "a◦*", "c"):
+        try:
+            compile_regex(bad)
+            assert False, bad
+        except RegexSyntaxError:
+            pass
+
+
+def test_product_construction():
+    """DFA × PDA products accept the intersection and match the hand-written SuperPDAs"""
+    with open(os.path.join(os.path.dirname(__file__), "gui", "languages.json"), encoding="utf-8") as f:
+        intersection_map = json.load(f)["intersection_map"]
+
+    previous = os.environ.get(CACHE_DIR_ENV)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ[CACHE_DIR_ENV] = cache_dir
+        try:
+            clear_pda_cache()
+            for regex_key in list_regex_keys():
+                for cfl_key in ("an_bn", "a_bn_a", "bn"):
+                    key = product_key(regex_key, cfl_key)
+                    built = load_compiled_product(regex_key, cfl_key)
+                    assert load_compiled_product(regex_key, cfl_key) is built
+                    hand_written = load_compiled_pda(intersection_map[key])
+                    dfa, cfl = load_regex(regex_key), compile_pda(load_cfl_pda(cfl_key))
+                    for length in range(9):
+                        for chars in product("ab", repeat=length):
+                            s = "".join(chars)
+                            expected = dfa.accepts(s) and cfl.accepts(s)
+                            assert built.accepts(s) == expected, (key, s)
+                            if s:  # the hand-written SuperPDAs ignore ε, like super_accept
+                                assert hand_written.accepts(s) == expected, (key, s)
+                    assert os.path.exists(product_cache_path(key))
+
+            # Empty intersections trim down to a lone, non-final initial state.
+            empty = load_product_config("a_star", "an_bn")
+            assert list(empty["states"]) == [empty["initial_state"]] and not empty["transitions"]
+
+            # A later launch reads the cached file instead of rebuilding it...
+            path = product_cache_path(product_key("a_star_b_star", "an_bn"))
+            assert get_super_pda(product_key("a_star_b_star", "an_bn")).description != "from disk"
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            entry["config"]["description"] = "from disk"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            clear_pda_cache()
+            assert load_product_config("a_star_b_star", "an_bn")["description"] == "from disk"
+            # The registry's product class is rebuilt from it too.
+            assert get_super_pda(product_key("a_star_b_star", "an_bn")).description == "from disk"
+
+            # ...unless its fingerprint no longer matches the inputs.
+            entry["fingerprint"] = "stale"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            clear_pda_cache()
+            assert load_product_config("a_star_b_star", "an_bn")["description"] != "from disk"
+            assert get_super_pda(product_key("a_star_b_star", "an_bn")).description != "from disk"
+        finally:
+            clear_pda_cache()
+            if previous is None:
+                os.environ.pop(CACHE_DIR_ENV, None)
+            else:
+                os.environ[CACHE_DIR_ENV] = previous
+
+    # Without the variable the disk cache is off: nothing is written under $HOME.
+    previous_home = os.environ.get("HOME")
+    with tempfile.TemporaryDirectory() as home:
+        os.environ.pop(CACHE_DIR_ENV, None)
+        os.environ["HOME"] = home
+        try:
+            clear_pda_cache()
+            assert product_cache_path(product_key("a_star_b_star", "an_bn")) is None
+            assert load_compiled_product("a_star_b_star", "an_bn").accepts("aabb")
+            assert os.listdir(home) == []
+        finally:
+            clear_pda_cache()
+            if previous is not None:
+                os.environ[CACHE_DIR_ENV] = previous
+            if previous_home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = previous_home
+
+
+def test_product_fallback():
+    """Pairs without a hand-written SuperPDA or an intersection_matrix entry run on their product"""
+    def steps_to_accept(super_pda, s):
+        super_pda.load_input(s)
+        while super_pda.input_index < len(s) and super_pda.next_step(s[super_pda.input_index])["transitioned"]:
+            pass
+        return super_pda.is_accepted()
+
+    pair = ("a_b_star_a", "a_bn_a")
+    key = product_key(*pair)
+    assert key not in list_super_pda_keys()
+    super_pda = get_super_pda(key)
+    assert super_pda.key == key and (super_pda.source_dfa, super_pda.source_cfl) == pair
+    assert get_super_pda(key) is not super_pda and type(get_super_pda(key)) is type(super_pda)
+    language = load_compiled_product(*pair)
+    for length in range(1, 8):
+        for chars in product("ab", repeat=length):
+            s = "".join(chars)
+            assert steps_to_accept(super_pda, s) == language.accepts(s), s
+
+    # Unmapped pairs are matched on the product too, through MATCH_CACHE.
+    languages = intersection_languages()
+    mapped = languages[pair]
+    try:
+        languages[pair] = "empty"
+        assert False, "the shared intersection table must be read-only"
+    except TypeError:
+        pass
+    unmapped = {other: language for other, language in languages.items() if other != pair}
+    previous = intersection_matchers.intersection_languages
+    intersection_matchers.intersection_languages = lambda: unmapped
+    try:
+        MATCH_CACHE.clear()
+        for s in ("", "abbba", "aaxabbaab", "ba" * 9):
+            assert intersection_span(*pair, s) == match_language_span(load_compiled_pda(mapped), s), s
+    finally:
+        intersection_matchers.intersection_languages = previous
+        MATCH_CACHE.clear()
+    try:
+        get_super_pda("no_such_regex__an_bn")
+        assert False, "unknown regular languages must fail"
+    except KeyError:
+        pass
+
+
+def test_language_analysis():
+    """Empty and finite languages are detected at load time and matched without a PDA search"""
+    expected = {"an_bn": (False, None), "a_bn_a": (False, None), "bn": (False, None),
+                "aa": (False, ("aa",)), "empty": (True, ())}
+    for key, (empty, words) in expected.items():
+        language = load_compiled_pda(key).language
+        assert (language.empty, language.words) == (empty, words), key
+        assert language.finite == (words is not None), key
+
+    # ε-loops that only grow the stack do not make a language infinite.
+    looping = compile_pda(PushdownAutomataModel(
+        states={"q0", "q1", "q2"},
+        alphabet={"a", "b"},
+        stack_alphabet={"Z", "X"},
+        transitions={
+            ("q0", None, None): [("q0", ["X"])],
+            ("q0", "a", "X"): [("q1", [])],
+            ("q1", "b", None): [("q2", ["X"])],
+            ("q1", None, "X"): [("q2", [])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"q2"},
+    ))
+    assert looping.language.finite and looping.language.words == ("a", "ab")
+
+    for key in expected:
+        pda = load_compiled_pda(key)
+        for length in range(9):
+            for chars in product("ab", repeat=length):
+                s = "".join(chars)
+                assert match_language(pda, s) == match_language(pda, s, mode="per_start"), (key, s)
+    assert match_language(looping, "bbaabab") == "ab"
+
+    matcher = AhoCorasick(["ab", "bab", "", "b"])
+    assert matcher.longest_match_span("aabbabab") == (3, 6)
+    assert matcher.longest_match_span("aaa") is None
+    assert AhoCorasick([]).longest_match_span("ab") is None
+
+
+def test_match_all_intersections():
+    """One shared pass gives the same answers as the nine intersection matchers"""
+    longest_map = {
+        ("a_star_b_star", "an_bn"): intersect_r1_c1,
+        ("a_star_b_star", "a_bn_a"): intersect_r1_c2,
+        ("a_star_b_star", "bn"): intersect_r1_c3,
+        ("a_b_star_a", "an_bn"): intersect_r2_c1,
+        ("a_b_star_a", "a_bn_a"): intersect_r2_c2,
+        ("a_b_star_a", "bn"): intersect_r2_c3,
+        ("a_star", "an_bn"): intersect_r3_c1,
+        ("a_star", "a_bn_a"): intersect_r3_c2,
+        ("a_star", "bn"): intersect_r3_c3,
+    }
+    for length in range(9):
+        for chars in product("abc", repeat=length):
+            s = "".join(chars)
+            results = match_all_intersections(s)
+            assert results.keys() == longest_map.keys()
+            for pair, matcher in longest_map.items():
+                assert results[pair] == matcher(s), (pair, s)
+
+    results = match_all_intersections("xaabbbaba")
+    assert results[("a_star_b_star", "an_bn")] == "aabb"
+    assert results[("a_b_star_a", "a_bn_a")] == "abbba"
+    assert results[("a_star", "bn")] == ""
+
+
+def test_super_accept_runs_the_super_pda():
+    """super_accept / super_accept_many agree with the longest-substring definition"""
+    longest = {
+        ("r1", "c1"): intersect_r1_c1, ("r2", "c1"): intersect_r2_c1, ("r3", "c1"): intersect_r3_c1,
+        ("r1", "c2"): intersect_r1_c2, ("r2", "c2"): intersect_r2_c2, ("r3", "c2"): intersect_r3_c2,
+        ("r1", "c3"): intersect_r1_c3, ("r2", "c3"): intersect_r2_c3, ("r3", "c3"): intersect_r3_c3,
+    }
+    strings = ["".join(chars) for length in range(9) for chars in product("abc", repeat=length)]
+    for (regular, cfl), matcher in longest.items():
+        expected = ["matched" if s and matcher(s) == s else "unmatched" for s in strings]
+        assert [super_accept(s, regular, cfl) for s in strings] == expected, (regular, cfl)
+        assert super_accept_many(strings, regular.upper(), cfl.upper()) == expected, (regular, cfl)
+
+    assert super_accept("ab", "r9", "c1") == "unmatched"
+    assert super_accept_many(["ab", "aabb"], "r1", "c9") == ["unmatched", "unmatched"]
+    assert super_accept_many([]) == []
+
+
+def test_span_api():
+    """Span matchers agree with the string API and test candidates without slicing"""
+    pda = load_compiled_pda("a_bn_a")
+    seen_types = set()
+
+    def accept_span(symbols, start, end):
+        seen_types.add(type(symbols))
+        return pda.accepts_span(symbols, start, end)
+
+    for length in range(8):
+        for chars in product("abc", repeat=length):
+            s = "".join(chars)
+            view = pda.encode_view(s)
+            for start in range(length + 1):
+                for end in range(start, length + 1):
+                    assert pda.accepts_span(view, start, end) == pda.accepts(s[start:end]), (s, start, end)
+
+            longest = longest_matching_span(view, accept_span)
+            assert span_text(s, longest) == find_longest_matching_substring(s, pda.accepts)
+            assert span_text(s, shortest_matching_span(view, accept_span)) == find_shortest_matching_substring(s, pda.accepts)
+            assert [(s[i:j], i, j) for i, j in all_matching_spans(view, accept_span)] == find_all_matching_substrings(s, pda.accepts)
+            for mode in ("auto", "per_start", "gss", "brute_force"):
+                assert match_language_span(pda, s, mode) == longest, (s, mode)
+                assert match_language(pda, s, mode) == span_text(s, longest), (s, mode)
+
+            spans = match_all_intersection_spans(s)
+            strings = match_all_intersections(s)
+            for pair, span in spans.items():
+                assert span_text(s, span) == strings[pair], (pair, s)
+                assert intersection_span(*pair, s) == span, (pair, s)
+    assert seen_types == {memoryview}
+
+
+def test_iter_matches():
+    """Lazy enumeration agrees with a brute-force definition of every mode"""
+    for key in ("an_bn", "a_bn_a", "bn", "aa", "empty"):
+        pda = load_compiled_pda(key)
+        general = CompiledPDA(load_pda(key), specialise=False)
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                matches = [(i, j) for i in range(length) for j in range(i + 1, length + 1) if pda.accepts(s[i:j])]
+                maximal = [m for m in matches if not any(o != m and o[0] <= m[0] and o[1] >= m[1] for o in matches)]
+                leftmost, resume = [], 0
+                for i, j in matches:
+                    if i >= resume and not any(a == i and b > j for a, b in matches):
+                        leftmost.append((i, j))
+                        resume = j
+                top = sorted(maximal, key=lambda span: (span[0] - span[1], span[0]))[:2]
+                for language in (key, general):
+                    assert list(iter_matches(s, language, "all")) == matches, (key, s)
+                    assert list(iter_matches(s, language, "maximal")) == maximal, (key, s)
+                    assert list(iter_matches(s, language, "leftmost_longest")) == leftmost, (key, s)
+                    assert list(iter_matches(s, language, "top_k", k=2)) == top, (key, s)
+
+    stream = iter_matches("ab" * 10**6, "an_bn", "all")
+    assert next(stream) == (0, 2) and next(stream) == (2, 4)
+    try:
+        next(iter_matches("ab", "an_bn", "every"))
+        assert False, "unknown mode must be rejected"
+    except ValueError:
+        pass
+
+
+def test_parikh_prefilter():
+    """Letter-count constraints are derived from each PDA and never reject an accepted span"""
+    expected = {
+        "an_bn": ((((-1, 1), 0),), (1, 1)),
+        "a_bn_a": ((((1, 0), 2),), (2, 0)),
+        "aa": ((((1,), 2),), (2,)),
+        "bn": ((), (0,)),
+    }
+    for key, (equalities, minimums) in expected.items():
+        parikh = load_compiled_pda(key).parikh
+        assert (parikh.equalities, parikh.minimums) == (equalities, minimums), key
+    assert load_compiled_pda("empty").parikh.empty
+
+    for key in ("an_bn", "a_bn_a", "bn", "aa", "empty"):
+        pda = load_compiled_pda(key)
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                if pda.accepts(s):
+                    assert pda.parikh.admits(s), (key, s)
+                assert match_language_span(pda, s, "brute_force") == match_language_span(pda, s, "per_start"), (key, s)
+
+    pda = load_compiled_pda("an_bn")
+    symbols = pda.encode_view("aabbbab")
+    candidates = pda.parikh.prefilter(symbols)
+    assert candidates.plausible(0, 4) and candidates.plausible(4, 6)
+    assert not candidates.plausible(0, 3) and not candidates.plausible(2, 4)
+    assert longest_matching_span(symbols, candidates.guard(pda.accepts_span)) == (0, 4)
+    assert candidates.rejected and 0 < candidates.rejection_ratio < 1
+
+
+def test_engine_planner():
+    """The planner picks the cheapest applicable engine under the stored cost model"""
+    assert applicable_engines(load_compiled_pda("empty"))[0] == "empty"
+    assert applicable_engines(load_compiled_pda("aa"))[:1] == ("words",)
+    assert "run_length" in applicable_engines(load_compiled_pda("an_bn"))
+    general = CompiledPDA(load_pda("an_bn"), specialise=False)
+    assert applicable_engines(general) == ("per_start", "gss", "chart", "brute_force")
+
+    coefficient, exponent = fit_cost([10, 100, 1000], [2e-5, 2e-3, 2e-1])
+    assert abs(exponent - 2) < 1e-6 and abs(coefficient - 2e-7) < 1e-12
+    # A sublinear fit is noise for an engine that reads its input.
+    assert fit_cost([100, 1000], [1e-3, 2e-3])[1] == 1.0
+    assert fit_cost([100, 1000], [1e-3, 2e-3], floor=0.0)[1] < 1.0
+    # Long runs are per_start's worst case: the stored model must not prefer it there.
+    assert plan_match(general, 6000).engine != "per_start"
+    # brute_force tries every span and must never undercut the chart on the general runner.
+    ranked = [engine for engine, _ in explain(general, "ab" * 500).alternatives]
+    assert ranked.index("chart") < ranked.index("brute_force")
+    assert run_length_language(load_compiled_pda("bn")) == "bn"
+    assert run_length_language(load_compiled_pda("empty")) is None and run_length_language(general) is None
+
+    previous = os.environ.get(COST_MODEL_ENV)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ[COST_MODEL_ENV] = os.path.join(directory, "costs.json")
+        try:
+            # gss is cheap per symbol but has a large fixed cost per call.
+            save_cost_model({
+                "per_start": {"*": [1e-6, 2.0]},
+                "gss": {"general": [1e-3, 1.0]},
+                "chart": {"*": [1e-3, 2.0]},
+                "brute_force": {"*": [1e-3, 1.5]},
+            })
+            # A stored exponent below the engine's order of growth is raised to it.
+            assert cost_model()["brute_force"]["*"] == [1e-3, MIN_EXPONENTS["brute_force"]]
+            assert plan_match(general, 100).engine == "per_start"
+            assert plan_match(general, 10_000).engine == "gss"
+            plan = explain(general, "ab" * 5_000)
+            assert plan.engine == "gss" and abs(plan.estimated_seconds - 10.0) < 1e-9
+            assert [engine for engine, _ in plan.alternatives][:3] == ["gss", "per_start", "chart"]
+            assert "engine    gss" in str(plan) and "general runner" in str(plan)
+        finally:
+            if previous is None:
+                os.environ.pop(COST_MODEL_ENV, None)
+            else:
+                os.environ[COST_MODEL_ENV] = previous
+            clear_cost_model()
+
+    for key in ("an_bn", "a_bn_a", "bn", "aa", "empty"):
+        pda = load_compiled_pda(key)
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                assert match_language_span(pda, s) == match_language_span(pda, s, "per_start"), (key, s)
+    try:
+        match_language_span(general, "ab", "run_length")
+        assert False, "run_length only applies to registry languages"
+    except ValueError:
+        pass
+
+
+def test_chart_parser():
+    """One CYK chart decides every substring exactly as the PDA does"""
+    palindromes = compile_pda(PushdownAutomataModel(
+        states={"q0", "q1", "q2"},
+        alphabet={"a", "b"},
+        stack_alphabet={"A", "B", "Z"},
+        transitions={
+            ("q0", "a", None): [("q0", ["A"])],
+            ("q0", "b", None): [("q0", ["B"])],
+            ("q0", None, None): [("q1", [])],
+            ("q1", "a", "A"): [("q1", [])],
+            ("q1", "b", "B"): [("q1", [])],
+            ("q1", None, "Z"): [("q2", ["Z"])],
+        },
+        initial_state="q0",
+        initial_stack_symbol="Z",
+        final_states={"q2"},
+    ))
+    pdas = [load_compiled_pda(key) for key in ("an_bn", "a_bn_a", "bn", "aa", "empty")]
+    pdas += [CompiledPDA(load_pda("an_bn"), specialise=False), palindromes]
+    for pda in pdas:
+        for length in range(8):
+            for chars in product("abc", repeat=length):
+                s = "".join(chars)
+                chart = SubstringChart(pda.grammar, pda.encode(s))
+                for start in range(length):
+                    ends = [end for end in range(start + 1, length + 1) if pda.accepts(s[start:end])]
+                    assert chart.accepting_ends(start) == ends, (s, start)
+                    assert all(chart.accepts(start, end) == (end in ends) for end in range(start, length + 1))
+                assert chart.longest_span() == match_language_span(pda, s, "per_start"), s
+                assert match_language_span(pda, s, "chart") == chart.longest_span(), s
+                assert find_longest_matching_substring(s, pda) == match_language(pda, s, "per_start"), s
+
+    text = "ab" * 20 + "abba" * 30 + "ba"
+    assert match_language(palindromes, text, "chart") == match_language(palindromes, text, "per_start")
+    assert load_compiled_pda("empty").grammar.start_mask == 0
+
+
+def test_result_cache():
+    """Matcher results are memoised per (key, input) with LRU eviction"""
+    calls = []
+    cache = ResultCache(maxsize=2)
+
+    @cache.memoize
+    def longest(language, text):
+        calls.append((language, text))
+        return text.upper()
+
+    assert longest("x", "ab") == "AB" and longest("x", "ab") == "AB"
+    assert longest("y", "ab") == "AB" and len(calls) == 2
+    longest("x", "ab")           # refreshes ("x", "ab")
+    longest("x", "abb")          # evicts ("y", "ab"), the least recently used
+    longest("x", "ab")
+    assert len(calls) == 3
+    longest("y", "ab")
+    assert calls[-1] == ("y", "ab") and len(calls) == 4
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (3, 4, 2, 2)
+    assert abs(stats.hit_ratio - 3 / 7) < 1e-12
+
+    cache.resize(1)
+    assert len(cache) == 1 and cache.evictions == 3
+    cache.resize(0)
+    longest("y", "ab")
+    assert len(calls) == 5 and len(cache) == 0
+    cache.clear()
+    assert cache.stats() == ResultCache(0).stats()
+
+    class Colliding(str):
+        def __hash__(self):
+            return 0
+
+    cache = ResultCache(maxsize=4)
+    memoized = cache.memoize(lambda language, text: text.upper())
+    # Equal hashes and lengths, different texts: never the other text's result.
+    assert memoized("x", Colliding("ab")) == "AB" and memoized("x", Colliding("ba")) == "BA"
+    assert memoized(language="x", text="ab") == "AB" and memoized("x", text="ab") == "AB"
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # The character budget bounds the inputs held, not just the entry count.
+    cache = ResultCache(maxsize=8, max_chars=10)
+    memoized = cache.memoize(lambda language, text: len(text))
+    memoized("x", "a" * 4)
+    memoized("x", "b" * 4)
+    memoized("x", "c" * 4)       # 12 characters: evicts "aaaa"
+    assert (len(cache), cache.chars, cache.evictions) == (2, 8, 1)
+    memoized("x", "d" * 11)      # longer than the budget: answered, not stored
+    assert (len(cache), cache.chars) == (2, 8)
+    cache.resize(8, max_chars=4)
+    assert (len(cache), cache.chars, cache.stats().max_chars) == (1, 4, 4)
+    cache.clear()
+    assert cache.chars == 0
+
+    MATCH_CACHE.clear()
+    text = "ba" + "a" * 40 + "b" * 40
+    assert intersection_span("a_star_b_star", "an_bn", text) == (2, 82)
+    assert intersection_span("a_star_b_star", "an_bn", text) == (2, 82)
+    assert intersection_span("a_star", "an_bn", text) is None
+    assert (MATCH_CACHE.hits, MATCH_CACHE.misses) == (1, 2)
+    for matcher in (intersect_r1_c1, intersect_r2_c2, intersect_r1_c2, intersect_r3_c3):
+        for s in ("", "aabb", "abba", "baab" * 7):
+            assert matcher(s) == matcher(s) == matcher.__wrapped__(s), (matcher.__name__, s)
+    MATCH_CACHE.clear()
+
+
+def test_incremental_matcher():
+    """Single-character edits keep the leftmost-longest match current"""
+    rng = random.Random(382)
+    for language in INCREMENTAL_LANGUAGES:
+        pda = load_compiled_pda(language)
+        for _ in range(40):
+            text = "".join(rng.choice("abx") for _ in range(rng.randint(0, 10)))
+            matcher = IncrementalMatcher(language, text)
+            for _ in range(30):
+                roll = rng.random()
+                if roll < 0.45:
+                    pos, char = rng.randint(0, len(text)), rng.choice("aabbx")
+                    text = text[:pos] + char + text[pos:]
+                    matcher.insert(pos, char)
+                elif roll < 0.8 and text:
+                    pos = rng.randrange(len(text))
+                    text = text[:pos] + text[pos + 1:]
+                    matcher.delete(pos)
+                else:
+                    pos = rng.randint(0, len(text))
+                    text = text[:pos] + rng.choice(["", "ab", "ba"]) + text[pos + rng.randint(0, 2):]
+                    matcher.update(text)
+                assert matcher.text == text, (language, text)
+                assert matcher.longest_span() == match_language_span(pda, text, "per_start"), (language, text)
+                assert matcher.longest_text() == match_language(pda, text, "per_start"), (language, text)
+
+    matcher = IncrementalMatcher("an_bn", "a" * 1000 + "b" * 999)
+    assert matcher.longest_span() == (1, 1999)
+    matcher.insert(1999, "b")
+    assert matcher.longest_span() == (0, 2000)
+    matcher.update("a" * 1000 + "x" + "b" * 1000)
+    assert matcher.longest_span() is None and len(matcher) == 2001
+    matcher.update("")
+    assert matcher.longest_span() is None and len(matcher) == 0 and matcher.text == ""
+    matcher.update("aab")
+    assert matcher.longest_span() == (1, 3)
+    try:
+        matcher.delete(2001)
+        assert False, "deleting past the end must fail"
+    except IndexError:
+        pass
+    try:
+        IncrementalMatcher("a_star")
+        assert False, "only run-shaped languages are incremental"
+    except ValueError:
+        pass
+
+
+def test_streaming_scan():
+    """Chunked byte scans agree with the in-memory matchers, across chunk boundaries"""
+    rng = random.Random(382)
+    texts = ["", "ab", "aabb", "a" * 50 + "b" * 40 + "a", "xbbbx" * 7]
+    for _ in range(150):
+        texts.append("".join(rng.choice("aabx") * rng.randint(1, 12) for _ in range(rng.randint(0, 12))))
+        texts.append("".join(rng.choice("abx") for _ in range(rng.randint(0, 40))))
+    for text in texts:
+        expected = match_all_intersection_spans(text)
+        for chunk_size in (1, 2, 3, 7, 64):
+            assert scan_buffer(text.encode(), chunk_size) == expected, (text, chunk_size)
+
+    # One run spanning many chunks, and a match split exactly at a boundary.
+    scanner = StreamScanner()
+    for chunk in (b"x" + b"a" * 5, b"a" * 5, b"b" * 8, b"b" * 2 + b"a"):
+        scanner.feed(chunk)
+    spans = scanner.spans()
+    assert spans["an_bn"] == (1, 21) and spans["bn"] == (11, 21) and spans["a_bn_a"] == (10, 22)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "input.txt")
+        text = "".join(rng.choice("ab") for _ in range(5000)) + "a" * 300 + "b" * 300 + "\n"
+        with open(path, "w", encoding="ascii") as f:
+            f.write(text)
+        assert scan_file(path, 4096) == match_all_intersection_spans(text)
+        assert scan_file(path)[("a_star_b_star", "an_bn")] == (5000, 5600)
+        open(path, "w").close()
+        assert all(span is None for span in scan_file(path).values())
+    try:
+        scan_buffer(b"ab", 0)
+        assert False, "chunk_size must be positive"
+    except ValueError:
+        pass
+
+
+def test_parallel_matcher():
+    """Sharded searches stitch matches across shard boundaries"""
+    rng = random.Random(382)
+    text = "".join(rng.choice("aabx") * rng.randint(1, 9) for _ in range(60)) + "a" * 20 + "b" * 20
+    previous, executor = parallel.MIN_SHARD, parallel.ProcessPoolExecutor
+    parallel.MIN_SHARD = 8
+    try:
+        for key in intersection_languages():
+            assert parallel.longest_match_parallel(text, key, workers=3) == intersection_span(*key, text), key
+        # Shards of 10: the match crosses three boundaries.
+        assert parallel.longest_match_parallel("x" * 7 + "a" * 12 + "b" * 12 + "xx", ("a_star_b_star", "an_bn"), 3) == (7, 31)
+        # Two shards' worth of input starts two processes, not eight.
+        pools = []
+        parallel.ProcessPoolExecutor = lambda max_workers: pools.append(max_workers) or executor(max_workers)
+        assert parallel.longest_match_parallel("a" * 8 + "b" * 8, ("a_star_b_star", "an_bn"), 8) == (0, 16)
+        assert pools == [2]
+    finally:
+        parallel.MIN_SHARD = previous
+        parallel.ProcessPoolExecutor = executor
+    assert parallel.longest_match_parallel("abba", ("a_b_star_a", "a_bn_a"), workers=4) == (0, 4)
+    try:
+        parallel.longest_match_parallel(text, ("a_star", "a_star"))
+        assert False, "unknown intersections must fail"
+    except ValueError:
+        pass
+
+
+def test_batch_matcher():
+    """JSONL records carry every chosen span, in input order, with or without workers"""
+    rng = random.Random(382)
+    texts = ["", "aabb", "abba", "xbbx"] + ["".join(rng.choice("abx") for _ in range(rng.randint(0, 25))) for _ in range(200)]
+    matcher = BatchMatcher()
+    for line, text in enumerate(texts, 1):
+        record = json.loads(matcher.record(line, text + "\n"))
+        assert record["line"] == line and record["seconds"] >= 0
+        expected = match_all_intersection_spans(text)
+        assert record["spans"] == {f"{r}:{c}": list(span) if span else None for (r, c), span in expected.items()}, text
+
+    jsonl = BatchMatcher([("a_star_b_star", "an_bn"), ("a_star", "bn")], "jsonl")
+    lines = ['{"id": "x1", "text": "aaabb"}\n', '"abab"\n', "\n", "[1]\n", "{oops\n"]
+    records = [json.loads(r) for r in jsonl.match_batch(enumerate(lines, 1)).splitlines()]
+    assert [r["line"] for r in records] == [1, 2, 4, 5]
+    assert records[0]["id"] == "x1" and records[0]["spans"] == {"a_star_b_star:an_bn": [1, 5], "a_star:bn": None}
+    assert records[1]["spans"]["a_star_b_star:an_bn"] == [0, 2] and "id" not in records[1]
+    assert "error" in records[2] and "error" in records[3]
+    assert json.loads(BatchMatcher([("a_star", "bn")]).record(1, "bb\n"))["spans"] == {"a_star:bn": None}
+
+    def spans_only(output):
+        return [{k: v for k, v in json.loads(r).items() if k != "seconds"} for r in output.splitlines()]
+
+    corpus = [text + "\n" for text in texts]
+    serial, pooled = io.StringIO(), io.StringIO()
+    assert run_batches(corpus, serial, matcher, workers=1, batch_size=16) == len(texts)
+    assert run_batches(corpus, pooled, matcher, workers=2, batch_size=16) == len(texts)
+    assert spans_only(pooled.getvalue()) == spans_only(serial.getvalue())
+
+    # A line that is not UTF-8 becomes an error record; the others still match.
+    with tempfile.TemporaryDirectory() as directory:
+        source, target = os.path.join(directory, "in.txt"), os.path.join(directory, "out.jsonl")
+        with open(source, "wb") as f:
+            f.write(b"aabb\nab\xff\n\xc3\xa9ab\n")
+        assert batch.main([source, "-o", target, "--intersection", "a_star_b_star:an_bn"]) == 0
+        with open(target, encoding="utf-8") as f:
+            records = [json.loads(r) for r in f]
+        assert [r["line"] for r in records] == [1, 2, 3]
+        assert records[0]["spans"] == {"a_star_b_star:an_bn": [0, 4]} and records[2]["spans"] == {"a_star_b_star:an_bn": [1, 3]}
+        assert records[1]["error"].startswith("UnicodeDecodeError")
+    try:
+        BatchMatcher([("a_star", "a_star")])
+        assert False, "unknown intersections must fail"
+    except ValueError:
+        pass
+
+    # The console script must start without the GUI stack.
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, comp382_assignment_2.batch; print(sorted(m for m in sys.modules if m.split('.')[0] in ('PySide6', 'pyvis')))"],
+        capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": src},
+    )
+    assert loaded.stdout.strip() == "[]"
+
+
 def main():
     print("\n" + "*" * 70)
     print("*  MATCHERS TEST")